@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from easyaudit.models import CRUDEvent
+
+logger = logging.getLogger(__name__)
+
+# Range-partitioned by month on "datetime" (migration 0001); one partition per archived month
+ARCHIVE_TABLE = "activity_log_crudevent_archive"
+ARCHIVE_CHUNK_SIZE = 5000
+
+
+def month_start(moment):
+    return timezone.make_aware(datetime(moment.year, moment.month, 1))
+
+
+def next_month(start):
+    return month_start(datetime(start.year + start.month // 12, start.month % 12 + 1, 1))
+
+
+def partition_name(start):
+    return f"{ARCHIVE_TABLE}_{start:%Y_%m}"
+
+
+def ensure_partition(cursor, start):
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(start)}" PARTITION OF "{ARCHIVE_TABLE}" '
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [start, next_month(start)],
+    )
+
+
+def archive_month(start, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move the CRUDEvent rows of the month beginning at `start` into its archive partition,
+    `chunk_size` rows per transaction so no statement holds locks for the whole month.
+    Returns the number of rows moved.
+    """
+    table = connection.ops.quote_name(CRUDEvent._meta.db_table)
+    moved = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            ensure_partition(cursor, start)
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {table} WHERE id IN (
+                        SELECT id FROM {table}
+                        WHERE "datetime" >= %s AND "datetime" < %s
+                        ORDER BY id LIMIT %s
+                    )
+                    RETURNING *
+                )
+                INSERT INTO "{ARCHIVE_TABLE}" SELECT * FROM moved
+                """,
+                [start, next_month(start), chunk_size],
+            )
+            count = cursor.rowcount
+        moved += count
+        if count < chunk_size:
+            return moved
+
+
+def archive_audit_events(keep_months=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move every CRUDEvent older than the last `keep_months` whole months (AUDIT_HOT_MONTHS by
+    default) into the monthly archive partitions, oldest month first. The live table then only
+    holds recent activity. Returns {"YYYY-MM": rows moved}.
+    """
+    keep_months = settings.AUDIT_HOT_MONTHS if keep_months is None else keep_months
+    cutoff = month_start(timezone.localtime())
+    for _ in range(keep_months):
+        cutoff = month_start(cutoff - timedelta(days=1))
+
+    oldest = CRUDEvent.objects.filter(datetime__lt=cutoff).order_by("datetime").values_list("datetime", flat=True).first()
+    archived = {}
+    if oldest is None:
+        return archived
+
+    start = month_start(timezone.localtime(oldest))
+    while start < cutoff:
+        moved = archive_month(start, chunk_size)
+        if moved:
+            archived[f"{start:%Y-%m}"] = moved
+        start = next_month(start)
+
+    logger.info(f"[archive_audit_events] Archived events before {cutoff:%Y-%m}: {archived}")
+    return archived
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("easyaudit", "0019_alter_crudevent_changed_fields_and_more"),
+    ]
+
+    operations = [
+        # Monthly archive of easyaudit's CRUDEvent table; partitions are created by activity_log.archive
+        migrations.RunSQL(
+            sql=[
+                'CREATE TABLE "activity_log_crudevent_archive" (LIKE "easyaudit_crudevent") '
+                'PARTITION BY RANGE ("datetime")',
+                'CREATE INDEX "activity_log_crudevent_archive_ct_datetime" '
+                'ON "activity_log_crudevent_archive" ("content_type_id", "datetime")',
+            ],
+            reverse_sql='DROP TABLE "activity_log_crudevent_archive"',
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity_log", "0001_crudevent_archive"),
+    ]
+
+    operations = [
+        # Read paths of CRUDEventViewSet on easyaudit's table: newest events of a set of content
+        # types, and keyset pages ordered by (datetime, id)
+        migrations.RunSQL(
+            sql=[
+                'CREATE INDEX IF NOT EXISTS "activity_log_crudevent_ct_datetime" '
+                'ON "easyaudit_crudevent" ("content_type_id", "datetime" DESC, "id" DESC)',
+                'CREATE INDEX IF NOT EXISTS "activity_log_crudevent_datetime" '
+                'ON "easyaudit_crudevent" ("datetime" DESC, "id" DESC)',
+            ],
+            reverse_sql=[
+                'DROP INDEX IF EXISTS "activity_log_crudevent_ct_datetime"',
+                'DROP INDEX IF EXISTS "activity_log_crudevent_datetime"',
+            ],
+        ),
+    ]
@@ -0,0 +1,176 @@
+import logging
+from datetime import datetime, time, timedelta
+
+from celery.utils import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from easyaudit.models import CRUDEvent
+
+from .archive import ARCHIVE_TABLE, month_start, next_month
+from .audit import PENDING_KEY, get_client
+
+logger = logging.getLogger(__name__)
+
+PURGE_CHUNK_SIZE = 5000
+# Marks the Celery task ids of purge jobs, so purge_status only reports those
+PURGE_JOB_KEY = "audit:purge:job:{}"
+PURGE_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+def purge_queryset(criteria):
+    """
+    CRUDEvent rows selected by a JSON-serializable purge request:
+    {} for every event, {"date": "YYYY-MM-DD"} for one day, {"before": ISO datetime} for older events.
+    """
+    queryset = CRUDEvent.objects.all()
+    if criteria.get("date"):
+        queryset = queryset.filter(datetime__date=parse_date(criteria["date"]))
+    if criteria.get("before"):
+        queryset = queryset.filter(datetime__lt=parse_datetime(criteria["before"]))
+    return queryset
+
+
+def _day_bounds(day):
+    # Same local-time day as the datetime__date lookup
+    start = timezone.make_aware(datetime.combine(parse_date(day), time.min))
+    return start, start + timedelta(days=1)
+
+
+def has_events(criteria):
+    """Whether a purge request matches anything, live or archived."""
+    if purge_queryset(criteria).exists():
+        return True
+    if not criteria.get("date"):
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM "{ARCHIVE_TABLE}" WHERE datetime >= %s AND datetime < %s)',
+            list(_day_bounds(criteria["date"])),
+        )
+        return cursor.fetchone()[0]
+
+
+def purge_archive(criteria):
+    """
+    Remove the archived rows (see activity_log.archive) a purge request selects: every partition is
+    truncated for {} and the day's rows deleted for {"date"}. Older-than requests are left to the
+    retention pass, which drops whole expired months. Returns the rows deleted, None when truncated.
+    """
+    with connection.cursor() as cursor:
+        if not criteria:
+            cursor.execute(f'TRUNCATE "{ARCHIVE_TABLE}"')
+            return None
+        if criteria.get("date"):
+            cursor.execute(
+                f'DELETE FROM "{ARCHIVE_TABLE}" WHERE datetime >= %s AND datetime < %s',
+                list(_day_bounds(criteria["date"])),
+            )
+            return cursor.rowcount
+    return 0
+
+
+def start_purge(criteria):
+    """Queue purge_audit_events for `criteria` and remember its task id as a purge job; returns the id."""
+    from .tasks import purge_audit_events
+
+    task_id = uuid()
+    get_client().set(PURGE_JOB_KEY.format(task_id), 1, ex=PURGE_JOB_TTL_SECONDS)
+    purge_audit_events.apply_async(args=[criteria], task_id=task_id)
+    return task_id
+
+
+def is_purge_job(task_id):
+    return bool(get_client().exists(PURGE_JOB_KEY.format(task_id)))
+
+
+def drop_buffered_events():
+    """Discard the audit events BufferedAuditBackend has not flushed yet; returns how many."""
+    pipe = get_client().pipeline()
+    pipe.llen(PENDING_KEY)
+    pipe.delete(PENDING_KEY)
+    return pipe.execute()[0]
+
+
+def delete_chunk(queryset, after_id, chunk_size):
+    """
+    Delete the next `chunk_size` rows of `queryset` by id after `after_id`, in SQL: no objects are
+    loaded and nothing is collected, since nothing references CRUDEvent.
+    Returns (rows deleted, highest id deleted).
+    """
+    chunk = queryset.filter(id__gt=after_id).order_by("id").values("id")[:chunk_size]
+    sql, params = chunk.query.sql_with_params()
+    table = connection.ops.quote_name(CRUDEvent._meta.db_table)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH gone AS (DELETE FROM {table} WHERE id IN ({sql}) RETURNING id) SELECT COUNT(*), MAX(id) FROM gone",
+            params,
+        )
+        return cursor.fetchone()
+
+
+def purge_events(queryset, chunk_size=PURGE_CHUNK_SIZE, max_chunks=None, progress=None):
+    """
+    Delete `queryset`'s CRUDEvent rows in ascending id chunks of at most `chunk_size`, one short
+    transaction each, stopping after `max_chunks` chunks when given. `progress(deleted, total)` is
+    called after every chunk. Returns {"deleted", "total", "chunks", "done"}.
+    """
+    total = queryset.count()
+    deleted = 0
+    chunks = 0
+    last_id = 0
+    done = total == 0
+
+    while not done and (max_chunks is None or chunks < max_chunks):
+        count, last = delete_chunk(queryset, last_id, chunk_size)
+        chunks += 1
+        deleted += count
+        done = count < chunk_size
+        last_id = last if last is not None else last_id
+        if progress:
+            progress(deleted, total)
+
+    return {"deleted": deleted, "total": total, "chunks": chunks, "done": done}
+
+
+def drop_expired_partitions(cutoff):
+    """Drop the archive partitions (see activity_log.archive) of months that end before `cutoff`."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [ARCHIVE_TABLE],
+        )
+        dropped = []
+        for (name,) in cursor.fetchall():
+            year, month = name[len(ARCHIVE_TABLE) + 1:].split("_")
+            start = month_start(datetime(int(year), int(month), 1))
+            if next_month(start) <= cutoff:
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+    return sorted(dropped)
+
+
+def prune_expired_events(retention_days=None, chunk_size=PURGE_CHUNK_SIZE, max_chunks=None):
+    """
+    Retention policy: delete live CRUDEvent rows older than `retention_days` (AUDIT_RETENTION_DAYS
+    by default; 0 keeps everything) at most `max_chunks` chunks per run, and drop archive months
+    that lie entirely beyond it. Whatever a run leaves is picked up by the next one.
+    """
+    retention_days = settings.AUDIT_RETENTION_DAYS if retention_days is None else retention_days
+    if not retention_days:
+        return {"deleted": 0, "total": 0, "chunks": 0, "done": True, "partitions_dropped": []}
+
+    max_chunks = settings.AUDIT_PRUNE_MAX_CHUNKS if max_chunks is None else max_chunks
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    stats = purge_events(purge_queryset({"before": cutoff.isoformat()}), chunk_size, max_chunks or None)
+    stats["partitions_dropped"] = drop_expired_partitions(cutoff)
+    logger.info(f"[prune_expired_events] Events before {cutoff:%Y-%m-%d %H:%M}: {stats}")
+    return stats
@@ -62,7 +62,7 @@ class ContentTypeSerializer(serializers.ModelSerializer):
 
 
 class CRUDEventSerializer(serializers.ModelSerializer):
-    module = ContentTypeSerializer(source="content_type", read_only=True)
+    module = serializers.SerializerMethodField()
     type = serializers.SerializerMethodField()
 
     class Meta:
@@ -80,13 +80,24 @@ class CRUDEventSerializer(serializers.ModelSerializer):
     def get_type(self, obj):
         return EVENT_TYPE_CHOICES.get(obj.event_type, "UNKNOWN")
 
+    def get_module(self, obj):
+        return FORMATTED_MODEL_KEYS.get(obj.content_type.model, obj.content_type.model)
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        user = instance.user
-        module = ContentTypeSerializer(instance.content_type).data["model"]
 
-        representation["user"] = CustomUserSerializer(user).data
-        representation["module"] = module
+        # user and content_type come from the view's select_related
+        representation["user"] = CustomUserSerializer(instance.user).data
+
+        try:
+            changes = json.loads(instance.changed_fields)
+            representation["changes"] = changes
+        except (json.JSONDecodeError, TypeError):
+            representation["changes"] = {}
+
+        # The full object snapshot is large; decoding it is left to the detail view (context["include_object"])
+        if not self.context.get("include_object"):
+            return representation
 
         try:
             json_obj = json.loads(instance.object_json_repr)
@@ -95,12 +106,6 @@ class CRUDEventSerializer(serializers.ModelSerializer):
 
         representation["object"] = json_obj
 
-        try:
-            changes = json.loads(instance.changed_fields)
-            representation["changes"] = changes
-        except (json.JSONDecodeError, TypeError):
-            representation["changes"] = {}
-
         return representation
 
 
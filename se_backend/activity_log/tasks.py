@@ -0,0 +1,51 @@
+import logging
+
+from celery import shared_task
+
+from .archive import archive_audit_events
+from .audit import flush_pending_events
+from .purge import drop_buffered_events, prune_expired_events, purge_archive, purge_events, purge_queryset
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def flush_audit_events():
+    """Write the audit events buffered by BufferedAuditBackend to CRUDEvent in bulk."""
+    written = flush_pending_events()
+    return f"Flushed {written} audit events"
+
+
+@shared_task
+def archive_old_audit_events():
+    """Move CRUDEvent rows older than AUDIT_HOT_MONTHS into the monthly archive partitions."""
+    archived = archive_audit_events()
+    return f"Archived {sum(archived.values())} audit events: {archived}"
+
+
+@shared_task(bind=True)
+def purge_audit_events(self, criteria=None):
+    """
+    Delete the CRUDEvent rows selected by `criteria` (see activity_log.purge.purge_queryset) in
+    bounded id chunks, publishing {"deleted", "total"} as PROGRESS state after every chunk, then
+    the matching archived rows. Purging everything also discards the events still buffered in Redis.
+    """
+    criteria = criteria or {}
+
+    def progress(deleted, total):
+        self.update_state(state="PROGRESS", meta={"deleted": deleted, "total": total})
+
+    buffered = drop_buffered_events() if not criteria else 0
+    stats = purge_events(purge_queryset(criteria), progress=progress)
+    stats["archived_deleted"] = purge_archive(criteria)
+    stats["buffered_dropped"] = buffered
+    logger.info(f"[purge_audit_events] {criteria or 'all events'}: {stats}")
+    return stats
+
+
+@shared_task
+def prune_audit_events():
+    """Nightly retention pass: drop audit events older than AUDIT_RETENTION_DAYS, a bounded number of chunks per run."""
+    stats = prune_expired_events()
+    return f"Pruned {stats['deleted']} audit events ({'done' if stats['done'] else 'more left'}), " \
+           f"dropped partitions: {stats['partitions_dropped']}"
@@ -1,3 +1,311 @@
-from django.test import TestCase
+import time
+from datetime import datetime, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from easyaudit.models import CRUDEvent
+from rest_framework.test import APIClient
+
+from activity_log.archive import ARCHIVE_TABLE, archive_audit_events, partition_name
+from activity_log.audit import (
+    CLAIM_TIMEOUT_SECONDS, CLAIMS_KEY, PENDING_KEY, BufferedAuditBackend, claim_pending_events, flush_pending_events,
+    get_client, should_record_write,
+)
+from activity_log.purge import prune_expired_events, purge_events, purge_queryset
+from activity_log.tasks import purge_audit_events
+from activity_log.views import activity_content_type_ids
+from attendance_summary.models import AttendanceSummary
+from benefits.models import SSS
+from shared.auth.serializers import LoginSerializer
+from shared.explain import scan_nodes, uses_index_scan
+from shift.models import Shift
+from users.models import CustomUser
+
+
+class AuditThrottlingTestCase(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+
+    def record(self, model, request, **kwargs):
+        return should_record_write(model(), "[]", False, False, "default", None, request=request, **kwargs)
+
+    def test_system_writes_are_sampled(self):
+        # A user's direct write is always recorded
+        self.assertTrue(self.record(Shift, self.request))
+        # Cascade-derived models and writes outside a request are system writes
+        self.assertFalse(self.record(AttendanceSummary, self.request))
+        self.assertFalse(self.record(Shift, None))
+
+        with override_settings(AUDIT_SYSTEM_SAMPLE_RATE=1.0):
+            self.assertTrue(self.record(Shift, None))
+        with override_settings(AUDIT_SYSTEM_SAMPLE_RATE=0.25), mock.patch("activity_log.audit.random.random", return_value=0.5):
+            self.assertFalse(self.record(AttendanceSummary, self.request))
+
+
+@override_settings(AUDIT_BUFFER_ENABLED=True, AUDIT_FLUSH_BATCH_SIZE=100)
+class BufferedAuditBackendTestCase(TestCase):
+    def setUp(self):
+        get_client().delete(PENDING_KEY, CLAIMS_KEY)
+        self.addCleanup(get_client().delete, PENDING_KEY, CLAIMS_KEY)
+        self.user = CustomUser.objects.create_user(email="audit@example.com", password="password", role="admin")
+        self.content_type = ContentType.objects.get_for_model(Shift)
+
+    def event(self, object_id, when):
+        return {
+            "content_type_id": self.content_type.id,
+            "datetime": when,
+            "event_type": CRUDEvent.UPDATE,
+            "object_id": object_id,
+            "object_json_repr": "[]",
+            "object_repr": f"Shift {object_id}",
+            "user_id": self.user.id,
+            "user_pk_as_string": str(self.user.id),
+            "changed_fields": '{"shift_start": ["09:00", "10:00"]}',
+        }
+
+    def test_events_are_queued_then_written_in_bulk(self):
+        backend = BufferedAuditBackend()
+        when = timezone.now() - timedelta(hours=3)
+        for object_id in range(5):
+            backend.crud(self.event(object_id, when))
+
+        self.assertEqual(CRUDEvent.objects.count(), 0)
+        self.assertEqual(get_client().llen(PENDING_KEY), 5)
+
+        # One INSERT (inside a savepoint) per batch of two
+        with self.assertNumQueries(3 * 3), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(flush_pending_events(batch_size=2), 5)
+        self.assertEqual(get_client().llen(PENDING_KEY), 0)
+        # Committed batches release their processing lists
+        self.assertEqual(get_client().zcard(CLAIMS_KEY), 0)
+
+        events = CRUDEvent.objects.order_by("id")
+        self.assertEqual([event.object_id for event in events], ["0", "1", "2", "3", "4"])
+        # The event time survives the deferred insert
+        self.assertEqual(events[0].datetime, when)
+        self.assertEqual(events[0].user, self.user)
+
+    def test_failed_batch_is_requeued(self):
+        BufferedAuditBackend().crud(self.event(1, timezone.now()))
+        with mock.patch("activity_log.audit.insert_events", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                flush_pending_events()
+        self.assertEqual(get_client().llen(PENDING_KEY), 1)
+        self.assertEqual(get_client().zcard(CLAIMS_KEY), 0)
+
+    def test_batch_of_a_killed_flusher_is_recovered(self):
+        backend = BufferedAuditBackend()
+        for object_id in range(3):
+            backend.crud(self.event(object_id, timezone.now()))
+
+        # A flusher claims a batch and dies before its INSERT commits
+        key, events = claim_pending_events(2)
+        self.addCleanup(get_client().delete, key)
+        self.assertEqual((len(events), get_client().llen(PENDING_KEY)), (2, 1))
+
+        # Not yet stale: the next run leaves the batch alone
+        self.assertEqual(flush_pending_events(), 1)
+        get_client().zadd(CLAIMS_KEY, {key: time.time() - CLAIM_TIMEOUT_SECONDS - 1})
+
+        self.assertEqual(flush_pending_events(), 2)
+        self.assertEqual(sorted(CRUDEvent.objects.values_list("object_id", flat=True)), ["0", "1", "2"])
+
+
+class AuditArchiveTestCase(TestCase):
+    def test_old_months_move_to_partitions(self):
+        content_type = ContentType.objects.get_for_model(Shift)
+        now = timezone.localtime()
+        old = timezone.make_aware(datetime(now.year - 1, 3, 10, 12, 0))
+        for moment in (old, old + timedelta(days=1), old + timedelta(days=31), now):
+            event = CRUDEvent.objects.create(event_type=CRUDEvent.CREATE, object_id="1", content_type=content_type)
+            CRUDEvent.objects.filter(id=event.id).update(datetime=moment)
+
+        archived = archive_audit_events(keep_months=2, chunk_size=1)
+
+        self.assertEqual(archived, {f"{now.year - 1}-03": 2, f"{now.year - 1}-04": 1})
+        self.assertEqual(CRUDEvent.objects.count(), 1)
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM "{ARCHIVE_TABLE}_{now.year - 1}_03"')
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+
+class ActivityLogQueryTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="owner@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(self.user).access_token}")
+        self.shift_type = ContentType.objects.get_for_model(Shift)
+
+    def add_events(self, count, model=Shift):
+        content_type = ContentType.objects.get_for_model(model)
+        CRUDEvent.objects.bulk_create([
+            CRUDEvent(event_type=CRUDEvent.UPDATE, object_id=str(number), content_type=content_type,
+                      object_json_repr='[{"pk": 1}]', changed_fields='{"date": ["a", "b"]}', user=self.user)
+            for number in range(count)
+        ])
+
+    def list_queries(self, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("activity_log:activity-log-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_keyset_pages(self):
+        self.add_events(5)
+        self.add_events(3, model=SSS)
+
+        response, _ = self.list_queries({"limit": 2})
+        seen = [row["id"] for row in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen.extend(row["id"] for row in response.data["results"])
+
+        # Only the activity-log models, newest first, each row once
+        expected = list(CRUDEvent.objects.filter(content_type=self.shift_type).order_by("-datetime", "-id")
+                        .values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+        # Lists decode the changes but leave the object snapshot to the detail view
+        self.assertNotIn("object", response.data["results"][0])
+        self.assertEqual(response.data["results"][0]["changes"], {"date": ["a", "b"]})
+        self.assertEqual(response.data["results"][0]["module"], "Shift")
+        detail = self.client.get(reverse("activity_log:activity-log-detail", args=[seen[0]]))
+        self.assertEqual(detail.data["object"], [{"pk": 1}])
+        self.assertEqual(detail.data["changes"], {"date": ["a", "b"]})
+
+    def test_page_number_list_shape(self):
+        self.add_events(1)
+
+        row = self.client.get(reverse("activity_log:activity-log-list")).data["results"][0]
+
+        self.assertEqual((row["type"], row["module"], row["changes"]), ("UPDATE", "Shift", {"date": ["a", "b"]}))
+        self.assertEqual(row["user"]["email"], "owner@example.com")
+        self.assertNotIn("object", row)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.add_events(120)
+        _, small = self.list_queries({"limit": 2})
+        _, large = self.list_queries({"limit": 10})
+        self.assertEqual(small, large)
+
+        # Page-number pages are capped at max_page_size
+        response, _ = self.list_queries({"page_size": 1000})
+        self.assertEqual((response.data["count"], len(response.data["results"])), (120, 100))
+
+    def test_list_uses_the_content_type_index(self):
+        self.add_events(50)
+        self.add_events(50, model=SSS)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        queryset = CRUDEvent.objects.filter(content_type_id__in=activity_content_type_ids()).order_by("-datetime", "-id")
+        self.assertTrue(uses_index_scan(queryset[:100]))
+        # easyaudit's content_type FK index would pass the check above too
+        self.assertIn("activity_log_crudevent_ct_datetime", [name for _, name in scan_nodes(queryset[:100])])
+
+
+class AuditPurgeTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="purge@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(self.user).access_token}")
+        self.content_type = ContentType.objects.get_for_model(Shift)
+
+    def add_events(self, count, moment):
+        events = CRUDEvent.objects.bulk_create([
+            CRUDEvent(event_type=CRUDEvent.CREATE, object_id=str(number), content_type=self.content_type)
+            for number in range(count)
+        ])
+        CRUDEvent.objects.filter(id__in=[event.id for event in events]).update(datetime=moment)
+
+    def test_purge_runs_in_bounded_chunks(self):
+        day = timezone.make_aware(datetime(2025, 4, 2, 10, 0))
+        self.add_events(7, day)
+        self.add_events(2, day + timedelta(days=1))
+
+        progress = []
+        stats = purge_events(purge_queryset({"date": "2025-04-02"}), chunk_size=3,
+                             progress=lambda deleted, total: progress.append((deleted, total)))
+
+        self.assertEqual(stats, {"deleted": 7, "total": 7, "chunks": 3, "done": True})
+        self.assertEqual(progress, [(3, 7), (6, 7), (7, 7)])
+        self.assertEqual(CRUDEvent.objects.count(), 2)
+
+    @mock.patch("activity_log.tasks.purge_audit_events.apply_async")
+    def test_delete_actions_queue_a_purge(self, apply_async):
+        self.add_events(1, timezone.make_aware(datetime(2025, 4, 2, 10, 0)))
+
+        response = self.client.delete(reverse("activity_log:activity-log-delete-by-date"), QUERY_STRING="date=2025-04-02")
+        self.assertEqual(response.status_code, 202)
+        apply_async.assert_called_once_with(args=[{"date": "2025-04-02"}], task_id=response.data["task_id"])
+        # Nothing is deleted inside the request
+        self.assertEqual(CRUDEvent.objects.count(), 1)
+
+        status = self.client.get(reverse("activity_log:activity-log-purge-status"), {"task_id": response.data["task_id"]})
+        self.assertEqual((status.status_code, status.data["state"]), (200, "PENDING"))
+        # Only purge jobs are reported
+        status = self.client.get(reverse("activity_log:activity-log-purge-status"), {"task_id": "some-other-task"})
+        self.assertEqual(status.status_code, 404)
+
+        response = self.client.delete(reverse("activity_log:activity-log-delete-by-date"), QUERY_STRING="date=2025-04-03")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.delete(reverse("activity_log:activity-log-delete-logs"))
+        self.assertEqual(response.status_code, 202)
+        apply_async.assert_called_with(args=[{}], task_id=response.data["task_id"])
+
+    def test_purge_actions_need_admin_or_owner(self):
+        employee = CustomUser.objects.create_user(email="purge-employee@example.com", password="password", role="employee")
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(employee).access_token}")
+
+        self.assertEqual(client.delete(reverse("activity_log:activity-log-delete-logs")).status_code, 403)
+        self.assertEqual(client.delete(reverse("activity_log:activity-log-delete-by-date"),
+                                       QUERY_STRING="date=2025-04-02").status_code, 403)
+        self.assertEqual(client.get(reverse("activity_log:activity-log-purge-status"),
+                                    {"task_id": "job-1"}).status_code, 403)
+
+    @mock.patch("activity_log.tasks.purge_audit_events.update_state")
+    def test_purging_everything_clears_the_archive_and_buffer(self, update_state):
+        self.add_events(3, timezone.now())
+        self.add_events(2, timezone.now() - timedelta(days=800))
+        archive_audit_events(keep_months=12)
+        get_client().rpush(PENDING_KEY, "{}")
+        self.addCleanup(get_client().delete, PENDING_KEY)
+
+        stats = purge_audit_events({})
+
+        self.assertEqual((stats["deleted"], stats["buffered_dropped"]), (3, 1))
+        self.assertFalse(CRUDEvent.objects.exists())
+        self.assertEqual(get_client().llen(PENDING_KEY), 0)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {ARCHIVE_TABLE}")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_retention_prunes_incrementally(self):
+        now = timezone.now()
+        self.add_events(5, now - timedelta(days=400))
+        self.add_events(2, now - timedelta(days=10))
+
+        # Archive an expired month too: its partition is dropped as a whole
+        old_month = timezone.make_aware(datetime(now.year - 3, 6, 15))
+        self.add_events(1, old_month)
+        archive_audit_events(keep_months=24)
+
+        stats = prune_expired_events(retention_days=365, chunk_size=2, max_chunks=2)
+        self.assertEqual((stats["deleted"], stats["done"]), (4, False))
+        self.assertIn(partition_name(timezone.make_aware(datetime(now.year - 3, 6, 1))), stats["partitions_dropped"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {ARCHIVE_TABLE}")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+        # The next night finishes the job
+        stats = prune_expired_events(retention_days=365, chunk_size=2, max_chunks=2)
+        self.assertEqual((stats["deleted"], stats["done"]), (1, True))
+        self.assertEqual(CRUDEvent.objects.count(), 2)
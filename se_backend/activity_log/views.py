@@ -4,7 +4,9 @@ from rest_framework import permissions, viewsets
 
 from .filters import CRUDEventFilter
 from .serializers import CRUDEventSerializer, LoginEventSerializer
+from .purge import has_events, is_purge_job, start_purge
 
+from shared.pagination import KeysetPagination
 from shared.utils import role_required
 
 from rest_framework.decorators import action
@@ -13,13 +15,35 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
+from celery.result import AsyncResult
 from datetime import datetime
+from functools import lru_cache
 
 class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 1000
+    page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+
+class ActivityLogKeysetPagination(KeysetPagination):
+    """Newest first; each page is a range scan of the (content_type, datetime) index."""
+    ordering = ("-datetime", "-id")
+    max_page_size = 100
+
+
+# Models whose changes make up the activity log
+INCLUDED_MODELS = {
+    "admin", "attendance", "attendancesummary", "employee", "employmentinfo",
+    "totalovertime", "payslip", "schedule", "shift", "customuser", "owner"
+}
+
+
+@lru_cache(maxsize=None)
+def activity_content_type_ids():
+    """Ids of the INCLUDED_MODELS content types, looked up once per process (cache_clear() to reload)."""
+    return frozenset(ContentType.objects.filter(model__in=INCLUDED_MODELS).values_list("id", flat=True))
+
+
 class CRUDEventViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = CRUDEventSerializer
     permission_classes = [IsAuthenticated]
@@ -32,27 +56,39 @@ class CRUDEventViewSet(viewsets.ReadOnlyModelViewSet):
         if not user.is_authenticated or user.role not in ["admin", "owner"]:
             return CRUDEvent.objects.none()
 
-        included_models = {
-            "admin", "attendance", "attendancesummary", "employee", "employmentinfo",
-            "totalovertime", "payslip", "schedule", "shift", "customuser", "owner"
-        }
-        content_types = ContentType.objects.filter(model__in=included_models)
-
-        # Exclude logs where user is None, inactive, or has invalid data (empty email/role)
         return CRUDEvent.objects.filter(
-            content_type__in=content_types
-        ).exclude(
-            user__isnull=True,  # Exclude logs with no user
-            user__is_active=False,  # Exclude logs with inactive users
-            user__email="",  # Exclude logs with empty email addresses (invalid users)
-            user__role__isnull=True  # Exclude logs with missing roles
-        ).order_by("-datetime")
+            content_type_id__in=activity_content_type_ids()
+        ).select_related("user", "content_type").order_by("-datetime", "-id")
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        # The stored object JSON is only decoded for a single event
+        context["include_object"] = self.action == "retrieve"
+        return context
+
+    def list(self, request, *args, **kwargs):
+        """
+        Page-number pages by default; passing `cursor` or `limit` switches to keyset pages,
+        which skip the COUNT and cost the same at any depth. List rows carry `changes` but not
+        the full `object` snapshot, which only the detail view returns.
+        """
+        if "cursor" not in request.query_params and "limit" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = ActivityLogKeysetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=["delete"], permission_classes=[IsAuthenticated])
+    @role_required(["admin", "owner"])
     def delete_logs(self, request):
         """
         Delete a single or all CRUDEvent logs.
-        If no `ids` parameter is provided, all logs will be deleted.
+        If no `ids` parameter is provided, all logs (archived months and events not yet flushed
+        included) are purged by a background job in bounded chunks; its progress is reported by
+        `purge_status`.
         """
         ids = request.query_params.getlist('ids', [])
 
@@ -61,9 +97,12 @@ class CRUDEventViewSet(viewsets.ReadOnlyModelViewSet):
             CRUDEvent.objects.filter(id__in=ids).delete()
             return Response({"detail": "Selected logs have been deleted."}, status=status.HTTP_204_NO_CONTENT)
         else:
-            # Delete all logs
-            CRUDEvent.objects.all().delete()
-            return Response({"detail": "All logs have been deleted."}, status=status.HTTP_204_NO_CONTENT)
+            # Purge all logs in the background
+            task_id = start_purge({})
+            return Response(
+                {"detail": "Deleting all logs, including archived months.", "task_id": task_id},
+                status=status.HTTP_202_ACCEPTED
+            )
 
     @action(detail=False, methods=["delete"], permission_classes=[IsAuthenticated])
     def delete_invalid_user_logs(self, request):
@@ -94,6 +133,7 @@ class CRUDEventViewSet(viewsets.ReadOnlyModelViewSet):
             )
 
     @action(detail=False, methods=["delete"], permission_classes=[IsAuthenticated])
+    @role_required(["admin", "owner"])
     def delete_by_date(self, request):
         """
         Delete CRUDEvent logs for a specific date.
@@ -116,20 +156,42 @@ class CRUDEventViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Delete logs for the specific date
-        deleted_count, _ = CRUDEvent.objects.filter(datetime__date=target_date).delete()
-
-        if deleted_count > 0:
-            return Response(
-                {"detail": f"{deleted_count} logs from {target_date} have been deleted."},
-                status=status.HTTP_204_NO_CONTENT
-            )
-        else:
+        criteria = {"date": target_date.isoformat()}
+        if not has_events(criteria):
             return Response(
                 {"detail": f"No logs found for {target_date}."},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        # Delete logs for the specific date in the background
+        task_id = start_purge(criteria)
+        return Response(
+            {"detail": f"Deleting logs from {target_date}.", "task_id": task_id},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    @role_required(["admin", "owner"])
+    def purge_status(self, request):
+        """
+        Progress of a purge started by `delete_logs` or `delete_by_date`.
+        The job id is provided in the query parameter `task_id`.
+        """
+        task_id = request.query_params.get("task_id")
+        if not task_id:
+            return Response({"detail": "A task_id must be provided."}, status=status.HTTP_400_BAD_REQUEST)
+        if not is_purge_job(task_id):
+            return Response({"detail": "No purge job with this task_id."}, status=status.HTTP_404_NOT_FOUND)
+
+        result = AsyncResult(task_id)
+        info = result.info if isinstance(result.info, dict) else {}
+        return Response({
+            "task_id": task_id,
+            "state": result.state,
+            "deleted": info.get("deleted"),
+            "total": info.get("total"),
+        })
+
 
 class LoginEventViewSet(viewsets.ReadOnlyModelViewSet):
 
@@ -0,0 +1,244 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+
+from attendance_summary.models import AttendanceSummary
+from schedule.models import Schedule
+from .models import Attendance
+from .shift_index import ShiftIndex, active_shift_index, shift_index
+from .signals import calculate_minutes, get_biweekly_period
+
+logger = logging.getLogger(__name__)
+
+# An AttendanceSummary keyed on a biweekly start covers the attendance dates in [start, start + 15 days)
+SUMMARY_WINDOW_DAYS = 15
+
+
+def empty_totals():
+    return {field: 0 for field in AttendanceSummary.MINUTE_FIELDS}
+
+
+def attendance_contribution(check_in, check_out, attendance_date, shift, holiday_schedule):
+    """
+    Minutes a single attendance row adds to a biweekly summary.
+    Mirrors the per-row body of the original full-period loop: holiday minutes are kept apart
+    and excluded from the actual/overtime/late/undertime totals.
+    """
+    totals = empty_totals()
+
+    if not shift or not holiday_schedule:
+        return totals
+
+    worked_minutes = calculate_minutes(check_in, check_out)
+
+    if attendance_date in (holiday_schedule.specialholiday or []):
+        totals["specialholiday_minutes"] = worked_minutes
+        return totals
+
+    if attendance_date in (holiday_schedule.regularholiday or []):
+        totals["regularholiday_minutes"] = worked_minutes
+        return totals
+
+    expected = shift.expected_hours * 60
+    totals["actual_minutes"] = worked_minutes
+    totals["overtime_minutes"] = max(0, worked_minutes - expected)
+    totals["late_minutes"] = max(0, (check_in.hour * 60 + check_in.minute) -
+                                 (shift.shift_start.hour * 60 + shift.shift_start.minute))
+    totals["undertime_minutes"] = max(0, expected - worked_minutes)
+    return totals
+
+
+class _PeriodLookups:
+    """Memoizes the schedule/shift lookups made while applying one attendance change."""
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        # The recompute's shared index when one is active, else one loaded for this change only
+        self._shift_index = active_shift_index() or ShiftIndex()
+        self._holiday_schedules = {}
+
+    def shift(self, attendance_date):
+        return self._shift_index.shift(self.user_id, attendance_date)
+
+    def holiday_schedule(self, biweekly_start):
+        if biweekly_start not in self._holiday_schedules:
+            self._holiday_schedules[biweekly_start] = Schedule.objects.filter(
+                user_id=self.user_id, bi_weekly_start=biweekly_start
+            ).first()
+        return self._holiday_schedules[biweekly_start]
+
+    def contribution(self, values, biweekly_start):
+        return attendance_contribution(
+            values["check_in_time"],
+            values["check_out_time"],
+            values["date"],
+            self.shift(values["date"]),
+            self.holiday_schedule(biweekly_start),
+        )
+
+
+def rebuild_attendance_summary(user_id, biweekly_start, attendance=None):
+    """
+    Recompute a biweekly AttendanceSummary from every Attendance row in its window.
+    Only used on explicit request or to seed a summary the incremental path has no totals for.
+    """
+    lookups = _PeriodLookups(user_id)
+    rows = Attendance.objects.filter(
+        user_id=user_id,
+        date__gte=biweekly_start,
+        date__lt=biweekly_start + timedelta(days=SUMMARY_WINDOW_DAYS)
+    ).order_by("date", "id")
+
+    totals = empty_totals()
+    latest = None
+    for att in rows:
+        latest = att
+        values = {"date": att.date, "check_in_time": att.check_in_time, "check_out_time": att.check_out_time}
+        for field, minutes in lookups.contribution(values, biweekly_start).items():
+            totals[field] += minutes
+
+    with transaction.atomic():
+        summary = AttendanceSummary.objects.select_for_update().filter(
+            user_id=user_id, date=biweekly_start
+        ).first()
+
+        if summary is None:
+            anchor = attendance or latest
+            if anchor is None:
+                return None
+            summary = AttendanceSummary(user_id_id=user_id, date=biweekly_start, attendance_id=anchor)
+        elif attendance is not None:
+            summary.attendance_id = attendance
+
+        summary.set_totals(totals)
+        summary.save()
+
+    logger.info(f"[rebuild_attendance_summary] Rebuilt AttendanceSummary for User: {user_id}, Start: {biweekly_start} "
+                f"— {totals}")
+    return summary
+
+
+def _snapshot(attendance):
+    return {
+        "user_id": attendance.user_id,
+        "date": attendance.date,
+        "check_in_time": attendance.check_in_time,
+        "check_out_time": attendance.check_out_time,
+    }
+
+
+def apply_attendance_change(attendance, previous=None, deleted=False):
+    """
+    Apply the delta of one Attendance write to the affected AttendanceSummary rows:
+    the previous values' contribution is taken out and the current one put in.
+
+    `previous` is the persisted state before the write (None for inserts). Summaries without
+    running totals are rebuilt instead, and a summary is only created for a valid check-in/out
+    pair, matching the original trigger.
+    """
+    current = None if deleted else _snapshot(attendance)
+    changes = [(-1, previous), (1, current)]
+
+    deltas = defaultdict(empty_totals)
+    lookups = {}
+    own_starts = {}
+
+    for sign, values in changes:
+        if not values or values["user_id"] is None:
+            continue
+
+        user_id = values["user_id"]
+        lookup = lookups.setdefault(user_id, _PeriodLookups(user_id))
+
+        # Every summary whose 15-day window contains this date counts the row
+        starts = set(AttendanceSummary.objects.filter(
+            user_id=user_id,
+            date__gt=values["date"] - timedelta(days=SUMMARY_WINDOW_DAYS),
+            date__lte=values["date"],
+        ).values_list("date", flat=True))
+
+        own_start = get_biweekly_period(values["date"], user_id)
+        own_starts[sign] = own_start
+        if own_start is not None:
+            starts.add(own_start)
+
+        for biweekly_start in starts:
+            contribution = lookup.contribution(values, biweekly_start)
+            delta = deltas[(user_id, biweekly_start)]
+            for field, minutes in contribution.items():
+                delta[field] += sign * minutes
+
+    # Only a valid check-in/out pair with a shift and schedule may create its own period's summary
+    creatable = None
+    own_start = own_starts.get(1)
+    if own_start is not None and current["check_in_time"] and current["check_out_time"] \
+            and current["check_in_time"] != current["check_out_time"]:
+        lookup = lookups[current["user_id"]]
+        if lookup.shift(current["date"]) and lookup.holiday_schedule(own_start):
+            creatable = (current["user_id"], own_start)
+
+    summaries = []
+    for (user_id, biweekly_start), delta in deltas.items():
+        with transaction.atomic():
+            summary = AttendanceSummary.objects.select_for_update().filter(
+                user_id=user_id, date=biweekly_start
+            ).first()
+
+            if summary is None or not summary.is_tracked():
+                if summary is None and (user_id, biweekly_start) != creatable:
+                    continue
+                anchor = attendance if (user_id, biweekly_start) == creatable else None
+                summaries.append(rebuild_attendance_summary(user_id, biweekly_start, attendance=anchor))
+                continue
+
+            if not any(delta.values()) and (user_id, biweekly_start) != creatable:
+                continue
+
+            totals = summary.get_totals()
+            for field, minutes in delta.items():
+                totals[field] += minutes
+
+            summary.set_totals(totals)
+            if (user_id, biweekly_start) == creatable:
+                summary.attendance_id = attendance
+            summary.save()
+            summaries.append(summary)
+
+        logger.debug(f"[apply_attendance_change] User: {user_id}, Start: {biweekly_start}, Delta: {delta}")
+
+    return summaries
+
+
+def rebuild_summaries_for_dates(user_dates):
+    """
+    One consolidated rebuild per (user, payroll period) touched by a bulk write.
+    `user_dates` is an iterable of (user_id, date); bulk writes skip post_save, so callers use this
+    instead of the per-row delta path. Returns the set of (user_id, period_start) rebuilt.
+    """
+    user_dates = set(user_dates)
+    if not user_dates:
+        return set()
+
+    periods = defaultdict(list)
+    schedules = Schedule.objects.filter(
+        user_id__in={user_id for user_id, _ in user_dates},
+        payroll_period_start__isnull=False,
+        payroll_period_end__isnull=False,
+    ).values_list("user_id", "payroll_period_start", "payroll_period_end")
+    for user_id, start, end in schedules:
+        periods[user_id].append((start, end))
+
+    targets = set()
+    for user_id, attendance_date in user_dates:
+        # Same choice as get_biweekly_period: the latest period that contains the date
+        matching = [start for start, end in periods[user_id] if start <= attendance_date <= end]
+        if matching:
+            targets.add((user_id, max(matching)))
+
+    with shift_index():
+        for user_id, start in targets:
+            rebuild_attendance_summary(user_id, start)
+
+    return targets
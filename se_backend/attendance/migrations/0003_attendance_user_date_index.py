@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_remove_attendance_biometric_data_id_attendance_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['user', 'date'], name='attendance__user_id_c01e0c_idx'),
+        ),
+    ]
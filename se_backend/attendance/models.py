@@ -12,5 +12,18 @@ class Attendance(models.Model):
     check_in_time = models.TimeField()
     check_out_time = models.TimeField()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what is stored so the summary engine can back out the old contribution on save
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    class Meta:
+        indexes = [
+            # One row per user and day is looked up on every punch
+            models.Index(fields=["user", "date"]),
+        ]
+
     def __str__(self):
-        return f"{self.id} - {self.user_id}"
\ No newline at end of file
+        return f"{self.id} - {self.user_id}"
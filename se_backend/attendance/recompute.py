@@ -0,0 +1,115 @@
+import logging
+import time
+from datetime import date, timedelta
+
+import redis
+from django.conf import settings
+from django.db import transaction
+
+from attendance_summary.models import AttendanceSummary
+from .aggregation import SUMMARY_WINDOW_DAYS, rebuild_attendance_summary
+from .shift_index import shift_index
+from .signals import get_biweekly_period
+from .tasks import flush_attendance_recomputes
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of "user_id:period_start" members scored by the time they become due
+PENDING_KEY = "attendance:recompute:pending"
+# Members due within this many seconds are flushed too, so a countdown firing a little early still drains them
+DUE_TOLERANCE_SECONDS = 1
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.RECOMPUTE_QUEUE_URL)
+    return _client
+
+
+def queue_enabled():
+    return settings.RECOMPUTE_DEBOUNCE_SECONDS > 0
+
+
+def attendance_periods(user_id, attendance_date):
+    """
+    (user_id, period_start) pairs an attendance row on `attendance_date` counts towards:
+    every summary whose 15-day window holds the date, plus the date's own payroll period.
+    """
+    if user_id is None or attendance_date is None:
+        return set()
+
+    starts = set(AttendanceSummary.objects.filter(
+        user_id=user_id,
+        date__gt=attendance_date - timedelta(days=SUMMARY_WINDOW_DAYS),
+        date__lte=attendance_date,
+    ).values_list("date", flat=True))
+
+    own_start = get_biweekly_period(attendance_date, user_id)
+    if own_start is not None:
+        starts.add(own_start)
+
+    return {(user_id, start) for start in starts}
+
+
+def request_recompute(periods):
+    """
+    Ask for AttendanceSummary rebuilds of the given (user_id, period_start) pairs.
+    With RECOMPUTE_DEBOUNCE_SECONDS set, the pairs are queued once the transaction commits and
+    repeated requests inside the window coalesce; otherwise they are rebuilt right away.
+    """
+    periods = {(user_id, start) for user_id, start in periods if user_id is not None and start is not None}
+    if not periods:
+        return
+
+    if not queue_enabled():
+        with shift_index():
+            for user_id, start in periods:
+                rebuild_attendance_summary(user_id, start)
+        return
+
+    transaction.on_commit(lambda: enqueue_recomputes(periods))
+
+
+def enqueue_recomputes(periods):
+    """
+    Add pairs to the pending set. Only pairs that were not already pending get a due time, so a
+    burst of edits keeps the first one's deadline and one flush task covers the whole burst.
+    """
+    window = settings.RECOMPUTE_DEBOUNCE_SECONDS
+    due = time.time() + window
+
+    pipe = get_client().pipeline()
+    for user_id, start in periods:
+        pipe.zadd(PENDING_KEY, {f"{user_id}:{start.isoformat()}": due}, nx=True)
+    added = sum(pipe.execute())
+
+    if added:
+        flush_attendance_recomputes.apply_async(countdown=window)
+    logger.debug(f"[enqueue_recomputes] {added} of {len(periods)} periods newly queued")
+    return added
+
+
+def pop_due_recomputes(now=None):
+    """
+    Claim and return the (user_id, period_start) pairs whose window has passed.
+    ZREM decides ownership, so concurrent flushers never rebuild the same pair twice.
+    """
+    client = get_client()
+    now = time.time() if now is None else now
+    members = client.zrangebyscore(PENDING_KEY, "-inf", now + DUE_TOLERANCE_SECONDS)
+    if not members:
+        return []
+
+    pipe = client.pipeline()
+    for member in members:
+        pipe.zrem(PENDING_KEY, member)
+    claimed = [member for member, removed in zip(members, pipe.execute()) if removed]
+
+    periods = []
+    for member in claimed:
+        user_id, start = member.decode().split(":")
+        periods.append((int(user_id), date.fromisoformat(start)))
+    return periods
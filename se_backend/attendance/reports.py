@@ -0,0 +1,100 @@
+from django.db import connection
+
+from schedule.models import Schedule
+from shift.models import Shift
+
+# group_by value -> grouping column of the report query; "company" collapses everything into one row
+GROUPINGS = {
+    "user": "user_id",
+    "date": "date",
+    "period": "period_start",
+    "company": None,
+}
+
+# Per-row contributions, mirroring attendance.aggregation.attendance_contribution: rows without a
+# covering schedule or a shift count nothing, and holiday minutes are kept apart from the
+# worked/overtime/late/undertime totals. The covering schedule is get_shift_details' choice: the
+# latest one whose payroll period contains the date.
+REPORT_SQL = """
+WITH rows AS (
+    SELECT
+        att.user_id,
+        att.date,
+        att.status,
+        schedule.payroll_period_start AS period_start,
+        GREATEST(
+            (EXTRACT(HOUR FROM att.check_out_time) * 60 + EXTRACT(MINUTE FROM att.check_out_time))
+            - (EXTRACT(HOUR FROM att.check_in_time) * 60 + EXTRACT(MINUTE FROM att.check_in_time)) - 60,
+            0
+        ) AS worked,
+        GREATEST(
+            (EXTRACT(HOUR FROM att.check_in_time) * 60 + EXTRACT(MINUTE FROM att.check_in_time))
+            - (EXTRACT(HOUR FROM shift.shift_start) * 60 + EXTRACT(MINUTE FROM shift.shift_start)),
+            0
+        ) AS late,
+        shift.expected_hours * 60 AS expected,
+        CASE
+            WHEN schedule.id IS NULL OR shift.id IS NULL THEN 'none'
+            WHEN schedule.specialholiday @> ARRAY[att.date] THEN 'special'
+            WHEN schedule.regularholiday @> ARRAY[att.date] THEN 'regular'
+            ELSE 'work'
+        END AS kind
+    FROM ({attendance}) att
+    LEFT JOIN LATERAL (
+        SELECT s.id, s.payroll_period_start, s.specialholiday, s.regularholiday
+        FROM {schedule_table} s
+        WHERE s.user_id_id = att.user_id
+          AND s.payroll_period_start <= att.date
+          AND s.payroll_period_end >= att.date
+        ORDER BY s.payroll_period_start DESC
+        LIMIT 1
+    ) schedule ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT sh.id, sh.shift_start, sh.expected_hours
+        FROM {shift_table} sh
+        JOIN {schedule_shifts_table} link ON link.shift_id = sh.id
+        WHERE link.schedule_id = schedule.id AND sh.date = att.date
+        ORDER BY sh.id
+        LIMIT 1
+    ) shift ON TRUE
+)
+SELECT
+    {select_key}
+    COALESCE(SUM(worked) FILTER (WHERE kind = 'work'), 0)::int AS worked_minutes,
+    COALESCE(SUM(GREATEST(worked - expected, 0)) FILTER (WHERE kind = 'work'), 0)::int AS overtime_minutes,
+    COALESCE(SUM(late) FILTER (WHERE kind = 'work'), 0)::int AS late_minutes,
+    COALESCE(SUM(GREATEST(expected - worked, 0)) FILTER (WHERE kind = 'work'), 0)::int AS undertime_minutes,
+    COALESCE(SUM(worked) FILTER (WHERE kind = 'special'), 0)::int AS specialholiday_minutes,
+    COALESCE(SUM(worked) FILTER (WHERE kind = 'regular'), 0)::int AS regularholiday_minutes,
+    COUNT(*) FILTER (WHERE status <> 'Absent') AS present_days,
+    COUNT(*) FILTER (WHERE kind = 'work' AND late > 0) AS late_days,
+    COUNT(*) FILTER (WHERE status = 'Absent') AS absent_days
+FROM rows
+{group_by}
+"""
+
+
+def attendance_report(queryset, group_by="user"):
+    """
+    Roll the Attendance rows of `queryset` up into one row per `group_by` key (see GROUPINGS):
+    minute totals plus present/late/absent day counts, in a single grouped query.
+    `queryset` keeps its filters and owner scoping; rows are ordered by the key.
+    """
+    key = GROUPINGS[group_by]
+    attendance_sql, params = queryset.order_by().values(
+        "user_id", "date", "status", "check_in_time", "check_out_time"
+    ).query.sql_with_params()
+
+    sql = REPORT_SQL.format(
+        attendance=attendance_sql,
+        schedule_table=Schedule._meta.db_table,
+        shift_table=Shift._meta.db_table,
+        schedule_shifts_table=Schedule.shift_ids.through._meta.db_table,
+        select_key=f"{key}," if key else "",
+        group_by=f"GROUP BY {key} ORDER BY {key}" if key else "",
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [column.name for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,90 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+from schedule.models import Schedule
+from shift.models import Shift
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class ShiftIndex:
+    """
+    Per-period shift lookups for a recompute: each user's payroll periods are read once, and each
+    schedule's shifts are loaded once as a {date: Shift} dict through one join on Schedule.shift_ids.
+    """
+
+    def __init__(self):
+        self._periods = {}  # user_id -> [(start, end, schedule_id)], latest start first
+        self._shifts = {}   # schedule_id -> {date: Shift}
+
+    def schedule_id(self, user_id, date):
+        """Same choice as get_shift_details: the latest schedule whose payroll period contains the date."""
+        if user_id not in self._periods:
+            self._periods[user_id] = list(
+                Schedule.objects.filter(
+                    user_id=user_id,
+                    payroll_period_start__isnull=False,
+                    payroll_period_end__isnull=False,
+                ).order_by("-payroll_period_start").values_list("payroll_period_start", "payroll_period_end", "id")
+            )
+
+        for start, end, schedule_id in self._periods[user_id]:
+            if start <= date <= end:
+                return schedule_id
+        return None
+
+    def shifts(self, schedule_id):
+        if schedule_id not in self._shifts:
+            by_date = {}
+            # Lowest id wins on a date with several shifts, like the .first() it replaces
+            for shift in Shift.objects.filter(schedule=schedule_id).order_by("-id"):
+                by_date[shift.date] = shift
+            self._shifts[schedule_id] = by_date
+        return self._shifts[schedule_id]
+
+    def shift(self, user_id, date):
+        schedule_id = self.schedule_id(user_id, date)
+        if schedule_id is None:
+            logger.warning(f"[ShiftIndex] No schedule found for User: {user_id} that includes Date: {date}")
+            return None
+
+        shift = self.shifts(schedule_id).get(date)
+        if shift is None:
+            logger.warning(f"[ShiftIndex] No shift found for User: {user_id}, Date: {date}, in Schedule: {schedule_id}")
+        return shift
+
+    def clear(self):
+        self._periods.clear()
+        self._shifts.clear()
+
+
+def active_shift_index():
+    return getattr(_local, "index", None)
+
+
+@contextmanager
+def shift_index():
+    """
+    Share one ShiftIndex across everything that runs inside the block on this thread.
+    Nested blocks reuse the outer index; it is dropped when the outermost block exits.
+    """
+    index = active_shift_index()
+    if index is not None:
+        yield index
+        return
+
+    _local.index = ShiftIndex()
+    try:
+        yield _local.index
+    finally:
+        _local.index = None
+
+
+def invalidate_shift_index():
+    """Forget loaded periods and shifts; called when a Shift, a Schedule or Schedule.shift_ids changes."""
+    index = active_shift_index()
+    if index is not None:
+        index.clear()
@@ -1,5 +1,5 @@
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils.timezone import now
 from datetime import timedelta, date
@@ -7,6 +7,7 @@ from .models import Attendance
 from attendance_summary.models import AttendanceSummary
 from shift.models import Shift
 from schedule.models import Schedule
+from .shift_index import active_shift_index
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,10 @@ def get_biweekly_period(date, user):
 
 def get_shift_details(user, date):
     """Retrieve shift details for the given user and date based on the correct biweekly schedule."""
+    index = active_shift_index()
+    if index is not None:
+        return index.shift(user, date)
+
     schedule = Schedule.objects.filter(
         user_id=user,
         payroll_period_start__lte=date,
@@ -74,127 +79,71 @@ def get_shift_details(user, date):
 # late_minutes = models.IntegerField()
 # undertime = models.IntegerField()
 
+@receiver(pre_save, sender=Attendance)
+def capture_previous_attendance(sender, instance, **kwargs):
+    """Keep the stored values of an updated row so its old contribution can be backed out."""
+    previous = None
+
+    if not instance._state.adding and instance.pk is not None:
+        loaded = getattr(instance, "_loaded_values", None)
+        fields = ("user_id", "date", "check_in_time", "check_out_time")
+
+        if loaded and all(field in loaded for field in fields):
+            previous = {field: loaded[field] for field in fields}
+        else:
+            previous = Attendance.objects.filter(pk=instance.pk).values(*fields).first()
+
+    instance._previous_values = previous
+
+
 @receiver(post_save, sender=Attendance)
 def generate_attendance_summary(sender, instance, **kwargs):
-    user = instance.user
-    date = instance.date
-    check_in = instance.check_in_time
-    check_out = instance.check_out_time
-
-    logger.debug(f"[generate_attendance_summary] Processing attendance for User: {user}, Date: {date}")
-
-    if not check_in or not check_out or check_in == check_out:
-        logger.warning(f"[generate_attendance_summary] Skipping invalid attendance for User: {user}, Date: {date}")
-        return
-
-    biweekly_start = get_biweekly_period(date, user)
-    shift = get_shift_details(user, date)
-    schedule = Schedule.objects.filter(user_id=user, bi_weekly_start=biweekly_start).first()
-
-    if not shift or not schedule:
-        logger.warning(f"[generate_attendance_summary] No shift or schedule for User: {user}, Date: {date}. Skipping.")
-        return
-
-    actual_minutes = calculate_minutes(check_in, check_out)
-    expected_minutes = shift.expected_hours * 60
-
-    logger.debug(f"[generate_attendance_summary] Check-in: {check_in}, Check-out: {check_out}, "
-                 f"Actual: {actual_minutes}m, Expected: {expected_minutes}m")
-
-    # Check for holidays
-    logger.debug(f"[generate_attendance_summary] Checking for holiday on {date} for User: {user}")
-    is_special = date in (schedule.specialholiday or [])
-    is_regular = date in (schedule.regularholiday or [])
-    logger.debug(f"[generate_attendance_summary] is_special: {is_special}, is_regular: {is_regular}")
-
-    special_minutes = 0
-    regular_minutes = 0
-
-    if is_special:
-        special_minutes = actual_minutes
-        logger.info(f"[generate_attendance_summary] SPECIAL HOLIDAY on {date} — Worked: {special_minutes} minutes")
-    elif is_regular:
-        regular_minutes = actual_minutes
-        logger.info(f"[generate_attendance_summary] REGULAR HOLIDAY on {date} — Worked: {regular_minutes} minutes")
-
-    # If it's a holiday, exclude from regular computations
-    if is_special or is_regular:
-        actual_minutes = 0
-        expected_minutes = 0
-        late_minutes = 0
-        overtime_minutes = 0
-        undertime_minutes = 0
+    """
+    Fold this attendance write into the biweekly AttendanceSummary incrementally.
+    See attendance.aggregation for the delta rules; full rebuilds go through
+    attendance.tasks.rebuild_attendance_summaries.
+    With the recompute queue enabled the affected periods are queued instead (attendance.recompute).
+    """
+    from .aggregation import apply_attendance_change
+    from .recompute import attendance_periods, queue_enabled, request_recompute
+
+    logger.debug(f"[generate_attendance_summary] Processing attendance for User: {instance.user_id}, Date: {instance.date}")
+
+    previous = getattr(instance, "_previous_values", None)
+    if queue_enabled():
+        periods = attendance_periods(instance.user_id, instance.date)
+        if previous:
+            periods |= attendance_periods(previous["user_id"], previous["date"])
+        request_recompute(periods)
     else:
-        shift_start_minutes = shift.shift_start.hour * 60 + shift.shift_start.minute
-        check_in_minutes = check_in.hour * 60 + check_in.minute
-        late_minutes = max(0, check_in_minutes - shift_start_minutes)
-        overtime_minutes = max(0, actual_minutes - expected_minutes)
-        undertime_minutes = max(0, expected_minutes - actual_minutes)
-
-        logger.debug(f"[generate_attendance_summary] Late: {late_minutes}m, OT: {overtime_minutes}m, "
-                     f"UT: {undertime_minutes}m")
-
-    # Sum up totals for biweekly
-    biweekly_attendance = Attendance.objects.filter(
-        user=user,
-        date__gte=biweekly_start,
-        date__lt=biweekly_start + timedelta(days=15)
-    )
-
-    total_actual_minutes = 0
-    total_overtime_minutes = 0
-    total_late_minutes = 0
-    total_undertime_minutes = 0
-    total_special_minutes = 0
-    total_regular_minutes = 0
-
-    for att in biweekly_attendance:
-        att_shift = get_shift_details(user, att.date)
-        att_schedule = Schedule.objects.filter(user_id=user, bi_weekly_start=biweekly_start).first()
-
-        if not att_shift or not att_schedule:
-            logger.warning(f"[generate_attendance_summary] Skipping attendance on {att.date} due to missing shift or schedule.")
-            continue
-
-        worked_minutes = calculate_minutes(att.check_in_time, att.check_out_time)
-
-        logger.debug(f"[generate_attendance_summary] Processing {att.date} — Worked: {worked_minutes}m")
-
-        if att.date in (att_schedule.specialholiday or []):
-            total_special_minutes += worked_minutes
-            logger.info(f"[generate_attendance_summary] Adding {worked_minutes}m to SPECIAL HOLIDAY total for {att.date}")
-            continue
-
-        if att.date in (att_schedule.regularholiday or []):
-            total_regular_minutes += worked_minutes
-            logger.info(f"[generate_attendance_summary] Adding {worked_minutes}m to REGULAR HOLIDAY total for {att.date}")
-            continue
-
-        expected = att_shift.expected_hours * 60
-        total_actual_minutes += worked_minutes
-        total_overtime_minutes += max(0, worked_minutes - expected)
-        total_late_minutes += max(0, (att.check_in_time.hour * 60 + att.check_in_time.minute) -
-                                   (att_shift.shift_start.hour * 60 + att_shift.shift_start.minute))
-        total_undertime_minutes += max(0, expected - worked_minutes)
-
-    logger.debug(f"[generate_attendance_summary] FINAL BIWEEKLY TOTALS — "
-                 f"Actual: {total_actual_minutes}m, OT: {total_overtime_minutes}m, "
-                 f"Late: {total_late_minutes}m, UT: {total_undertime_minutes}m, "
-                 f"Special: {total_special_minutes}m, Regular: {total_regular_minutes}m")
-
-    # Save summary
-    summary, _ = AttendanceSummary.objects.update_or_create(
-        user_id=user,
-        date=biweekly_start,
-        defaults={
-            'actual_hours': total_actual_minutes // 60,
-            'overtime_hours': total_overtime_minutes // 60,
-            'late_minutes': total_late_minutes,
-            'undertime': total_undertime_minutes // 60,
-            'specialholiday': total_special_minutes // 60,
-            'regularholiday': total_regular_minutes // 60,
-            'attendance_id': instance
-        }
-    )
-
-    logger.info(f"[generate_attendance_summary] AttendanceSummary UPDATED for User: {user}, Start: {biweekly_start}")
+        apply_attendance_change(instance, previous=previous)
+
+    # The saved values become the baseline for the next save of this same instance
+    instance._loaded_values = {
+        "user_id": instance.user_id,
+        "date": instance.date,
+        "check_in_time": instance.check_in_time,
+        "check_out_time": instance.check_out_time,
+    }
+    instance._previous_values = None
+
+
+@receiver(post_delete, sender=Attendance)
+def remove_attendance_from_summary(sender, instance, **kwargs):
+    """
+    Back a deleted attendance row out of the summaries that still count it.
+    A summary anchored on this row (attendance_id) is removed by the FK cascade and rebuilt on the next write.
+    """
+    from .aggregation import apply_attendance_change
+    from .recompute import attendance_periods, queue_enabled, request_recompute
+
+    previous = getattr(instance, "_loaded_values", None) or {
+        "user_id": instance.user_id,
+        "date": instance.date,
+        "check_in_time": instance.check_in_time,
+        "check_out_time": instance.check_out_time,
+    }
+    if queue_enabled():
+        request_recompute(attendance_periods(previous["user_id"], previous["date"]))
+    else:
+        apply_attendance_change(instance, previous=previous, deleted=True)
@@ -0,0 +1,54 @@
+import logging
+from celery import shared_task
+from attendance_summary.models import AttendanceSummary
+from .aggregation import rebuild_attendance_summary
+from .shift_index import shift_index
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def rebuild_attendance_summaries(user_id=None, biweekly_start=None):
+    """
+    Explicit full recompute of AttendanceSummary rows from their Attendance windows.
+    Narrow it with user_id and/or biweekly_start (YYYY-MM-DD); with neither, every summary is rebuilt.
+    """
+    summaries = AttendanceSummary.objects.all()
+    if user_id:
+        summaries = summaries.filter(user_id=user_id)
+    if biweekly_start:
+        summaries = summaries.filter(date=biweekly_start)
+
+    rebuilt = 0
+    with shift_index():
+        for user, start in summaries.values_list("user_id", "date").distinct():
+            rebuild_attendance_summary(user, start)
+            rebuilt += 1
+
+    logger.info(f"[rebuild_attendance_summaries] Rebuilt {rebuilt} attendance summaries.")
+    return f"Rebuilt {rebuilt} attendance summaries"
+
+
+@shared_task
+def flush_attendance_recomputes():
+    """
+    Rebuild every queued (user, payroll period) whose debounce window has passed (see attendance.recompute).
+    A failed rebuild is put back on the queue.
+    """
+    from .recompute import enqueue_recomputes, pop_due_recomputes
+
+    periods = pop_due_recomputes()
+    failed = set()
+    with shift_index():
+        for user_id, start in periods:
+            try:
+                rebuild_attendance_summary(user_id, start)
+            except Exception:
+                logger.exception(f"[flush_attendance_recomputes] Rebuild failed for User: {user_id}, Start: {start}")
+                failed.add((user_id, start))
+
+    if failed:
+        enqueue_recomputes(failed)
+
+    logger.info(f"[flush_attendance_recomputes] Rebuilt {len(periods) - len(failed)} of {len(periods)} queued periods.")
+    return f"Rebuilt {len(periods) - len(failed)} attendance summaries"
@@ -1,9 +1,31 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
-from datetime import time, date
+from datetime import time, date, timedelta
+from unittest import mock
+import time as clock
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from shared.auth.serializers import LoginSerializer
+from shared.explain import scan_nodes, uses_index_scan
 
 from users.models import CustomUser
 from attendance.models import Attendance
+from attendance.aggregation import rebuild_attendance_summary
+from attendance.reports import attendance_report
+from attendance.shift_index import shift_index
+from attendance.recompute import PENDING_KEY, get_client
+from attendance.tasks import flush_attendance_recomputes
+from attendance_summary.models import AttendanceSummary
+from employment_info.models import EmploymentInfo
+from overtimehours.models import OvertimeHours
+from payroll.models import Payroll
+from salary.models import Salary
+from schedule.models import Schedule
+from shift.models import Shift
 
 class AttendanceModelTestCase(TestCase):
     def setUp(self):
@@ -42,3 +64,370 @@ class AttendanceModelTestCase(TestCase):
     def test_delete_attendance(self):
         self.attendance.delete()
         self.assertEqual(Attendance.objects.count(), 0)
+
+
+class PeriodScheduleMixin:
+    """One employee with a 15-day payroll period, a 9:00 8-hour shift per day and a regular holiday on the 9th."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="aggregate@example.com",
+            password="testpassword",
+            role="employee"
+        )
+        self.start = date(2025, 4, 1)
+        self.schedule = Schedule.objects.create(
+            user_id=self.user,
+            payroll_period_start=self.start,
+            payroll_period_end=date(2025, 4, 15),
+            bi_weekly_start=self.start,
+            regularholiday=[date(2025, 4, 9)],
+            specialholiday=[],
+            hours=0
+        )
+        for offset in range(15):
+            shift = Shift.objects.create(
+                date=self.start + timedelta(days=offset),
+                shift_start=time(9, 0),
+                shift_end=time(18, 0),
+                expected_hours=8
+            )
+            self.schedule.shift_ids.add(shift)
+
+    def _punch(self, day, check_in, check_out):
+        return Attendance.objects.create(
+            user=self.user,
+            date=date(2025, 4, day),
+            status="Present",
+            check_in_time=check_in,
+            check_out_time=check_out
+        )
+
+
+class AttendanceSummaryAggregationTestCase(PeriodScheduleMixin, TestCase):
+    def _assert_matches_rebuild(self):
+        summary = AttendanceSummary.objects.get(user_id=self.user, date=self.start)
+        incremental = summary.get_totals()
+        hours = (summary.actual_hours, summary.overtime_hours, summary.undertime, summary.regularholiday)
+
+        rebuilt = rebuild_attendance_summary(self.user.id, self.start)
+        self.assertEqual(incremental, rebuilt.get_totals())
+        self.assertEqual(hours, (rebuilt.actual_hours, rebuilt.overtime_hours, rebuilt.undertime, rebuilt.regularholiday))
+        return rebuilt
+
+    def test_inserts_accumulate(self):
+        self._punch(7, time(9, 30), time(18, 0))
+        self._punch(8, time(8, 0), time(20, 0))
+        self._punch(9, time(9, 0), time(17, 0))  # regular holiday
+
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.late_minutes, 30)
+        self.assertEqual(summary.actual_minutes, 450 + 660)
+        self.assertEqual(summary.overtime_minutes, 180)
+        self.assertEqual(summary.undertime_minutes, 30)
+        self.assertEqual(summary.regularholiday_minutes, 420)
+
+    def test_update_replaces_old_contribution(self):
+        self._punch(7, time(9, 0), time(18, 0))
+        attendance = self._punch(8, time(9, 0), time(9, 0))
+
+        attendance = Attendance.objects.get(id=attendance.id)
+        attendance.check_out_time = time(19, 0)
+        attendance.save()
+
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.actual_minutes, 480 + 540)
+        self.assertEqual(summary.overtime_minutes, 60)
+
+    def test_date_change_and_delete(self):
+        first = self._punch(7, time(9, 0), time(18, 0))
+        second = self._punch(8, time(10, 0), time(18, 0))
+
+        second.date = date(2025, 4, 9)
+        second.save()
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.late_minutes, 0)
+        self.assertEqual(summary.regularholiday_minutes, 420)
+
+        Attendance.objects.get(id=first.id).delete()
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.actual_minutes, 0)
+        self.assertEqual(summary.regularholiday_minutes, 420)
+        self.assertEqual(summary.attendance_id_id, second.id)
+
+    def test_schedule_edit_rebuilds_period(self):
+        self._punch(9, time(9, 0), time(18, 0))  # regular holiday
+        attendance = self._punch(10, time(9, 0), time(18, 0))
+
+        self.schedule.regularholiday = [date(2025, 4, 9), date(2025, 4, 10)]
+        self.schedule.save()
+
+        attendance = Attendance.objects.get(id=attendance.id)
+        attendance.check_out_time = time(19, 0)
+        attendance.save()
+
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.regularholiday_minutes, 480 + 540)
+        self.assertEqual(summary.actual_minutes, 0)
+
+    def test_shift_delete_rebuilds_period(self):
+        attendance = self._punch(7, time(9, 0), time(18, 0))
+        self._punch(8, time(9, 0), time(18, 0))
+
+        Shift.objects.get(date=date(2025, 4, 8)).delete()
+
+        attendance = Attendance.objects.get(id=attendance.id)
+        attendance.check_out_time = time(19, 0)
+        attendance.save()
+
+        summary = self._assert_matches_rebuild()
+        self.assertEqual(summary.actual_minutes, 540)
+
+    def test_single_punch_does_not_create_summary(self):
+        self._punch(7, time(9, 0), time(9, 0))
+        self.assertFalse(AttendanceSummary.objects.filter(user_id=self.user).exists())
+
+
+@override_settings(RECOMPUTE_DEBOUNCE_SECONDS=30)
+class AttendanceRecomputeQueueTestCase(TestCase):
+    def setUp(self):
+        get_client().delete(PENDING_KEY)
+        self.user = CustomUser.objects.create_user(
+            email="queue@example.com",
+            password="testpassword",
+            role="employee"
+        )
+        self.start = date(2025, 4, 1)
+        self.schedule = Schedule.objects.create(
+            user_id=self.user,
+            payroll_period_start=self.start,
+            payroll_period_end=date(2025, 4, 15),
+            bi_weekly_start=self.start,
+            regularholiday=[],
+            specialholiday=[],
+            hours=0
+        )
+        self.shifts = {}
+        for day in (7, 8):
+            self.shifts[day] = Shift.objects.create(
+                date=date(2025, 4, day),
+                shift_start=time(9, 0),
+                shift_end=time(18, 0),
+                expected_hours=8
+            )
+            self.schedule.shift_ids.add(self.shifts[day])
+
+    def tearDown(self):
+        get_client().delete(PENDING_KEY)
+
+    @mock.patch("attendance.recompute.flush_attendance_recomputes.apply_async")
+    def test_burst_collapses_into_one_recompute(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            for day in (7, 8):
+                Attendance.objects.create(
+                    user=self.user, date=date(2025, 4, day), status="Present",
+                    check_in_time=time(9, 30), check_out_time=time(18, 0)
+                )
+            self.shifts[7].shift_start = time(10, 0)
+            self.shifts[7].save()
+
+        self.assertFalse(AttendanceSummary.objects.exists())
+        self.assertEqual(get_client().zcard(PENDING_KEY), 1)
+        apply_async.assert_called_once_with(countdown=30)
+
+        with mock.patch("attendance.recompute.time") as fake_time:
+            fake_time.time.return_value = clock.time() + 60
+            flush_attendance_recomputes()
+
+        summary = AttendanceSummary.objects.get(user_id=self.user, date=self.start)
+        self.assertEqual(summary.late_minutes, 30)
+        self.assertEqual(summary.actual_minutes, 450 * 2)
+        self.assertEqual(get_client().zcard(PENDING_KEY), 0)
+
+    @mock.patch("attendance.recompute.flush_attendance_recomputes.apply_async")
+    def test_nothing_is_flushed_before_the_window_passes(self, apply_async):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule.shift_ids.remove(self.shifts[8])
+
+        flush_attendance_recomputes()
+        self.assertEqual(get_client().zcard(PENDING_KEY), 1)
+
+
+class AttendanceOwnerScopingTestCase(TestCase):
+    def setUp(self):
+        self.employee = CustomUser.objects.create_user(email="self@example.com", password="password", role="employee")
+        self.other = CustomUser.objects.create_user(email="other@example.com", password="password", role="employee")
+        self.owner = CustomUser.objects.create_user(email="boss@example.com", password="password", role="owner")
+        for user in (self.employee, self.other):
+            Attendance.objects.create(user=user, date=date(2025, 4, 7), status="Present",
+                                      check_in_time=time(9, 0), check_out_time=time(17, 0))
+        self.url = reverse("attendance:attendance-list")
+
+    def _client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(user).access_token}")
+        return client
+
+    def test_employee_lists_only_own_rows(self):
+        response = self._client(self.employee).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({row["user"] for row in response.data}, {self.employee.id})
+
+    def test_employee_cannot_retrieve_other_rows(self):
+        other_row = Attendance.objects.get(user=self.other)
+        response = self._client(self.employee).get(reverse("attendance:attendance-detail", args=[other_row.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_owner_lists_every_row(self):
+        response = self._client(self.owner).get(self.url)
+        self.assertEqual(len(response.data), 2)
+
+
+class AttendanceReportTestCase(PeriodScheduleMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self._punch(2, time(9, 30), time(17, 0))
+        self._punch(3, time(8, 55), time(19, 10))
+        self._punch(9, time(9, 0), time(18, 0))  # Regular holiday
+        self.owner = CustomUser.objects.create_user(email="report@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(self.owner).access_token}")
+        self.url = reverse("attendance:attendance-report")
+
+    def test_period_rollup_matches_summary(self):
+        response = self.client.get(self.url, {"group_by": "period"})
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(attendance_report(Attendance.objects.all(), group_by="period"), response.data)
+
+        [row] = response.data
+        totals = AttendanceSummary.objects.get(user_id=self.user, date=self.start).get_totals()
+        self.assertEqual(row["period_start"], self.start)
+        self.assertEqual(row["worked_minutes"], totals["actual_minutes"])
+        for field in ("overtime_minutes", "late_minutes", "undertime_minutes", "regularholiday_minutes"):
+            self.assertEqual(row[field], totals[field])
+        self.assertEqual((row["present_days"], row["late_days"]), (3, 1))
+
+    def test_date_and_company_rollups(self):
+        by_date = self.client.get(self.url, {"group_by": "date", "date_after": "2025-04-03"}).data
+        self.assertEqual([row["date"] for row in by_date], [date(2025, 4, 3), date(2025, 4, 9)])
+        self.assertEqual(by_date[0]["overtime_minutes"], (19 * 60 + 10) - (8 * 60 + 55) - 60 - 8 * 60)
+
+        [company] = self.client.get(self.url, {"group_by": "company"}).data
+        self.assertEqual(company["present_days"], 3)
+
+        self.assertEqual(self.client.get(self.url, {"group_by": "shift"}).status_code, 400)
+
+
+class HotQueryIndexTestCase(TestCase):
+    """EXPLAIN the lookups the signals and tasks run on every write and check each one is served by its index."""
+
+    def setUp(self):
+        users = CustomUser.objects.bulk_create([
+            CustomUser(email=f"indexed{n}@example.com", role="employee") for n in range(20)
+        ])
+        self.user = users[0]
+        self.day = date(2025, 4, 7)
+        Schedule.objects.bulk_create([
+            Schedule(user_id=user, payroll_period_start=date(2025, 4, 1) + timedelta(days=15 * n),
+                     payroll_period_end=date(2025, 4, 15) + timedelta(days=15 * n),
+                     bi_weekly_start=date(2025, 4, 1) + timedelta(days=15 * n), hours=0)
+            for user in users for n in range(4)
+        ])
+        Attendance.objects.bulk_create([
+            Attendance(user=user, date=self.day + timedelta(days=n), status="Present",
+                       check_in_time=time(9, 0), check_out_time=time(18, 0))
+            for user in users for n in range(60)
+        ])
+        Shift.objects.bulk_create([
+            Shift(date=self.day + timedelta(days=n), shift_start=time(9, 0), shift_end=time(18, 0), expected_hours=8)
+            for n in range(50)
+        ])
+        attendance = Attendance.objects.first()
+        AttendanceSummary.objects.bulk_create([
+            AttendanceSummary(user_id=user, attendance_id=attendance, date=date(2025, 4, 1) + timedelta(days=15 * n),
+                              actual_hours=0, overtime_hours=0, late_minutes=0, undertime=0)
+            for user in users for n in range(4)
+        ])
+        self.summary = AttendanceSummary.objects.filter(user_id=self.user).first()
+        OvertimeHours.objects.bulk_create([
+            OvertimeHours(attendancesummary=summary, user_id=summary.user_id_id, biweek_start=summary.date)
+            for summary in AttendanceSummary.objects.all()
+        ])
+        Salary.objects.bulk_create([
+            Salary(user_id=user, pay_date=date(2025, 4, 15) + timedelta(days=15 * n)) for user in users for n in range(4)
+        ])
+        Payroll.objects.bulk_create([
+            Payroll(user_id=user, pay_date=date(2025, 4, 15) + timedelta(days=15 * n)) for user in users for n in range(4)
+        ])
+        EmploymentInfo.objects.bulk_create([
+            EmploymentInfo(employee_number=1000 + n, first_name="Index", last_name=str(n), position="Staff",
+                           address="N/A", hire_date=date(2025, 1, 1), active=True)
+            for n in range(50)
+        ])
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            # A seeded test table fits in a page or two, where a sequential scan always wins;
+            # ruling it out shows whether an index can serve the predicate at all
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_hot_lookups_use_an_index_scan(self):
+        # (query, index added for it by the user-017 migrations); with sequential scans off the older
+        # FK indexes could serve most of these too, so the plan must name the new index
+        hot_queries = [
+            (Schedule.objects.filter(user_id=self.user, payroll_period_start__lte=self.day,
+                                     payroll_period_end__gte=self.day).order_by("-payroll_period_start"),
+             "schedule_sc_user_id_967e0f_idx"),
+            (Schedule.objects.filter(user_id=self.user, bi_weekly_start=date(2025, 4, 1)),
+             "schedule_sc_user_id_073535_idx"),
+            (Attendance.objects.filter(user=self.user, date=self.day), "attendance__user_id_c01e0c_idx"),
+            (Shift.objects.filter(date=self.day), "shift_shift_date_8e65ce_idx"),
+            (AttendanceSummary.objects.filter(user_id=self.user, date=date(2025, 4, 1)),
+             "unique_attendancesummary_user_id_date"),
+            # No new index: the attendancesummary FK index already matches at most one row
+            (OvertimeHours.objects.filter(attendancesummary=self.summary, user=self.user,
+                                          biweek_start=self.summary.date), None),
+            (Salary.objects.filter(user_id=self.user, pay_date=date(2025, 4, 15)), "salary_sala_user_id_fd9056_idx"),
+            (Payroll.objects.filter(pay_date=date(2025, 4, 15)), "payroll_pay_pay_dat_008cf5_idx"),
+            (EmploymentInfo.objects.filter(employee_number=1007), "employment__employe_a6adc2_idx"),
+        ]
+
+        for queryset, index_name in hot_queries:
+            with self.subTest(model=queryset.model.__name__, index=index_name):
+                scans = scan_nodes(queryset)
+                self.assertTrue(uses_index_scan(queryset), scans)
+                if index_name:
+                    self.assertIn(index_name, [name for _, name in scans])
+
+
+class ShiftIndexTestCase(PeriodScheduleMixin, TestCase):
+    def test_period_is_loaded_once(self):
+        with shift_index() as index, CaptureQueriesContext(connection) as queries:
+            shifts = [index.shift(self.user.id, self.start + timedelta(days=offset)) for offset in range(15)]
+
+        self.assertEqual(len(queries), 2)  # The user's periods, then the period's shifts in one join
+        self.assertTrue(all(shift.shift_start == time(9, 0) for shift in shifts))
+
+    def test_shift_save_invalidates(self):
+        day = date(2025, 4, 2)
+        with shift_index() as index:
+            shift = index.shift(self.user.id, day)
+            shift.shift_start = time(10, 0)
+            shift.save()
+
+            self.assertEqual(index.shift(self.user.id, day).shift_start, time(10, 0))
+
+    def test_shift_delete_invalidates(self):
+        day = date(2025, 4, 2)
+        with shift_index() as index:
+            index.shift(self.user.id, day).delete()
+
+            self.assertIsNone(index.shift(self.user.id, day))
+
+    def test_schedule_shifts_change_invalidates(self):
+        day = date(2025, 4, 2)
+        with shift_index() as index:
+            self.schedule.shift_ids.remove(index.shift(self.user.id, day))
+
+            self.assertIsNone(index.shift(self.user.id, day))
@@ -4,6 +4,7 @@ from rest_framework import status, viewsets
 from rest_framework.response import Response
 from shared.utils import role_required
 from .models import Attendance
+from .reports import GROUPINGS, attendance_report
 from .serializers import AttendanceSerializer
 from shared.generic_viewset import GenericViewset
 
@@ -11,6 +12,7 @@ from shared.generic_viewset import GenericViewset
 class AttendanceViewSet(GenericViewset, viewsets.ModelViewSet):
     protected_views = ["create", "update", "partial_update", "retrieve", "destroy", "list"]
     queryset = Attendance.objects.all()
+    owner_field = "user"  # Employees only see their own rows
     serializer_class = AttendanceSerializer
     permission_classes = [IsAuthenticated]  # Default permission for authenticated users
 
@@ -87,3 +89,34 @@ class AttendanceViewSet(GenericViewset, viewsets.ModelViewSet):
         # Use the existing pagination and serialization from list method
         return super().list(request, *args, **kwargs)
 
+    @action(detail=False, methods=['get'], url_path='report')
+    @role_required(["owner", "admin", "employee"])
+    def report(self, request, *args, **kwargs):
+        """
+        Aggregated attendance for a date range, computed in one grouped query:
+        - Group rows: ?group_by=user|date|period|company (default: user; company returns a single totals row)
+        - Filter by user ID: ?user=${userId} (employees only ever get their own rows)
+        - Filter by date range: ?date_after=${firstDay}&date_before=${lastDay}
+        """
+        group_by = request.query_params.get('group_by', 'user')
+        if group_by not in GROUPINGS:
+            return Response(
+                {"error": f"group_by must be one of: {', '.join(GROUPINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.get_queryset()
+
+        user_id = request.query_params.get('user', None)
+        if user_id:
+            queryset = queryset.filter(user_id=user_id)
+
+        date_after = request.query_params.get('date_after', None)
+        if date_after:
+            queryset = queryset.filter(date__gte=date_after)
+
+        date_before = request.query_params.get('date_before', None)
+        if date_before:
+            queryset = queryset.filter(date__lte=date_before)
+
+        return Response(attendance_report(queryset, group_by=group_by))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.5 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance_summary', '0002_attendancesummary_regularholiday_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='actual_minutes',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='overtime_minutes',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='regularholiday_minutes',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='specialholiday_minutes',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='undertime_minutes',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_summaries(apps, schema_editor):
+    """Keep the oldest summary of every (user, biweekly start) so the unique constraint can be added."""
+    AttendanceSummary = apps.get_model("attendance_summary", "AttendanceSummary")
+    keep = (
+        AttendanceSummary.objects.values("user_id", "date")
+        .annotate(keep_id=Min("id"))
+        .values_list("keep_id", flat=True)
+    )
+    AttendanceSummary.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance_summary', '0003_attendancesummary_actual_minutes_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_summaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attendancesummary',
+            constraint=models.UniqueConstraint(fields=('user_id', 'date'), name='unique_attendancesummary_user_id_date'),
+        ),
+    ]
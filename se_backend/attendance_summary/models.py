@@ -1,10 +1,11 @@
 from django.db import models
 
 from attendance.models import Attendance
+from shared.models import DirtyFieldsMixin
 from users.models import CustomUser
 
 
-class AttendanceSummary(models.Model):
+class AttendanceSummary(DirtyFieldsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     user_id = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     attendance_id = models.ForeignKey(Attendance, on_delete=models.CASCADE)
@@ -16,5 +17,46 @@ class AttendanceSummary(models.Model):
     specialholiday = models.IntegerField(null=True)
     regularholiday = models.IntegerField(null=True)
 
+    # Running minute totals kept by attendance.aggregation. The hour columns above are derived
+    # from these; NULL means the summary predates the engine and needs a full rebuild.
+    actual_minutes = models.IntegerField(null=True, blank=True)
+    overtime_minutes = models.IntegerField(null=True, blank=True)
+    undertime_minutes = models.IntegerField(null=True, blank=True)
+    specialholiday_minutes = models.IntegerField(null=True, blank=True)
+    regularholiday_minutes = models.IntegerField(null=True, blank=True)
+
+    MINUTE_FIELDS = (
+        "actual_minutes",
+        "overtime_minutes",
+        "late_minutes",
+        "undertime_minutes",
+        "specialholiday_minutes",
+        "regularholiday_minutes",
+    )
+
+    def is_tracked(self):
+        """True when the running minute totals can be adjusted incrementally."""
+        return all(getattr(self, field) is not None for field in self.MINUTE_FIELDS)
+
+    def get_totals(self):
+        return {field: getattr(self, field) or 0 for field in self.MINUTE_FIELDS}
+
+    def set_totals(self, totals):
+        """Store minute totals and derive the hour columns the rest of the payroll chain reads."""
+        for field in self.MINUTE_FIELDS:
+            setattr(self, field, totals[field])
+
+        self.actual_hours = totals["actual_minutes"] // 60
+        self.overtime_hours = totals["overtime_minutes"] // 60
+        self.undertime = totals["undertime_minutes"] // 60
+        self.specialholiday = totals["specialholiday_minutes"] // 60
+        self.regularholiday = totals["regularholiday_minutes"] // 60
+
+    class Meta:
+        constraints = [
+            # One summary per user and biweekly start; the aggregation engine updates it in place
+            models.UniqueConstraint(fields=["user_id", "date"], name="unique_attendancesummary_user_id_date"),
+        ]
+
     def __str__(self):
-        return f"{self.id} - {self.user_id}"
\ No newline at end of file
+        return f"{self.id} - {self.user_id}"
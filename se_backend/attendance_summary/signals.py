@@ -1,5 +1,5 @@
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from django.utils.timezone import now
 from .models import AttendanceSummary
@@ -13,99 +13,198 @@ logger = logging.getLogger(__name__)
 def update_overtime_hours(attendance_summary):
     """
     Function to create or update an OvertimeHours instance for each new biweekly period.
+    The summary was just saved, so its in-memory values are what is stored; an OvertimeHours row
+    whose values are unchanged is not written (see shared.models.DirtyFieldsMixin).
     """
-    attendance_summary.refresh_from_db()
-
-    user = attendance_summary.user_id
-    overtime_hours = attendance_summary.overtime_hours
-    late = attendance_summary.late_minutes
-    undertime = attendance_summary.undertime
-    regularholiday_hours = attendance_summary.regularholiday
-    specialholiday_hours = attendance_summary.specialholiday
+    user_id = attendance_summary.user_id_id
     biweek_start = attendance_summary.date
-    actual_hours = attendance_summary.actual_hours
 
-    logger.info(f"Processing OvertimeHours for User {user.id} | AttendanceSummary ID {attendance_summary.id} | "
-                f"Biweek Start: {biweek_start} | Overtime Hours: {overtime_hours} | Late: {late} | Undertime: {undertime}")
+    logger.info(f"Processing OvertimeHours for User {user_id} | AttendanceSummary ID {attendance_summary.id} | "
+                f"Biweek Start: {biweek_start} | Overtime Hours: {attendance_summary.overtime_hours} | "
+                f"Late: {attendance_summary.late_minutes} | Undertime: {attendance_summary.undertime}")
 
     # Fetch Schedule for the same user
     schedule = Schedule.objects.filter(
-        user_id=user,
+        user_id=user_id,
         payroll_period_start__lte=biweek_start,
         payroll_period_end__gte=biweek_start
     ).order_by('-payroll_period_start').first()
 
     if schedule:
-        logger.info(f"Schedule found for User {user.id}: Schedule ID {schedule.id}")
+        logger.info(f"Schedule found for User {user_id}: Schedule ID {schedule.id}")
     else:
-        logger.warning(f"No Schedule found for User {user.id}. Skipping holiday calculations.")
+        logger.warning(f"No Schedule found for User {user_id}. Skipping holiday calculations.")
 
+    values = overtime_hours_values(attendance_summary, schedule)
 
-    # night differential hours
-    nightdiff_hours = len(schedule.nightdiff) * 8 if schedule and schedule.nightdiff else 0
-    restday_hours = schedule.restday if schedule and schedule.restday else 0
-
-
-    logger.info(f"Computed Overtime Details for User {user.id}:"
-                f"Actual Hours: {actual_hours},"
-                f"Regular Holiday Hours: {regularholiday_hours}, "
-                f"Special Holiday Hours: {specialholiday_hours}, "
-                f"Night Differential Hours: {nightdiff_hours}, "
-                f"Rest Day Hours: {restday_hours}")
+    logger.info(f"Computed Overtime Details for User {user_id}:"
+                f"Actual Hours: {attendance_summary.actual_hours},"
+                f"Regular Holiday Hours: {attendance_summary.regularholiday}, "
+                f"Special Holiday Hours: {attendance_summary.specialholiday}, "
+                f"Night Differential Hours: {values['nightdiff']}, "
+                f"Rest Day Hours: {values['restday']}")
 
     # Check if an OvertimeHours instance exists for the current biweekly period
     overtime, created = OvertimeHours.objects.get_or_create(
         attendancesummary=attendance_summary,
-        user=user,
+        user_id=user_id,
         biweek_start=biweek_start,
-        defaults={
-            "actualhours": actual_hours,
-            "regularot": overtime_hours,
-            "regularholiday": regularholiday_hours,
-            "specialholiday": specialholiday_hours,
-            "nightdiff": nightdiff_hours,
-            "restday": restday_hours,
-            "late": late,
-            "undertime": undertime
-        }
+        defaults=values
     )
 
     if created:
         logger.info(f"Created new OvertimeHours ID {overtime.id} for AttendanceSummary ID {attendance_summary.id} | Biweek Start: {biweek_start}")
-    else:
-        # If the record already exists, update it
-        overtime.actualhours = actual_hours
-        overtime.regularot = overtime_hours
-        overtime.regularholiday = regularholiday_hours
-        overtime.specialholiday = specialholiday_hours
-        overtime.nightdiff = nightdiff_hours
-        overtime.restday = restday_hours
-        overtime.late = late
-        overtime.undertime = undertime
-        overtime.save()
-        logger.info(f"Updated OvertimeHours ID {overtime.id} with new overtime values.")
+        return
+
+    # If the record already exists, write whichever values changed
+    for field, value in values.items():
+        setattr(overtime, field, value)
+    changed = overtime.get_dirty_fields()
+    if not changed:
+        logger.debug(f"OvertimeHours ID {overtime.id} unchanged.")
+        return
+
+    overtime.save()
+    logger.info(f"Updated OvertimeHours ID {overtime.id}: {', '.join(changed)}.")
+
+
+def overtime_hours_values(attendance_summary, schedule):
+    """OvertimeHours field values for a summary under the schedule covering its biweekly start (or None)."""
+    return {
+        "actualhours": attendance_summary.actual_hours,
+        "regularot": attendance_summary.overtime_hours,
+        "regularholiday": attendance_summary.regularholiday,
+        "specialholiday": attendance_summary.specialholiday,
+        # night differential hours
+        "nightdiff": len(schedule.nightdiff) * 8 if schedule and schedule.nightdiff else 0,
+        "restday": schedule.restday if schedule and schedule.restday else 0,
+        "late": attendance_summary.late_minutes,
+        "undertime": attendance_summary.undertime,
+    }
+
+
+def sync_overtime_hours_for_schedule(schedule):
+    """
+    Set-based update_overtime_hours for the summaries inside one schedule's payroll period:
+    one read each for summaries, overlapping schedules and OvertimeHours, then a bulk_create of the
+    missing rows and a bulk_update of the rows whose values changed. Returns (created, updated).
+    """
+    start, end = schedule.payroll_period_start, schedule.payroll_period_end
+    if start is None or end is None:
+        return 0, 0
+
+    summaries = list(AttendanceSummary.objects.filter(user_id=schedule.user_id_id, date__gte=start, date__lte=end))
+    if not summaries:
+        return 0, 0
+
+    dates = [summary.date for summary in summaries]
+    # Every schedule that could cover one of the summaries, latest period first as in update_overtime_hours
+    covering = list(Schedule.objects.filter(
+        user_id=schedule.user_id_id,
+        payroll_period_start__lte=max(dates),
+        payroll_period_end__gte=min(dates),
+    ).order_by('-payroll_period_start'))
+
+    existing = {}
+    for overtime in OvertimeHours.objects.filter(attendancesummary__in=summaries).order_by('id'):
+        existing.setdefault((overtime.attendancesummary_id, overtime.user_id, overtime.biweek_start), overtime)
+
+    to_create = []
+    to_update = []
+    changed_fields = set()
+    for summary in summaries:
+        summary_schedule = next(
+            (s for s in covering if s.payroll_period_start <= summary.date <= s.payroll_period_end), None
+        )
+        values = overtime_hours_values(summary, summary_schedule)
+
+        overtime = existing.get((summary.id, summary.user_id_id, summary.date))
+        if overtime is None:
+            to_create.append(OvertimeHours(
+                attendancesummary=summary, user_id=summary.user_id_id, biweek_start=summary.date, **values
+            ))
+            continue
+
+        changed = [field for field, value in values.items() if getattr(overtime, field) != value]
+        if changed:
+            for field in changed:
+                setattr(overtime, field, values[field])
+            changed_fields.update(changed)
+            to_update.append(overtime)
+
+    OvertimeHours.objects.bulk_create(to_create)
+    if to_update:
+        OvertimeHours.objects.bulk_update(to_update, sorted(changed_fields))
+    return len(to_create), len(to_update)
+
+# AttendanceSummary columns that OvertimeHours is derived from
+OVERTIME_SOURCE_FIELDS = {"actual_hours", "overtime_hours", "late_minutes", "undertime", "specialholiday", "regularholiday"}
+
 
 @receiver(post_save, sender=AttendanceSummary)
 def handle_attendance_summary_save(sender, instance, update_fields=None, **kwargs):
     """
     Signal triggered when AttendanceSummary is created or updated.
-    Only updates if overtime_hours is actually modified.
+    Saves only fire for changed rows and carry the changed columns in update_fields, so
+    OvertimeHours is only refreshed when a column it reads from actually moved.
     """
-    if update_fields is None or "overtime_hours" in update_fields:
+    if update_fields is None or OVERTIME_SOURCE_FIELDS & set(update_fields):
         update_overtime_hours(instance)
 
+# Schedule columns the AttendanceSummary totals are computed from (holidays and which period covers a date)
+SUMMARY_SOURCE_FIELDS = ("user_id", "regularholiday", "specialholiday", "payroll_period_start",
+                         "payroll_period_end", "bi_weekly_start")
+
+
+@receiver(pre_save, sender=Schedule)
+def remember_schedule_summary_sources(sender, instance, **kwargs):
+    """Keep the stored summary source columns so post_save can tell whether the totals went stale."""
+    instance._summary_sources = (
+        Schedule.objects.filter(pk=instance.pk).values(*SUMMARY_SOURCE_FIELDS).first() if instance.pk else None
+    )
+
+
+def stale_summary_periods(schedule):
+    """
+    (user_id, period_start) pairs whose summaries no longer match a full rebuild after `schedule` was saved:
+    the old and new periods when a holiday array, the period bounds or the owner changed, else none.
+    A new schedule has no shifts yet; adding them goes through recompute_on_schedule_shifts_change.
+    """
+    previous = getattr(schedule, "_summary_sources", None)
+    if previous is None:
+        return set()
+
+    # values() names the owner's id "user_id", which is the user_id_id attribute on the instance
+    current = {field: getattr(schedule, field) for field in SUMMARY_SOURCE_FIELDS if field != "user_id"}
+    current["user_id"] = schedule.user_id_id
+    if previous == current:
+        return set()
+
+    return {
+        (previous["user_id"], previous["payroll_period_start"]),
+        (current["user_id"], current["payroll_period_start"]),
+    }
+
+
 @receiver(post_save, sender=Schedule)
 def handle_schedule_update(sender, instance, **kwargs):
     """
     Signal triggered when a Schedule is updated.
-    It creates or updates OvertimeHours entries for the new biweekly period without modifying past ones.
+    Summaries are kept up to date with deltas, so a change to the holidays or the period bounds
+    rebuilds the affected periods; the OvertimeHours of the summaries inside the schedule's payroll
+    period are then refreshed set-based, so the cost of an edit does not grow with the employee's history.
+    With the recompute queue enabled, the schedule's payroll period is queued instead.
     """
-    logger.info(f"Schedule updated for User {instance.user_id.id}: Processing OvertimeHours for the new biweekly period...")
+    from attendance.recompute import queue_enabled, request_recompute
 
-    # Get all attendance summaries for the user
-    attendance_summaries = AttendanceSummary.objects.filter(user_id=instance.user_id)
+    stale = stale_summary_periods(instance)
 
-    for attendance_summary in attendance_summaries:
-        update_overtime_hours(attendance_summary)
+    if queue_enabled():
+        request_recompute({(instance.user_id_id, instance.payroll_period_start)} | stale)
+        return
 
-    logger.info(f"OvertimeHours updated for the new biweekly period for User {instance.user_id.id}")
+    request_recompute(stale)
+    created, updated = sync_overtime_hours_for_schedule(instance)
+    logger.info(f"Schedule {instance.id} saved for User {instance.user_id_id}: OvertimeHours created {created}, "
+                f"updated {updated} for {instance.payroll_period_start} - {instance.payroll_period_end}"
+                f"{f', rebuilt {len(stale)} periods' if stale else ''}")
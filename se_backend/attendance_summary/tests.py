@@ -1,9 +1,14 @@
+from django.db import connection
 from django.test import TestCase
-from datetime import date, time
+from django.test.utils import CaptureQueriesContext
+from datetime import date, time, timedelta
 
 from users.models import CustomUser
 from attendance.models import Attendance
 from attendance_summary.models import AttendanceSummary
+from overtimehours.models import OvertimeHours
+from schedule.models import Schedule
+from totalovertime.models import TotalOvertime
 
 
 class AttendanceSummaryModelTestCase(TestCase):
@@ -53,3 +58,110 @@ class AttendanceSummaryModelTestCase(TestCase):
     def test_delete_attendance_summary(self):
         self.summary.delete()
         self.assertEqual(AttendanceSummary.objects.count(), 0)
+
+
+class ScheduleOvertimeFanOutTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            email="fanout@example.com",
+            password="securepassword",
+            role="employee"
+        )
+        self.attendance = Attendance.objects.create(
+            user=self.user,
+            date=date(2025, 4, 2),
+            status="Present",
+            check_in_time=time(9, 0),
+            check_out_time=time(9, 0)
+        )
+        self.schedule = Schedule.objects.create(
+            user_id=self.user,
+            payroll_period_start=date(2025, 4, 1),
+            payroll_period_end=date(2025, 4, 15),
+            bi_weekly_start=date(2025, 4, 1),
+            hours=0
+        )
+        self.current = self._summary(date(2025, 4, 1))
+
+    def _summary(self, start):
+        return AttendanceSummary.objects.create(
+            user_id=self.user,
+            attendance_id=self.attendance,
+            date=start,
+            actual_hours=8,
+            overtime_hours=1,
+            late_minutes=0,
+            undertime=0,
+            specialholiday=0,
+            regularholiday=0
+        )
+
+    def _save_schedule(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.schedule.save()
+        return len(queries.captured_queries)
+
+    def test_only_the_schedule_period_is_updated(self):
+        past = self._summary(date(2024, 1, 1))
+        OvertimeHours.objects.filter(attendancesummary=past).update(nightdiff=99)
+
+        self.schedule.nightdiff = [date(2025, 4, 3), date(2025, 4, 4)]
+        self.schedule.save()
+
+        self.assertEqual(OvertimeHours.objects.get(attendancesummary=self.current).nightdiff, 16)
+        self.assertEqual(OvertimeHours.objects.get(attendancesummary=past).nightdiff, 99)
+
+    def test_query_count_does_not_grow_with_tenure(self):
+        baseline = self._save_schedule()
+        for period in range(24):
+            self._summary(date(2024, 1, 1) + timedelta(days=15 * period))
+
+        self.assertEqual(self._save_schedule(), baseline)
+
+
+class DirtyFieldTrackingTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="dirty@example.com", password="securepassword", role="employee")
+        attendance = Attendance.objects.create(
+            user=self.user, date=date(2025, 4, 2), status="Present", check_in_time=time(9, 0), check_out_time=time(18, 0)
+        )
+        AttendanceSummary.objects.filter(user_id=self.user).delete()
+        AttendanceSummary.objects.create(
+            user_id=self.user, attendance_id=attendance, date=date(2025, 4, 1),
+            actual_hours=8, overtime_hours=1, late_minutes=15, undertime=0, specialholiday=0, regularholiday=0
+        )
+        self.summary = AttendanceSummary.objects.get(user_id=self.user)
+
+    def test_unchanged_save_is_a_no_op(self):
+        self.summary.late_minutes = 15
+        with self.assertNumQueries(0):
+            self.summary.save()
+
+        total = TotalOvertime.objects.create(user=self.user, total_regularot=2)
+        total = TotalOvertime.objects.get(id=total.id)
+        with self.assertNumQueries(0):
+            total.save()
+
+    def test_only_changed_columns_are_written(self):
+        self.summary.late_minutes = 30
+        self.assertEqual(self.summary.get_dirty_fields(), ["late_minutes"])
+
+        with CaptureQueriesContext(connection) as context:
+            self.summary.save()
+        update = next(query["sql"] for query in context.captured_queries
+                      if query["sql"].startswith('UPDATE "attendance_summary'))
+        self.assertIn('"late_minutes"', update)
+        self.assertNotIn('"actual_hours"', update)
+        self.assertFalse(self.summary.is_dirty())
+
+        # The change reached OvertimeHours; saving the same summary again cascades nothing
+        self.assertEqual(OvertimeHours.objects.get(attendancesummary=self.summary).late, 30)
+        with self.assertNumQueries(0):
+            self.summary.save()
+
+    def test_refresh_resyncs_stored_values(self):
+        AttendanceSummary.objects.filter(id=self.summary.id).update(late_minutes=45)
+        self.summary.refresh_from_db()
+        self.summary.late_minutes = 15
+        self.summary.save()
+        self.assertEqual(AttendanceSummary.objects.get(id=self.summary.id).late_minutes, 15)
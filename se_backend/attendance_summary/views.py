@@ -1,13 +1,15 @@
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status, viewsets
 from rest_framework.response import Response
+from shared.scoping import OwnerScopedQuerysetMixin
 from shared.utils import role_required
 from .models import AttendanceSummary
 from .serializers import AttendanceSummarySerializer
 
-class AttendanceSummaryViewSet(viewsets.ModelViewSet):
+class AttendanceSummaryViewSet(OwnerScopedQuerysetMixin, viewsets.ModelViewSet):
     protected_views = ["create", "update", "partial_update", "retrieve", "destroy", "list"]
     queryset = AttendanceSummary.objects.all()
+    owner_field = "user_id"  # Employees only see their own rows
     serializer_class = AttendanceSummarySerializer
     permission_classes = [IsAuthenticated]  # Default permission for authenticated users
 
@@ -1,9 +1,11 @@
 from django.contrib import admin
 
-from benefits.models import SSS, Philhealth, Pagibig
+from benefits.models import SSS, Philhealth, Pagibig, ContributionRate
 
 admin.site.register(SSS)
 
 admin.site.register(Philhealth)
 
-admin.site.register(Pagibig)
\ No newline at end of file
+admin.site.register(Pagibig)
+
+admin.site.register(ContributionRate)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BenefitsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'benefits'
+
+    def ready(self):
+        import benefits.signals
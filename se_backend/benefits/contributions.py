@@ -0,0 +1,139 @@
+import logging
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+
+from shared.computations.pagibig_computations import compute_pagibig_contributions
+from shared.computations.philhealth_computations import compute_philhealth_contributions
+from shared.computations.sss_computations import compute_sss_contributions
+from .models import SSS, Philhealth, Pagibig
+from .rates import pagibig_contribution, philhealth_rate, sss_table
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+
+# Stored precision of every contribution column
+CENT = Decimal("0.01")
+
+# Model field -> key of the computed contribution
+SSS_FIELDS = {
+    "basic_salary": "Basic Salary",
+    "msc": "MSC",
+    "employee_share": "Employee Share",
+    "employer_share": "Employer Share",
+    "ec_contribution": "EC Contribution",
+    "employer_mpf_contribution": "Employer MPF Contribution",
+    "employee_mpf_contribution": "Employee MPF Contribution",
+    "total_employer": "Total Employer Contribution",
+    "total_employee": "Total Employee Contribution",
+    "total_contribution": "Total Contribution",
+}
+PHILHEALTH_FIELDS = {
+    "basic_salary": "Basic Salary",
+    "total_contribution": "Total Contribution",
+}
+PAGIBIG_FIELDS = {
+    "basic_salary": "Basic Salary",
+    "employee_share": "Employee Share",
+    "employer_share": "Employer Share",
+    "total_contribution": "Total Contribution",
+}
+
+_local = threading.local()
+
+
+def compute_contributions(salaries, as_of=None):
+    """
+    {kind: {user_id: contribution}} for {user_id: basic_rate}, computed together with the schedules
+    in force on `as_of` (today by default).
+    """
+    user_ids = list(salaries)
+    basic_rates = [Decimal(salaries[user_id]) for user_id in user_ids]
+
+    sss = compute_sss_contributions(basic_rates, sss_table(as_of))
+    philhealth = compute_philhealth_contributions(basic_rates, philhealth_rate(as_of))
+    pagibig = [
+        {"Basic Salary": basic_rate, **data}
+        for basic_rate, data in zip(basic_rates, compute_pagibig_contributions(len(user_ids), pagibig_contribution(as_of)))
+    ]
+    return {
+        "sss": dict(zip(user_ids, sss)),
+        "philhealth": dict(zip(user_ids, philhealth)),
+        "pagibig": dict(zip(user_ids, pagibig)),
+    }
+
+
+def write_contributions(model, fields, contributions):
+    """
+    Store {user_id: computed contribution} set-wise. Existing rows are only written when a stored
+    value differs, all in one bulk_update; users without a row get one through bulk_create.
+    Returns (updated, created).
+    """
+    rows = list(model.objects.filter(user_id__in=contributions))
+    changed = []
+    for row in rows:
+        values = {field: Decimal(contributions[row.user_id][key]).quantize(CENT) for field, key in fields.items()}
+        if any(getattr(row, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(row, field, value)
+            changed.append(row)
+
+    priced = {row.user_id for row in rows}
+    missing = [
+        model(user_id=user_id, **{field: Decimal(data[key]).quantize(CENT) for field, key in fields.items()})
+        for user_id, data in contributions.items() if user_id not in priced
+    ]
+
+    if changed:
+        model.objects.bulk_update(changed, list(fields), batch_size=BULK_BATCH_SIZE)
+    if missing:
+        model.objects.bulk_create(missing, batch_size=BULK_BATCH_SIZE)
+    return len(changed), len(missing)
+
+
+def write_benefit_contributions(salaries, as_of=None):
+    """
+    Bring the SSS, PhilHealth and Pag-IBIG rows of every user in {user_id: basic_rate} up to date.
+    Used by the Earnings signal and by bulk Earnings writes, which fire no signals.
+    Returns {kind: (updated, created)}.
+    """
+    if not salaries:
+        return {}
+
+    contributions = compute_contributions(salaries, as_of)
+    with transaction.atomic():
+        results = {
+            "sss": write_contributions(SSS, SSS_FIELDS, contributions["sss"]),
+            "philhealth": write_contributions(Philhealth, PHILHEALTH_FIELDS, contributions["philhealth"]),
+            "pagibig": write_contributions(Pagibig, PAGIBIG_FIELDS, contributions["pagibig"]),
+        }
+
+    logger.debug(f"[write_benefit_contributions] {len(salaries)} users — {results}")
+    return results
+
+
+def pending_benefits():
+    """{user_id: basic_rate} collected by the active benefits_batch() block of this thread, or None."""
+    return getattr(_local, "pending", None)
+
+
+@contextmanager
+def benefits_batch():
+    """
+    Collect the Earnings saves made inside the block on this thread and write their benefits once
+    on exit, with the last basic rate saved per user. Nested blocks join the outer one.
+    """
+    if pending_benefits() is not None:
+        yield _local.pending
+        return
+
+    _local.pending = {}
+    try:
+        yield _local.pending
+        salaries = _local.pending
+    finally:
+        _local.pending = None
+    write_benefit_contributions(salaries)
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benefits', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContributionRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('sss', 'SSS'), ('philhealth', 'PhilHealth'), ('pagibig', 'Pag-IBIG')], max_length=10)),
+                ('effective_date', models.DateField()),
+                ('brackets', models.JSONField(blank=True, default=list)),
+                ('minimum_salary_credit', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('rate', models.DecimalField(blank=True, decimal_places=4, max_digits=6, null=True)),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('date_modified', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['kind', 'effective_date'],
+                'unique_together': {('kind', 'effective_date')},
+            },
+        ),
+    ]
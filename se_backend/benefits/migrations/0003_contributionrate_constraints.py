@@ -0,0 +1,25 @@
+# Generated by Django 4.2.5 on 2026-10-18 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('benefits', '0002_contributionrate'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='contributionrate',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('kind', 'sss'), _negated=True), models.Q(('brackets', []), _negated=True), _connector='OR'), name='contributionrate_sss_brackets'),
+        ),
+        migrations.AddConstraint(
+            model_name='contributionrate',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('kind', 'philhealth'), _negated=True), ('rate__isnull', False), _connector='OR'), name='contributionrate_philhealth_rate'),
+        ),
+        migrations.AddConstraint(
+            model_name='contributionrate',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('kind', 'pagibig'), _negated=True), ('amount__isnull', False), _connector='OR'), name='contributionrate_pagibig_amount'),
+        ),
+    ]
@@ -1,4 +1,10 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
+
+from shared.computations.sss_computations import SSS_TABLE
 from users.models import CustomUser
 
 class SSS(models.Model):
@@ -39,3 +45,53 @@ class Pagibig(models.Model):
         return f"user: {self.user.email} ({self.total_contribution})"
 
 
+class ContributionRate(models.Model):
+    """
+    One version of a contribution schedule, in force from `effective_date` until the next version
+    of the same kind. SSS versions carry `brackets` (rows shaped like sss_computations.SSS_TABLE),
+    PhilHealth versions a premium `rate` and Pag-IBIG versions the fixed total `amount`.
+    """
+    KINDS = [
+        ('sss', 'SSS'),
+        ('philhealth', 'PhilHealth'),
+        ('pagibig', 'Pag-IBIG'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KINDS)
+    effective_date = models.DateField()
+    brackets = models.JSONField(default=list, blank=True)
+    minimum_salary_credit = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    rate = models.DecimalField(max_digits=6, decimal_places=4, null=True, blank=True)
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} effective {self.effective_date}"
+
+    def clean(self):
+        """A version must carry what its kind is computed from, or every contribution computed with it fails."""
+        if self.kind == "sss":
+            width = len(SSS_TABLE[0])
+            if not isinstance(self.brackets, list) or not self.brackets:
+                raise ValidationError({"brackets": "An SSS version needs at least one bracket."})
+            for row in self.brackets:
+                if not isinstance(row, (list, tuple)) or len(row) != width:
+                    raise ValidationError({"brackets": f"Each SSS bracket needs {width} amounts, like SSS_TABLE."})
+                try:
+                    [Decimal(str(value)) for value in row]
+                except (InvalidOperation, TypeError, ValueError):
+                    raise ValidationError({"brackets": f"Bracket {row} holds a value that is not a number."})
+        elif self.kind == "philhealth" and self.rate is None:
+            raise ValidationError({"rate": "A PhilHealth version needs a premium rate."})
+        elif self.kind == "pagibig" and self.amount is None:
+            raise ValidationError({"amount": "A Pag-IBIG version needs a total contribution amount."})
+
+    class Meta:
+        ordering = ['kind', 'effective_date']
+        unique_together = ['kind', 'effective_date']
+        constraints = [
+            models.CheckConstraint(check=~Q(kind="sss") | ~Q(brackets=[]), name="contributionrate_sss_brackets"),
+            models.CheckConstraint(check=~Q(kind="philhealth") | Q(rate__isnull=False), name="contributionrate_philhealth_rate"),
+            models.CheckConstraint(check=~Q(kind="pagibig") | Q(amount__isnull=False), name="contributionrate_pagibig_amount"),
+        ]
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from bisect import bisect_right
+from datetime import date
+from decimal import InvalidOperation
+
+from django.conf import settings
+
+from shared.computations.pagibig_computations import (
+    PAGIBIG_CONTRIBUTION, PAGIBIG_EFFECTIVE, build_pagibig_contribution,
+)
+from shared.computations.philhealth_computations import PHILHEALTH_RATE, PHILHEALTH_RATE_EFFECTIVE
+from shared.computations.sss_computations import (
+    DEFAULT_SSS_TABLE, MINIMUM_SALARY_CREDIT, SSS_TABLE_EFFECTIVE, build_sss_table,
+)
+from .models import ContributionRate
+
+logger = logging.getLogger(__name__)
+
+# The schedules shipped in shared.computations, used until a ContributionRate row supersedes them.
+# A row with the same kind and effective date replaces the built-in version.
+BUILTIN_VERSIONS = {
+    "sss": {SSS_TABLE_EFFECTIVE: DEFAULT_SSS_TABLE},
+    "philhealth": {PHILHEALTH_RATE_EFFECTIVE: PHILHEALTH_RATE},
+    "pagibig": {PAGIBIG_EFFECTIVE: PAGIBIG_CONTRIBUTION},
+}
+
+_lock = threading.Lock()
+_cache = {"versions": None, "loaded_at": 0.0}
+
+
+def compile_rate(rate):
+    """
+    The computation-ready form of a ContributionRate row, as the compute_* functions take it.
+    Raises ValueError for a row its kind cannot be computed from.
+    """
+    if rate.kind == "sss":
+        if not rate.brackets:
+            raise ValueError("SSS version without brackets")
+        minimum = rate.minimum_salary_credit if rate.minimum_salary_credit is not None else MINIMUM_SALARY_CREDIT
+        rows = sorted(tuple(row) for row in rate.brackets)
+        return build_sss_table(rows, minimum_salary_credit=minimum)
+    if rate.kind == "philhealth":
+        if rate.rate is None:
+            raise ValueError("PhilHealth version without a rate")
+        return rate.rate
+    if rate.amount is None:
+        raise ValueError("Pag-IBIG version without an amount")
+    return build_pagibig_contribution(rate.amount)
+
+
+def load_versions():
+    """
+    {kind: (sorted effective dates, compiled schedules)} from the built-ins and every stored row.
+    A row that cannot be compiled is left out, so the version before it (at the latest the built-in) stays in force.
+    """
+    versions = {kind: dict(builtin) for kind, builtin in BUILTIN_VERSIONS.items()}
+    for rate in ContributionRate.objects.all():
+        try:
+            versions[rate.kind][rate.effective_date] = compile_rate(rate)
+        except (IndexError, InvalidOperation, TypeError, ValueError) as error:
+            logger.error(f"[load_versions] Ignoring ContributionRate {rate.id} ({rate}): {error}")
+
+    return {
+        kind: (tuple(sorted(by_date)), tuple(by_date[day] for day in sorted(by_date)))
+        for kind, by_date in versions.items()
+    }
+
+
+def _versions():
+    # Other processes only see a change once their copy expires; 0 keeps it until invalidated
+    ttl = settings.CONTRIBUTION_RATES_CACHE_SECONDS
+    with _lock:
+        stale = ttl and time.monotonic() - _cache["loaded_at"] > ttl
+        if _cache["versions"] is None or stale:
+            _cache["versions"] = load_versions()
+            _cache["loaded_at"] = time.monotonic()
+        return _cache["versions"]
+
+
+def invalidate_rate_cache():
+    """Drop the cached schedules; the next lookup reloads them."""
+    with _lock:
+        _cache["versions"] = None
+
+
+def rate_as_of(kind, as_of=None):
+    """The `kind` schedule in force on `as_of` (today by default); dates before the first version use it."""
+    dates, schedules = _versions()[kind]
+    index = bisect_right(dates, as_of or date.today()) - 1
+    return schedules[max(index, 0)]
+
+
+def sss_table(as_of=None):
+    return rate_as_of("sss", as_of)
+
+
+def philhealth_rate(as_of=None):
+    return rate_as_of("philhealth", as_of)
+
+
+def pagibig_contribution(as_of=None):
+    return rate_as_of("pagibig", as_of)
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ContributionRate
+
+
+@receiver(post_save, sender=ContributionRate)
+@receiver(post_delete, sender=ContributionRate)
+def invalidate_contribution_rates(sender, instance, **kwargs):
+    """Drop this process's cached rate schedules when a version is added, edited or removed."""
+    from .rates import invalidate_rate_cache
+
+    invalidate_rate_cache()
@@ -0,0 +1,34 @@
+import logging
+from datetime import date
+
+from celery import shared_task
+
+from earnings.models import Earnings
+from .contributions import write_benefit_contributions
+
+logger = logging.getLogger(__name__)
+
+
+def current_basic_rates():
+    """{user_id: basic_rate of the user's newest Earnings row that has one}, in one DISTINCT ON query."""
+    return dict(
+        Earnings.objects.filter(user__isnull=False, basic_rate__isnull=False)
+        .order_by("user_id", "-id").distinct("user_id")
+        .values_list("user_id", "basic_rate")
+    )
+
+
+@shared_task
+def reprice_contributions(as_of=None):
+    """
+    Recompute every employee's SSS, PhilHealth and Pag-IBIG rows from their current basic rate,
+    using the contribution schedules in force on `as_of` (an ISO date; today by default).
+    Rows whose values do not change are not written.
+    """
+    as_of = date.fromisoformat(as_of) if isinstance(as_of, str) else (as_of or date.today())
+    salaries = current_basic_rates()
+    results = write_benefit_contributions(salaries, as_of)
+
+    summary = ", ".join(f"{kind}: {updated} updated, {created} created" for kind, (updated, created) in results.items())
+    logger.info(f"[reprice_contributions] As of {as_of} for {len(salaries)} employees — {summary}")
+    return f"Repriced {len(salaries)} employees as of {as_of} ({summary})"
@@ -1,7 +1,16 @@
+from datetime import date
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from users.models import CustomUser
-from benefits.models import SSS, Philhealth, Pagibig
+from benefits.models import SSS, Philhealth, Pagibig, ContributionRate
+from benefits.rates import invalidate_rate_cache, pagibig_contribution, philhealth_rate, sss_table
+from benefits.tasks import reprice_contributions
 from decimal import Decimal
+from earnings.models import Earnings
+from shared.computations.pagibig_computations import compute_pagibig_contribution, compute_pagibig_contributions
+from shared.computations.philhealth_computations import compute_philhealth_contributions
+from shared.computations.sss_computations import DEFAULT_SSS_TABLE, SSS_TABLE, compute_sss_contribution, compute_sss_contributions
 
 
 class DeductionsModelTestCase(TestCase):
@@ -84,3 +93,99 @@ class DeductionsModelTestCase(TestCase):
         pagibig = Pagibig.objects.create(user=self.user)
         pagibig.delete()
         self.assertEqual(Pagibig.objects.count(), 0)
+
+
+class ContributionTablesTestCase(TestCase):
+    def test_sss_brackets(self):
+        # Below the minimum credit, exactly on a floor, just under the next floor, and past the last bracket
+        self.assertEqual(compute_sss_contribution(3000)["MSC"], Decimal("2500"))
+        self.assertEqual(compute_sss_contribution(5250)["MSC"], Decimal("2750"))
+        self.assertEqual(compute_sss_contribution(Decimal("5749.99"))["MSC"], Decimal("2750"))
+        top = compute_sss_contribution(90000)
+        self.assertEqual(top["MSC"], Decimal(SSS_TABLE[-1][1]) / 2)
+        self.assertEqual(top["Total Contribution"], Decimal("2640"))
+        self.assertEqual(top["Basic Salary"], Decimal(90000))
+
+    def test_batch_matches_single(self):
+        salaries = [Decimal("4000"), Decimal("20250"), Decimal("33000.50")]
+        self.assertEqual(compute_sss_contributions(salaries), [compute_sss_contribution(s) for s in salaries])
+        self.assertEqual([row["Total Contribution"] for row in compute_philhealth_contributions(salaries)],
+                         [s * Decimal(.05) / 2 for s in salaries])
+        self.assertEqual(compute_pagibig_contributions(2), [compute_pagibig_contribution()] * 2)
+
+
+class ContributionRateTestCase(TestCase):
+    def setUp(self):
+        invalidate_rate_cache()
+        # Rolled-back rows fire no post_delete, so the next test must not see them cached
+        self.addCleanup(invalidate_rate_cache)
+
+        self.user = CustomUser.objects.create_user(email="rates@test.com", password="securepassword", role="employee")
+        Earnings.objects.create(user=self.user, basic_rate=Decimal("20000.00"))
+
+    def add_2026_rates(self):
+        ContributionRate.objects.create(kind="philhealth", effective_date=date(2026, 1, 1), rate=Decimal("0.06"))
+        ContributionRate.objects.create(kind="pagibig", effective_date=date(2026, 1, 1), amount=Decimal("400"))
+        ContributionRate.objects.create(
+            kind="sss", effective_date=date(2026, 1, 1), minimum_salary_credit=Decimal("6000"),
+            brackets=[[15000, 15000, 1500, 750, 30, 0, 0], [6000, 6000, 600, 300, 10, 0, 0]],
+        )
+
+    def test_versions_selected_by_effective_date(self):
+        self.assertEqual(philhealth_rate(date(2026, 6, 1)), Decimal(.05))
+        self.add_2026_rates()
+
+        # Saving invalidated the cache: the new versions apply from their effective date only
+        self.assertEqual(philhealth_rate(date(2025, 12, 31)), Decimal(.05))
+        self.assertEqual(philhealth_rate(date(2026, 6, 1)), Decimal("0.06"))
+        self.assertEqual(pagibig_contribution(date(2026, 1, 1))["Employee Share"], Decimal("200"))
+        self.assertEqual(compute_sss_contribution(5000, sss_table(date(2026, 1, 1)))["MSC"], Decimal("3000"))
+        self.assertEqual(compute_sss_contribution(16000, sss_table(date(2026, 1, 1)))["MSC"], Decimal("7500"))
+        # Dates before the first version fall back to it
+        self.assertEqual(philhealth_rate(date(2020, 1, 1)), Decimal(.05))
+
+        ContributionRate.objects.get(kind="philhealth").delete()
+        self.assertEqual(philhealth_rate(date(2026, 6, 1)), Decimal(.05))
+
+    def test_incomplete_versions_are_rejected(self):
+        incomplete = [
+            ContributionRate(kind="sss", effective_date=date(2026, 1, 1), brackets=[]),
+            ContributionRate(kind="philhealth", effective_date=date(2026, 1, 1)),
+            ContributionRate(kind="pagibig", effective_date=date(2026, 1, 1)),
+        ]
+        for rate in incomplete:
+            with self.subTest(kind=rate.kind):
+                with self.assertRaises(ValidationError):
+                    rate.full_clean()
+                with self.assertRaises(IntegrityError), transaction.atomic():
+                    rate.save()
+
+        with self.assertRaises(ValidationError):
+            ContributionRate(kind="sss", effective_date=date(2026, 1, 1), brackets=[[15000, 15000]]).full_clean()
+
+    def test_uncompilable_version_falls_back(self):
+        # Bypasses validation like a hand-edited row would
+        ContributionRate.objects.create(kind="sss", effective_date=date(2026, 1, 1), brackets=[["x"] * 7])
+
+        self.assertEqual(sss_table(date(2026, 6, 1)), DEFAULT_SSS_TABLE)
+
+    def test_reprice_contributions(self):
+        self.add_2026_rates()
+        other = CustomUser.objects.create_user(email="rates2@test.com", password="securepassword", role="employee")
+        Earnings.objects.create(user=other, basic_rate=Decimal("10000.00"))
+        Philhealth.objects.filter(user=other).delete()
+
+        with self.assertNumQueries(10):
+            result = reprice_contributions("2026-02-01")
+        self.assertIn("Repriced 2 employees", result)
+
+        self.assertEqual(SSS.objects.get(user=self.user).total_contribution, Decimal("1140.00"))
+        self.assertEqual(Philhealth.objects.get(user=self.user).total_contribution, Decimal("600.00"))
+        self.assertEqual(Philhealth.objects.get(user=other).total_contribution, Decimal("300.00"))
+        pagibig = Pagibig.objects.get(user=other)
+        self.assertEqual((pagibig.basic_salary, pagibig.total_contribution), (Decimal("10000.00"), Decimal("400.00")))
+
+        # Repricing as of an earlier date restores the built-in schedules
+        reprice_contributions("2025-06-01")
+        self.assertEqual(Pagibig.objects.get(user=self.user).total_contribution, Decimal("200.00"))
+        self.assertEqual(Philhealth.objects.get(user=self.user).total_contribution, Decimal("500.00"))
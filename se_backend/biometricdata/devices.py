@@ -0,0 +1,53 @@
+import random
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+# Same attributes the ingestion pipeline reads from pyzk's zk.attendance.Attendance
+DeviceLog = namedtuple("DeviceLog", ["uid", "user_id", "timestamp", "status", "punch"])
+
+
+class FakeZKDevice:
+    """
+    Stand-in for a pyzk ZK connection, for tests and ingestion benchmarks.
+    Generates `log_count` punches spread over `employee_numbers`: one check-in around 9:00 and one
+    check-out around 18:00 per employee per day, walking forward from `start_date`.
+    """
+
+    def __init__(self, log_count, employee_numbers, start_date=None, seed=0):
+        self.log_count = log_count
+        self.employee_numbers = list(employee_numbers)
+        self.start_date = start_date or datetime(2025, 4, 1).date()
+        self.seed = seed
+
+    def connect(self):
+        return self
+
+    def disable_device(self):
+        return True
+
+    def enable_device(self):
+        return True
+
+    def disconnect(self):
+        return True
+
+    def get_attendance(self):
+        return list(self.iter_attendance())
+
+    def iter_attendance(self):
+        rng = random.Random(self.seed)
+        produced = 0
+        day = 0
+
+        while produced < self.log_count:
+            current = self.start_date + timedelta(days=day)
+            for emp_id in self.employee_numbers:
+                check_in = datetime.combine(current, time(8, 30)) + timedelta(minutes=rng.randint(0, 60))
+                check_out = datetime.combine(current, time(17, 30)) + timedelta(minutes=rng.randint(0, 120))
+
+                for status, stamp in ((0, check_in), (1, check_out)):
+                    if produced >= self.log_count:
+                        return
+                    yield DeviceLog(uid=produced + 1, user_id=str(emp_id), timestamp=stamp, status=status, punch=status)
+                    produced += 1
+            day += 1
@@ -0,0 +1,294 @@
+import csv
+import json
+import logging
+from itertools import islice
+from time import perf_counter
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.timezone import localtime
+from rest_framework import serializers
+
+from admins.models import Admin
+from attendance.aggregation import rebuild_summaries_for_dates
+from attendance.models import Attendance
+from employees.models import Employee
+from .models import BiometricData
+from .serializers import BiometricDataImportSerializer
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+IMPORT_CHUNK_SIZE = 2000
+
+
+def _aware(timestamp):
+    if timezone.is_naive(timestamp):
+        return timezone.make_aware(timestamp)
+    return timestamp
+
+
+def resolve_users(emp_ids):
+    """
+    Map employee numbers to user ids in two queries.
+    Employee accounts win over Admin accounts, like the per-row update_attendance signal.
+    """
+    users = dict(
+        Admin.objects.filter(employment_info__employee_number__in=emp_ids)
+        .values_list("employment_info__employee_number", "user_id")
+    )
+    users.update(
+        Employee.objects.filter(employment_info__employee_number__in=emp_ids)
+        .values_list("employment_info__employee_number", "user_id")
+    )
+    return users
+
+
+def existing_keys(entries):
+    """(emp_id, time) keys of the batch that are already stored, fetched with one query."""
+    if not entries:
+        return set()
+
+    times = [entry.time for entry in entries]
+    return set(
+        BiometricData.objects.filter(
+            emp_id__in={entry.emp_id for entry in entries},
+            time__gte=min(times),
+            time__lte=max(times),
+        ).values_list("emp_id", "time")
+    )
+
+
+# Columns written by insert_new_entries; the id comes from the table's sequence
+ENTRY_COLUMNS = ("emp_id", "name", "time", "work_code", "work_state", "terminal_name")
+
+
+def insert_new_entries(entries):
+    """
+    Insert unsaved BiometricData rows with INSERT ... ON CONFLICT (emp_id, time) DO NOTHING and
+    return the (emp_id, time) keys of the rows actually inserted, BULK_BATCH_SIZE rows per statement.
+    Costs O(batch) whatever the size of the table, unlike probing for the stored keys first.
+    """
+    table = connection.ops.quote_name(BiometricData._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(column) for column in ENTRY_COLUMNS)
+    inserted = set()
+
+    with connection.cursor() as cursor:
+        for offset in range(0, len(entries), BULK_BATCH_SIZE):
+            rows = [
+                # isoformat keeps the microseconds DjangoJSONEncoder would drop
+                dict({column: getattr(entry, column) for column in ENTRY_COLUMNS}, time=entry.time.isoformat())
+                for entry in entries[offset:offset + BULK_BATCH_SIZE]
+            ]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM json_populate_recordset(NULL::{table}, %s) "
+                f"ON CONFLICT (emp_id, time) DO NOTHING RETURNING emp_id, time",
+                [json.dumps(rows)],
+            )
+            inserted.update(cursor.fetchall())
+    return inserted
+
+
+def fold_punches(entries, users):
+    """Reduce punches to {(user_id, date): [first punch time, last punch time]} in local time."""
+    folded = {}
+    for entry in entries:
+        user_id = users.get(entry.emp_id)
+        if user_id is None:
+            continue
+
+        stamp = localtime(entry.time)
+        key = (user_id, stamp.date())
+        punch = stamp.time()
+
+        if key not in folded:
+            folded[key] = [punch, punch]
+        else:
+            bounds = folded[key]
+            bounds[0] = min(bounds[0], punch)
+            bounds[1] = max(bounds[1], punch)
+    return folded
+
+
+def upsert_attendance(folded):
+    """
+    Bulk insert/update Attendance from folded punches: the stored check-in only moves earlier and
+    the check-out only moves later, so folding a punch twice is a no-op.
+    Returns the (created, updated) Attendance rows.
+    """
+    if not folded:
+        return [], []
+
+    dates = [attendance_date for _, attendance_date in folded]
+    current = {
+        (att.user_id, att.date): att
+        for att in Attendance.objects.filter(
+            user_id__in={user_id for user_id, _ in folded},
+            date__gte=min(dates),
+            date__lte=max(dates),
+        )
+    }
+
+    to_create = []
+    to_update = []
+    for (user_id, attendance_date), (check_in, check_out) in folded.items():
+        att = current.get((user_id, attendance_date))
+        if att is None:
+            to_create.append(Attendance(
+                user_id=user_id,
+                date=attendance_date,
+                check_in_time=check_in,
+                check_out_time=check_out,
+                status="Present",
+            ))
+            continue
+
+        if check_in < att.check_in_time or check_out > att.check_out_time:
+            att.check_in_time = min(att.check_in_time, check_in)
+            att.check_out_time = max(att.check_out_time, check_out)
+            to_update.append(att)
+
+    Attendance.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+    Attendance.objects.bulk_update(to_update, ["check_in_time", "check_out_time"], batch_size=BULK_BATCH_SIZE)
+    return to_create, to_update
+
+
+def build_entries(logs, terminal_name="ZKTeco Terminal"):
+    """Turn device logs into unsaved BiometricData rows."""
+    return [
+        BiometricData(
+            emp_id=int(log.user_id),
+            name=f"Employee {log.user_id}",
+            time=_aware(log.timestamp),
+            work_code="N/A",
+            work_state=str(log.status),
+            terminal_name=terminal_name,
+        )
+        for log in logs
+    ]
+
+
+def store_entries(entries, ignore_conflicts=False):
+    """
+    Store a batch of unsaved BiometricData rows and fold them into Attendance set-wise.
+    Per-row post_save signals are not fired. Returns (stats, {(user_id, date)}) for the Attendance
+    rows that actually changed, so callers can recompute summaries once.
+
+    Inserts always go through ON CONFLICT DO NOTHING on (emp_id, time), and only the punches
+    actually inserted are folded into Attendance, so a corrected or deleted Attendance row is not
+    rebuilt from punches that were already stored. By default the batch's stored keys are probed
+    first; with `ignore_conflicts=True` the probe is skipped and the inserted keys are read back
+    with RETURNING instead. Re-syncing a device's full buffer then costs O(batch) whatever the
+    size of the table.
+    """
+    # Repeats inside the batch collapse onto the first occurrence
+    unique = {}
+    for entry in entries:
+        unique.setdefault((entry.emp_id, entry.time), entry)
+
+    with transaction.atomic():
+        if ignore_conflicts:
+            inserted = insert_new_entries(list(unique.values()))
+            new_entries = [entry for key, entry in unique.items() if key in inserted]
+        else:
+            known = existing_keys(list(unique.values()))
+            new_entries = [entry for key, entry in unique.items() if key not in known]
+            BiometricData.objects.bulk_create(new_entries, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+
+        users = resolve_users({entry.emp_id for entry in new_entries})
+        created, updated = upsert_attendance(fold_punches(new_entries, users))
+
+    stats = {
+        "received": len(entries),
+        "duplicates": len(entries) - len(new_entries),
+        "created": len(new_entries),
+        "unmatched": len({entry.emp_id for entry in new_entries} - set(users)),
+        "attendance_created": len(created),
+        "attendance_updated": len(updated),
+    }
+    return stats, {(att.user_id, att.date) for att in created + updated}
+
+
+def ingest_entries(entries, ignore_conflicts=False):
+    """Store a batch and run a single summary rebuild per affected (user, payroll period)."""
+    started = perf_counter()
+
+    with transaction.atomic():
+        stats, touched = store_entries(entries, ignore_conflicts=ignore_conflicts)
+        periods = rebuild_summaries_for_dates(touched)
+
+    stats["periods_recomputed"] = len(periods)
+    stats["seconds"] = perf_counter() - started
+    logger.info(f"[ingest_entries] {stats}")
+    return stats
+
+
+def ingest_device_logs(logs, terminal_name="ZKTeco Terminal", ignore_conflicts=False):
+    """Ingest the logs returned by a ZK device's get_attendance()."""
+    return ingest_entries(build_entries(logs, terminal_name=terminal_name), ignore_conflicts=ignore_conflicts)
+
+
+def _decode(lines):
+    for line in lines:
+        yield line.decode("utf-8-sig") if isinstance(line, bytes) else line
+
+
+def iter_ndjson_rows(lines):
+    """Yield one dict per non-blank NDJSON line, reading the body lazily."""
+    for number, line in enumerate(_decode(lines), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise serializers.ValidationError({"line": number, "detail": "Invalid JSON."})
+
+
+def iter_csv_rows(lines):
+    """Yield one dict per CSV record; the first line is the header."""
+    yield from csv.DictReader(_decode(lines))
+
+
+def import_rows(rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Validate and store streamed BiometricData rows `chunk_size` at a time, then run one summary
+    rebuild per affected (user, payroll period) for the whole import.
+    Runs in a single transaction: an invalid row rejects the entire import.
+    """
+    started = perf_counter()
+    rows = iter(rows)
+    stats = {"received": 0, "duplicates": 0, "created": 0, "unmatched": 0,
+             "attendance_created": 0, "attendance_updated": 0}
+    touched = set()
+
+    with transaction.atomic():
+        offset = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+
+            serializer = BiometricDataImportSerializer(data=chunk, many=True)
+            if not serializer.is_valid():
+                raise serializers.ValidationError([
+                    {"row": offset + index + 1, "errors": errors}
+                    for index, errors in enumerate(serializer.errors) if errors
+                ])
+
+            chunk_stats, chunk_touched = store_entries(
+                [BiometricData(**data) for data in serializer.validated_data]
+            )
+            for key, value in chunk_stats.items():
+                stats[key] += value
+            touched |= chunk_touched
+            offset += len(chunk)
+
+        periods = rebuild_summaries_for_dates(touched)
+
+    seconds = perf_counter() - started
+    stats["periods_recomputed"] = len(periods)
+    stats["seconds"] = seconds
+    stats["rows_per_second"] = round(stats["received"] / seconds, 1) if seconds else stats["received"]
+    logger.info(f"[import_rows] {stats}")
+    return stats
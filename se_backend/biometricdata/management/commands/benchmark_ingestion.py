@@ -0,0 +1,59 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from employees.models import Employee
+from employment_info.models import EmploymentInfo
+from users.models import CustomUser
+from biometricdata.devices import FakeZKDevice
+from biometricdata.ingestion import ingest_device_logs
+
+
+class Command(BaseCommand):
+    help = "Benchmark batched biometric ingestion against a fake ZKTeco device. All writes are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--logs", type=int, default=100000)
+        parser.add_argument("--employees", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=2, help="Re-ingest the same buffer to measure dedup.")
+        parser.add_argument("--ignore-conflicts", action="store_true",
+                            help="Skip the duplicate probe and rely on ON CONFLICT DO NOTHING.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            employee_numbers = self._seed_employees(options["employees"])
+            device = FakeZKDevice(options["logs"], employee_numbers)
+            logs = device.get_attendance()
+
+            for run in range(1, options["repeat"] + 1):
+                started = time.perf_counter()
+                stats = ingest_device_logs(logs, ignore_conflicts=options["ignore_conflicts"])
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"run {run}: {len(logs)} logs in {elapsed:.2f}s ({len(logs) / elapsed:,.0f} logs/s) — "
+                    f"created {stats['created']}, duplicates {stats['duplicates']}, "
+                    f"attendance +{stats['attendance_created']}/~{stats['attendance_updated']}"
+                )
+
+            transaction.set_rollback(True)
+
+    def _seed_employees(self, count):
+        base = 900000
+        numbers = []
+        for offset in range(count):
+            number = base + offset
+            user = CustomUser.objects.create(id=number, email=f"bench{number}@example.com", role="employee")
+            info = EmploymentInfo.objects.create(
+                employee_number=number,
+                first_name="Bench",
+                last_name=str(number),
+                position="Benchmark",
+                address="N/A",
+                hire_date=date(2025, 1, 1),
+                active=True,
+            )
+            Employee.objects.create(user=user, employment_info=info)
+            numbers.append(number)
+        return numbers
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.5 on 2026-10-18 10:49
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def delete_duplicate_punches(apps, schema_editor):
+    """Keep the oldest row of every (emp_id, time) so the unique constraint can be added."""
+    BiometricData = apps.get_model("biometricdata", "BiometricData")
+    keep = (
+        BiometricData.objects.values("emp_id", "time")
+        .annotate(keep_id=Min("id"))
+        .values_list("keep_id", flat=True)
+    )
+    BiometricData.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biometricdata', '0003_remove_biometricdata_user_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_punches, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='biometricdata',
+            constraint=models.UniqueConstraint(fields=('emp_id', 'time'), name='unique_biometricdata_emp_id_time'),
+        ),
+    ]
@@ -9,5 +9,11 @@ class BiometricData(models.Model):
     work_state = models.CharField(max_length=50)
     terminal_name = models.CharField(max_length=100)
 
+    class Meta:
+        constraints = [
+            # A device never records the same employee twice at the same instant; re-pulls conflict here
+            models.UniqueConstraint(fields=["emp_id", "time"], name="unique_biometricdata_emp_id_time"),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.time}"
\ No newline at end of file
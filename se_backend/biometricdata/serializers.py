@@ -10,3 +10,12 @@ class BiometricDataSerializer(serializers.ModelSerializer):
         if isinstance(data, list):  # Handle list of objects
             return [super().to_internal_value(item) for item in data]
         return super().to_internal_value(data)
+
+
+class BiometricDataImportSerializer(BiometricDataSerializer):
+    """
+    Field validation only. The (emp_id, time) uniqueness check would cost a query per row;
+    bulk imports resolve duplicates set-wise in biometricdata.ingestion instead.
+    """
+    class Meta(BiometricDataSerializer.Meta):
+        validators = []
@@ -1,59 +1,41 @@
-"""
+import logging
 from celery import shared_task
-from django.db.models.signals import post_save
-from zk import ZK, const
-from biometricdata.models import BiometricData
-from datetime import datetime
+from django.conf import settings
+from zk import ZK
+from .ingestion import ingest_device_logs
 
-# Replace with your ZKTeco device details
-ZKTECO_IP = "192.168.1.201"
-ZKTECO_PORT = 4370
+logger = logging.getLogger(__name__)
+
+
+def get_device():
+    return ZK(settings.ZKTECO_IP, port=settings.ZKTECO_PORT, timeout=5, password=0, force_udp=False, ommit_ping=False)
 
 
 @shared_task
 def fetch_new_biometric_data():
-    # Fetch biometric attendance logs from the ZKTeco device and store only new records in the database
-    zk = ZK(ZKTECO_IP, port=ZKTECO_PORT, timeout=5, password=0, force_udp=False, ommit_ping=False)
+    """
+    Fetch attendance logs from the ZKTeco device and ingest them as one batch
+    (see biometricdata.ingestion) instead of probing and signalling row by row.
+    The device returns its whole buffer on every pull; already-stored punches are dropped by the
+    (emp_id, time) unique constraint, so the sync stays cheap as history grows.
+    """
+    zk = get_device()
     conn = None
-
     try:
         # Connect to the device
         conn = zk.connect()
         conn.disable_device()  # Prevent interference during data retrieval
-
         logs = conn.get_attendance()  # Fetch attendance logs
-        new_entries = []
-
-        for log in logs:
-            emp_id = log.user_id
-            time = log.timestamp
-
-            # Check if the record already exists
-            if not BiometricData.objects.filter(emp_id=emp_id, time=time).exists():
-                biometric_entry = BiometricData(
-                    emp_id=emp_id,
-                    name=f"Employee {emp_id}",  # Modify to fetch real names if available
-                    time=time,
-                    work_code="N/A",
-                    work_state=str(log.status),  # Can be mapped to 'Check-in', 'Check-out', etc.
-                    terminal_name="ZKTeco Terminal"
-                )
-                new_entries.append(biometric_entry)
-
-        if new_entries:
-            BiometricData.objects.bulk_create(new_entries)
-
-            # Manually trigger post_save signals for each entry
-            for entry in new_entries:
-                post_save.send(sender=BiometricData, instance=entry, created=True)
+
+        stats = ingest_device_logs(logs, ignore_conflicts=True)
 
         conn.enable_device()  # Re-enable the device
-        return f"Successfully added {len(new_entries)} new biometric entries."
+        return (f"Synced {stats['received']} biometric entries: {stats['attendance_created']} attendance created, "
+                f"{stats['attendance_updated']} updated, {stats['periods_recomputed']} periods recomputed.")
 
     except Exception as e:
+        logger.exception("Error fetching biometric data")
         return f"Error fetching biometric data: {str(e)}"
-
     finally:
         if conn:
             conn.disconnect()
-"""
\ No newline at end of file
@@ -1,7 +1,19 @@
 from django.test import TestCase
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
 from biometricdata.models import BiometricData
+from biometricdata.devices import FakeZKDevice
+from biometricdata.ingestion import ingest_device_logs
+from attendance.models import Attendance
+from employees.models import Employee
+from employment_info.models import EmploymentInfo
+from users.models import CustomUser
+from shared.auth.serializers import LoginSerializer
 from django.utils import timezone
-from datetime import datetime
+from datetime import date, datetime, time
+import json
 
 class BiometricDataModelTestCase(TestCase):
 
@@ -34,3 +46,180 @@ class BiometricDataModelTestCase(TestCase):
     def test_delete_biometric_data(self):
         self.biometric.delete()
         self.assertEqual(BiometricData.objects.count(), 0)
+
+
+class BiometricIngestionTestCase(TestCase):
+    def setUp(self):
+        self.employee_numbers = [501, 502]
+        for number in self.employee_numbers:
+            user = CustomUser.objects.create_user(
+                email=f"emp{number}@example.com", password="password", role="employee"
+            )
+            info = EmploymentInfo.objects.create(
+                employee_number=number,
+                first_name="Juan",
+                last_name=str(number),
+                position="Staff",
+                address="Manila",
+                hire_date=date(2024, 1, 1),
+                active=True
+            )
+            Employee.objects.create(user=user, employment_info=info)
+
+    def test_ingest_folds_punches_into_attendance(self):
+        # 503 has no employment record and only lands in BiometricData
+        logs = FakeZKDevice(60, self.employee_numbers + [503]).get_attendance()
+        stats = ingest_device_logs(logs)
+
+        self.assertEqual(stats["created"], 60)
+        self.assertEqual(stats["unmatched"], 1)
+        self.assertEqual(BiometricData.objects.count(), 60)
+        self.assertEqual(Attendance.objects.count(), 20)
+
+        attendance = Attendance.objects.get(user__email="emp501@example.com", date=logs[0].timestamp.date())
+        self.assertEqual(attendance.check_in_time, logs[0].timestamp.time())
+        self.assertEqual(attendance.check_out_time, logs[1].timestamp.time())
+
+    def test_reingesting_the_buffer_is_a_no_op(self):
+        logs = FakeZKDevice(40, self.employee_numbers).get_attendance()
+        ingest_device_logs(logs)
+        stats = ingest_device_logs(logs)
+
+        self.assertEqual(stats["duplicates"], 40)
+        self.assertEqual(stats["created"], 0)
+        self.assertEqual(BiometricData.objects.count(), 40)
+
+    def test_late_punch_extends_check_out(self):
+        logs = FakeZKDevice(4, self.employee_numbers).get_attendance()
+        ingest_device_logs(logs)
+
+        late = logs[1]._replace(uid=99, timestamp=datetime.combine(logs[1].timestamp.date(), time(22, 0)))
+        stats = ingest_device_logs([late])
+
+        self.assertEqual(stats["attendance_updated"], 1)
+        attendance = Attendance.objects.get(user__email="emp501@example.com")
+        self.assertEqual(attendance.check_out_time, time(22, 0))
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        with CaptureQueriesContext(connection) as small:
+            ingest_device_logs(FakeZKDevice(20, self.employee_numbers).get_attendance())
+        BiometricData.objects.all().delete()
+        Attendance.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            ingest_device_logs(FakeZKDevice(600, self.employee_numbers).get_attendance())
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_resync_with_ignore_conflicts_is_idempotent(self):
+        logs = FakeZKDevice(40, self.employee_numbers).get_attendance()
+        ingest_device_logs(logs, ignore_conflicts=True)
+
+        late = logs[1]._replace(uid=99, timestamp=datetime.combine(logs[1].timestamp.date(), time(22, 0)))
+        stats = ingest_device_logs(logs + [late], ignore_conflicts=True)
+
+        self.assertEqual(BiometricData.objects.count(), 41)
+        self.assertEqual(stats["attendance_created"], 0)
+        self.assertEqual(stats["attendance_updated"], 1)
+
+    def test_resync_does_not_undo_attendance_corrections(self):
+        logs = FakeZKDevice(4, self.employee_numbers).get_attendance()
+        ingest_device_logs(logs, ignore_conflicts=True)
+
+        corrected, removed = Attendance.objects.order_by("id")
+        corrected.check_in_time = time(10, 0)
+        corrected.save()
+        removed.delete()
+
+        stats = ingest_device_logs(logs, ignore_conflicts=True)
+
+        self.assertEqual((stats["created"], stats["duplicates"]), (0, 4))
+        self.assertEqual(Attendance.objects.get().check_in_time, time(10, 0))
+
+    def test_resync_query_count_does_not_grow_with_history(self):
+        device_buffer = FakeZKDevice(20, self.employee_numbers).get_attendance()
+        with CaptureQueriesContext(connection) as first:
+            ingest_device_logs(device_buffer, ignore_conflicts=True)
+        ingest_device_logs(FakeZKDevice(600, self.employee_numbers, start_date=date(2024, 1, 1)).get_attendance())
+        with CaptureQueriesContext(connection) as later:
+            ingest_device_logs(device_buffer, ignore_conflicts=True)
+
+        self.assertLessEqual(len(later.captured_queries), len(first.captured_queries))
+
+    def test_duplicate_punch_violates_unique_constraint(self):
+        logs = FakeZKDevice(1, self.employee_numbers).get_attendance()
+        ingest_device_logs(logs)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            BiometricData.objects.create(
+                emp_id=501, name="Juan", time=timezone.make_aware(logs[0].timestamp),
+                work_code="N/A", work_state="0", terminal_name="Main Gate"
+            )
+
+
+class BiometricBulkImportTestCase(TestCase):
+    def setUp(self):
+        user = CustomUser.objects.create_user(email="emp601@example.com", password="password", role="employee")
+        info = EmploymentInfo.objects.create(
+            employee_number=601,
+            first_name="Juan",
+            last_name="Dela Cruz",
+            position="Staff",
+            address="Manila",
+            hire_date=date(2024, 1, 1),
+            active=True
+        )
+        Employee.objects.create(user=user, employment_info=info)
+
+        owner = CustomUser.objects.create_user(email="owner@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(owner).access_token}")
+        self.url = reverse("biometricdata:biometricdata-bulk-import")
+
+    def punch(self, hour, minute=0, emp_id=601):
+        return {
+            "emp_id": emp_id,
+            "name": "Juan Dela Cruz",
+            "time": timezone.make_aware(datetime(2025, 4, 7, hour, minute)).isoformat(),
+            "work_code": "N/A",
+            "work_state": "0",
+            "terminal_name": "Main Gate",
+        }
+
+    def test_ndjson_import_in_chunks(self):
+        rows = [self.punch(9), self.punch(12), self.punch(18), self.punch(9, emp_id=999)]
+        body = "\n".join(json.dumps(row) for row in rows + [rows[0]])
+
+        response = self.client.post(f"{self.url}?chunk_size=2", data=body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["received"], 5)
+        self.assertEqual(response.data["created"], 4)
+        self.assertEqual(response.data["duplicates"], 1)
+        self.assertIn("rows_per_second", response.data)
+        attendance = Attendance.objects.get(user__email="emp601@example.com")
+        self.assertEqual((attendance.check_in_time, attendance.check_out_time), (time(9, 0), time(18, 0)))
+
+    def test_csv_import(self):
+        header = "emp_id,name,time,work_code,work_state,terminal_name"
+        lines = [header] + [",".join(str(value) for value in self.punch(hour).values()) for hour in (9, 18)]
+
+        response = self.client.post(self.url, data="\n".join(lines), content_type="text/csv")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(BiometricData.objects.count(), 2)
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_invalid_row_rejects_the_import(self):
+        bad = dict(self.punch(18), time="not a time")
+        body = "\n".join(json.dumps(row) for row in (self.punch(9), bad))
+
+        response = self.client.post(self.url, data=body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0]["row"], "2")
+        self.assertEqual(BiometricData.objects.count(), 0)
+
+    def test_missing_body_is_not_reported_as_an_import(self):
+        response = self.client.post(self.url, data="", content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 411)
+        self.assertEqual(BiometricData.objects.count(), 0)
@@ -1,13 +1,15 @@
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from shared.generic_viewset import GenericViewset
 from shared.utils import role_required
+from .ingestion import IMPORT_CHUNK_SIZE, import_rows, iter_csv_rows, iter_ndjson_rows
 from .models import BiometricData
 from .serializers import BiometricDataSerializer
 
 class BiometricDataViewSet(GenericViewset):
-    protected_views = ["create", "update", "partial_update", "retrieve", "destroy", "list"]
+    protected_views = ["create", "update", "partial_update", "retrieve", "destroy", "list", "bulk_import"]
     permissions = [IsAuthenticated]
     queryset = BiometricData.objects.all()
     serializer_class = BiometricDataSerializer
@@ -59,3 +61,40 @@ class BiometricDataViewSet(GenericViewset):
         instance = self.get_object()
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=["post"], url_path="bulk-import")
+    @role_required(["owner", "admin"])
+    def bulk_import(self, request, *args, **kwargs):
+        """
+        Stream punches into BiometricData without the per-row signal cascade.
+        Accepts NDJSON (application/x-ndjson) or CSV with a header line (text/csv).
+        Rows are validated and bulk inserted in chunks (?chunk_size=, default 2000), then attendance
+        summaries are recomputed once per affected (user, payroll period).
+        """
+        content_type = request.content_type.split(";")[0].strip()
+        if content_type == "text/csv":
+            reader = iter_csv_rows
+        elif content_type in ("application/x-ndjson", "application/jsonl"):
+            reader = iter_ndjson_rows
+        else:
+            return Response(
+                {"detail": "Send the body as application/x-ndjson or text/csv."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+
+        try:
+            chunk_size = int(request.query_params.get("chunk_size", IMPORT_CHUNK_SIZE))
+        except ValueError:
+            chunk_size = 0
+        if chunk_size < 1:
+            return Response({"chunk_size": "Must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # DRF gives no stream for a body without a Content-Length (e.g. chunked) as well as an empty one
+        if request.stream is None:
+            return Response(
+                {"detail": "Send the rows in the request body, with a Content-Length header."},
+                status=status.HTTP_411_LENGTH_REQUIRED
+            )
+
+        stats = import_rows(reader(request.stream), chunk_size=chunk_size)
+        return Response(stats, status=status.HTTP_201_CREATED)
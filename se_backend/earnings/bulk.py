@@ -0,0 +1,18 @@
+from django.db import transaction
+
+from benefits.contributions import BULK_BATCH_SIZE, write_benefit_contributions
+from .models import Earnings
+
+
+def create_earnings(earnings):
+    """
+    Insert many unsaved Earnings rows at once and price their users' benefits in one batched write.
+    bulk_create fires no post_save, so the last row with a basic rate per user stands in for the signal.
+    """
+    with transaction.atomic():
+        created = Earnings.objects.bulk_create(earnings, batch_size=BULK_BATCH_SIZE)
+        write_benefit_contributions({
+            row.user_id: row.basic_rate
+            for row in created if row.user_id is not None and row.basic_rate is not None
+        })
+    return created
@@ -1,5 +1,13 @@
+from decimal import Decimal
+from contextlib import contextmanager
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from users.models import CustomUser
+from benefits.contributions import benefits_batch
+from benefits.models import SSS, Philhealth, Pagibig
+from benefits.rates import invalidate_rate_cache, sss_table
+from earnings.bulk import create_earnings
 from earnings.models import Earnings
 
 
@@ -40,3 +48,58 @@ class EarningsModelTestCase(TestCase):
     def test_delete_earnings(self):
         self.earnings.delete()
         self.assertEqual(Earnings.objects.count(), 0)
+
+
+class BenefitContributionsTestCase(TestCase):
+    def setUp(self):
+        # Load the rate schedules up front so query counts cover the writes only
+        invalidate_rate_cache()
+        self.addCleanup(invalidate_rate_cache)
+        sss_table()
+
+        self.users = [
+            CustomUser.objects.create_user(email=f"benefits{i}@example.com", password="testpass123", role="employee")
+            for i in range(3)
+        ]
+
+    @contextmanager
+    def assertBenefitQueries(self, count):
+        """assertNumQueries over the benefits tables only; audit logging and savepoints are left out."""
+        with CaptureQueriesContext(connection) as context:
+            yield
+        statements = [query["sql"] for query in context.captured_queries if '"benefits_' in query["sql"]]
+        self.assertEqual(len(statements), count, "\n".join(statements))
+
+    def test_single_save_queries(self):
+        # One select and one insert per benefit model
+        with self.assertBenefitQueries(6):
+            earnings = Earnings.objects.create(user=self.users[0], basic_rate=Decimal("20000.00"))
+        self.assertEqual(SSS.objects.get(user=self.users[0]).total_contribution, Decimal("1515.00"))
+        self.assertEqual(Philhealth.objects.get(user=self.users[0]).total_contribution, Decimal("500.00"))
+        self.assertEqual(Pagibig.objects.get(user=self.users[0]).total_contribution, Decimal("200.00"))
+
+        # Unchanged values: the three selects only
+        earnings.allowance = Decimal("1500.00")
+        with self.assertBenefitQueries(3):
+            earnings.save()
+
+        # A new basic rate rewrites every model (Pag-IBIG stores the basic salary too)
+        earnings.basic_rate = Decimal("30000.00")
+        with self.assertBenefitQueries(6):
+            earnings.save()
+        self.assertEqual(Philhealth.objects.get(user=self.users[0]).total_contribution, Decimal("750.00"))
+        self.assertEqual(Pagibig.objects.get(user=self.users[0]).basic_salary, Decimal("30000.00"))
+
+    def test_bulk_modes(self):
+        # A select and an insert per benefit model, whatever the row count
+        with self.assertBenefitQueries(6):
+            create_earnings([Earnings(user=user, basic_rate=Decimal("15000.00")) for user in self.users])
+        self.assertEqual(Philhealth.objects.filter(total_contribution=Decimal("375.00")).count(), 3)
+
+        # Each save inside the block is deferred; the benefits are written once, as one update per model
+        with self.assertBenefitQueries(6):
+            with benefits_batch():
+                for user in self.users:
+                    Earnings.objects.create(user=user, basic_rate=Decimal("10000.00"))
+        self.assertEqual(Philhealth.objects.filter(total_contribution=Decimal("250.00")).count(), 3)
+        self.assertEqual(SSS.objects.count(), 3)
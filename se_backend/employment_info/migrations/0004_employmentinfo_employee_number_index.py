@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employment_info', '0003_employmentinfo_resignation_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employmentinfo',
+            index=models.Index(fields=['employee_number'], name='employment__employe_a6adc2_idx'),
+        ),
+    ]
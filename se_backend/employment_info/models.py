@@ -15,5 +15,11 @@ class EmploymentInfo(models.Model):
     active = models.BooleanField()
     resignation_date = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Biometric punches are matched to employees by their number
+            models.Index(fields=["employee_number"]),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.position})"
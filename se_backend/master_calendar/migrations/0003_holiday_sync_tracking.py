@@ -0,0 +1,34 @@
+# Generated by Django 4.2.5 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('master_calendar', '0002_alter_mastercalendarpayroll_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('holiday_type', models.CharField(choices=[('regular', 'Regular Holiday'), ('special', 'Special Holiday')], max_length=10)),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HolidaySyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_modified', models.DateTimeField(blank=True, null=True)),
+                ('date_modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='mastercalendar',
+            index=models.Index(fields=['date_modified'], name='master_cale_date_mo_e23ed7_idx'),
+        ),
+    ]
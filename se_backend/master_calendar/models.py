@@ -20,6 +20,29 @@ class MasterCalendar(models.Model):
     class Meta:
         ordering = ['date']
         unique_together = ['date', 'holiday_type']
+        indexes = [
+            # High-water-mark scans of the holiday sync
+            models.Index(fields=['date_modified']),
+        ]
+
+
+class DeletedHoliday(models.Model):
+    """Tombstone for a holiday that was deleted or moved off its date; consumed by the holiday sync."""
+    date = models.DateField()
+    holiday_type = models.CharField(max_length=10, choices=MasterCalendar.HOLIDAY_TYPES)
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Deleted {self.holiday_type} holiday - {self.date}"
+
+
+class HolidaySyncState(models.Model):
+    """Last MasterCalendar.date_modified processed by master_calendar.tasks.sync_holiday_changes."""
+    last_modified = models.DateTimeField(null=True, blank=True)
+    date_modified = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Holiday sync up to {self.last_modified}"
 
 
 class MasterCalendarPayroll(models.Model):
@@ -1,25 +1,44 @@
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import MasterCalendar, MasterCalendarPayroll
+from .models import DeletedHoliday, MasterCalendar, MasterCalendarPayroll
+
+
+def queue_holiday_sync():
+    from .tasks import sync_holiday_changes
+    transaction.on_commit(lambda: sync_holiday_changes.delay())
+
+
+@receiver([pre_save], sender=MasterCalendar)
+def tombstone_moved_holiday(sender, instance, **kwargs):
+    """
+    A holiday moved to another date (or type) leaves its old date behind; record it so the
+    change-tracked sync also clears the schedules that still list the old date.
+    """
+    if instance.pk is None:
+        return
+
+    previous = MasterCalendar.objects.filter(pk=instance.pk).values("date", "holiday_type").first()
+    if previous and (previous["date"], previous["holiday_type"]) != (instance.date, instance.holiday_type):
+        DeletedHoliday.objects.create(**previous)
 
 
 @receiver([post_save], sender=MasterCalendar)
 def trigger_holiday_update(sender, instance, created, **kwargs):
     """
-    Signal handler to trigger a Celery task when a holiday is added or updated.
+    Signal handler to trigger the change-tracked holiday sync when a holiday is added or updated.
     """
-    from .tasks import update_schedules_for_holiday
-    update_schedules_for_holiday.delay(instance.id)
+    queue_holiday_sync()
 
 @receiver([post_delete], sender=MasterCalendar)
 def trigger_full_update_on_delete(sender, instance, **kwargs):
     """
-    Signal handler to trigger a full update when a holiday is deleted
-    since we need to remove it from all schedules.
+    Leave a tombstone for a deleted holiday so the sync can remove it from the schedules
+    covering its date, instead of sweeping every schedule.
     """
-    from .tasks import sync_holidays_for_new_calendar_entries
-    sync_holidays_for_new_calendar_entries.delay()
+    DeletedHoliday.objects.create(date=instance.date, holiday_type=instance.holiday_type)
+    queue_holiday_sync()
 
 @receiver([post_save], sender=MasterCalendarPayroll)
 def trigger_create_biweekly(sender, instance, **kwargs):
@@ -1,94 +1,109 @@
+import logging
 from celery import shared_task
-from django.db.models import Q
-from django.utils import timezone
-from .models import MasterCalendar
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from .holidays import HolidayIndex
+from .models import DeletedHoliday, HolidaySyncState, MasterCalendar
 from schedule.models import Schedule
 from datetime import datetime, timedelta
 
-@shared_task
-def update_schedule_holidays(schedule_id=None):
-    """
-    Updates a single schedule's holiday arrays based on the master calendar.
-    If schedule_id is None, update all schedules.
-    """
+logger = logging.getLogger(__name__)
 
-    if schedule_id:
-        schedules = Schedule.objects.filter(id=schedule_id)
-    else:
-        schedules = Schedule.objects.filter(
-            Q(payroll_period_start__isnull=False) &
-            Q(payroll_period_end__isnull=False)
-        )
-
-    updated_count = 0
-    for schedule in schedules:
-        # Get all holidays within the schedule's payroll period
-        holidays = MasterCalendar.objects.filter(
-            date__gte=schedule.payroll_period_start,
-            date__lte=schedule.payroll_period_end
-        )
-
-        # Reset holiday arrays
-        schedule.regularholiday = []
-        schedule.specialholiday = []
-
-        # Fill in the arrays with appropriate holidays
-        for holiday in holidays:
-            if holiday.holiday_type == 'regular':
-                if schedule.regularholiday is None:
-                    schedule.regularholiday = [holiday.date]
-                else:
-                    schedule.regularholiday.append(holiday.date)
-            elif holiday.holiday_type == 'special':
-                if schedule.specialholiday is None:
-                    schedule.specialholiday = [holiday.date]
-                else:
-                    schedule.specialholiday.append(holiday.date)
-
-        # Save the updated schedule
-        schedule.save(update_fields=['regularholiday', 'specialholiday'])
-        updated_count += 1
-
-    return f"Updated holidays for {updated_count} schedules"
+SCHEDULE_BATCH_SIZE = 2000
+# date_modified is stamped before commit, so a holiday can become visible after a run has moved the
+# high-water mark past it; each run re-reads this much before the mark (re-applying is a no-op)
+SYNC_OVERLAP = timedelta(minutes=15)
 
 
-@shared_task
-def sync_holidays_for_new_calendar_entries():
+def refresh_schedule_holidays(schedules):
     """
-    Check for holiday calendar entries created in the last 24 hours and
-    update all relevant schedules.
-    This task should be scheduled to run daily.
+    Recompute the holiday arrays of `schedules` from the master calendar and return (changed, scanned).
+
+    Holidays are loaded once into a HolidayIndex, each schedule's arrays are sliced out of it, and
+    only the schedules whose arrays changed are written, with bulk_update. bulk_update skips the
+    Schedule post_save signals, so the changed payroll periods are handed to the attendance
+    recompute instead (holiday minutes depend on the arrays).
     """
+    from attendance.recompute import request_recompute
 
-    one_day_ago = timezone.now().date() - timezone.timedelta(days=1)
-    recent_holidays = MasterCalendar.objects.filter(
-        Q(date__gte=one_day_ago) | Q(date_modified__gte=one_day_ago)
+    schedules = schedules.filter(
+        Q(payroll_period_start__isnull=False) &
+        Q(payroll_period_end__isnull=False)
     )
 
-    for holiday in recent_holidays:
-        update_schedules_for_holiday.delay(holiday.id)
+    bounds = schedules.aggregate(start=Min("payroll_period_start"), end=Max("payroll_period_end"))
+    if bounds["start"] is None:
+        return 0, 0
+
+    index = HolidayIndex(bounds["start"], bounds["end"])
 
-    return f"Processed {recent_holidays.count()} recent holiday updates"
+    scanned = 0
+    changed = []
+    fields = ["id", "user_id", "payroll_period_start", "payroll_period_end", "regularholiday", "specialholiday"]
+    for schedule in schedules.only(*fields).iterator(chunk_size=SCHEDULE_BATCH_SIZE):
+        scanned += 1
+        regular = index.between("regular", schedule.payroll_period_start, schedule.payroll_period_end)
+        special = index.between("special", schedule.payroll_period_start, schedule.payroll_period_end)
+
+        if schedule.regularholiday != regular or schedule.specialholiday != special:
+            schedule.regularholiday = regular
+            schedule.specialholiday = special
+            changed.append(schedule)
+
+    Schedule.objects.bulk_update(changed, ["regularholiday", "specialholiday"], batch_size=SCHEDULE_BATCH_SIZE)
+    request_recompute({(schedule.user_id_id, schedule.payroll_period_start) for schedule in changed})
+    return len(changed), scanned
 
 
 @shared_task
-def update_schedules_for_holiday(holiday_id):
+def update_schedule_holidays(schedule_id=None):
     """
-    Update all schedules that should include a specific holiday.
+    Updates a single schedule's holiday arrays based on the master calendar.
+    If schedule_id is None, update all schedules.
     """
+    if schedule_id:
+        schedules = Schedule.objects.filter(id=schedule_id)
+    else:
+        schedules = Schedule.objects.all()
 
-    try:
-        holiday = MasterCalendar.objects.get(id=holiday_id)
-    except MasterCalendar.DoesNotExist:
-        return "Holiday not found"
+    changed, scanned = refresh_schedule_holidays(schedules)
 
-    # Find all schedules that include this holiday's date in their payroll period
-    affected_schedules = Schedule.objects.filter(
-        payroll_period_start__lte=holiday.date,
-        payroll_period_end__gte=holiday.date
-    )
+    logger.info(f"[update_schedule_holidays] Changed {changed} of {scanned} scanned schedules.")
+    return f"Updated holidays for {changed} of {scanned} schedules"
 
-    for schedule in affected_schedules:
-        update_schedule_holidays.delay(schedule.id)
 
-    return f"Triggered updates for {affected_schedules.count()} schedules"
\ No newline at end of file
+@shared_task
+def sync_holiday_changes():
+    """
+    Change-tracked holiday sync. Picks up holidays modified after the stored high-water mark (less
+    SYNC_OVERLAP) plus DeletedHoliday tombstones, and refreshes only the schedules whose payroll
+    period holds one of those dates. A run with nothing new makes no writes.
+    """
+    with transaction.atomic():
+        state, _ = HolidaySyncState.objects.select_for_update().get_or_create(pk=1)
+
+        modified = MasterCalendar.objects.all()
+        if state.last_modified is not None:
+            modified = modified.filter(date_modified__gt=state.last_modified - SYNC_OVERLAP)
+        modified = list(modified.values_list("date", "date_modified"))
+        tombstones = list(DeletedHoliday.objects.values_list("id", "date"))
+
+        if not modified and not tombstones:
+            return "No holiday changes"
+
+        dates = {holiday_date for holiday_date, _ in modified} | {holiday_date for _, holiday_date in tombstones}
+        covering = Q()
+        for holiday_date in dates:
+            covering |= Q(payroll_period_start__lte=holiday_date, payroll_period_end__gte=holiday_date)
+
+        changed, scanned = refresh_schedule_holidays(Schedule.objects.filter(covering))
+
+        latest = max((date_modified for _, date_modified in modified), default=None)
+        if latest is not None and (state.last_modified is None or latest > state.last_modified):
+            state.last_modified = latest
+            state.save()
+        DeletedHoliday.objects.filter(id__in=[tombstone_id for tombstone_id, _ in tombstones]).delete()
+
+    logger.info(f"[sync_holiday_changes] {len(modified)} modified and {len(tombstones)} deleted holidays: "
+                f"changed {changed} of {scanned} scanned schedules.")
+    return f"Updated holidays for {changed} of {scanned} schedules"
@@ -1,6 +1,12 @@
 from django.test import TestCase
-from .models import MasterCalendar, MasterCalendarPayroll
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from .models import DeletedHoliday, HolidaySyncState, MasterCalendar, MasterCalendarPayroll
+from .tasks import SYNC_OVERLAP, sync_holiday_changes, update_schedule_holidays
+from schedule.models import Schedule
+from users.models import CustomUser
 from datetime import date
+from django.utils import timezone
 
 
 class MasterCalendarModelTest(TestCase):
@@ -63,3 +69,81 @@ class MasterCalendarPayrollModelTest(TestCase):
         )
         self.assertEqual(MasterCalendarPayroll.objects.count(), 2)
         self.assertEqual(str(payroll2), "2025-04-16 - 2025-04-30")
+
+
+class UpdateScheduleHolidaysTest(TestCase):
+
+    def setUp(self):
+        user = CustomUser.objects.create_user(email="holiday@example.com", password="password", role="employee")
+        self.april = Schedule.objects.create(
+            user_id=user, payroll_period_start=date(2025, 4, 1), payroll_period_end=date(2025, 4, 15),
+            bi_weekly_start=date(2025, 4, 1), hours=0
+        )
+        self.may = Schedule.objects.create(
+            user_id=user, payroll_period_start=date(2025, 5, 1), payroll_period_end=date(2025, 5, 15),
+            bi_weekly_start=date(2025, 5, 1), hours=0, regularholiday=[], specialholiday=[]
+        )
+        for name, holiday_date, holiday_type in (
+            ("Maundy Thursday", date(2025, 4, 17), "regular"),
+            ("Araw ng Kagitingan", date(2025, 4, 9), "regular"),
+            ("Black Saturday", date(2025, 4, 1), "special"),
+            ("Labor Day", date(2025, 5, 16), "regular"),
+        ):
+            MasterCalendar.objects.create(name=name, date=holiday_date, holiday_type=holiday_type)
+
+    def test_arrays_follow_the_payroll_period(self):
+        self.assertEqual(update_schedule_holidays(), "Updated holidays for 1 of 2 schedules")
+
+        self.april.refresh_from_db()
+        self.assertEqual(self.april.regularholiday, [date(2025, 4, 9)])
+        self.assertEqual(self.april.specialholiday, [date(2025, 4, 1)])
+
+    def test_unchanged_schedules_are_not_written(self):
+        update_schedule_holidays()
+        with self.assertNumQueries(3):  # bounds, holidays, schedules; no writes
+            self.assertEqual(update_schedule_holidays(), "Updated holidays for 0 of 2 schedules")
+
+    def test_single_schedule(self):
+        self.assertEqual(update_schedule_holidays(self.may.id), "Updated holidays for 0 of 1 schedules")
+
+    def test_change_tracked_sync_is_a_no_op_without_changes(self):
+        self.assertEqual(sync_holiday_changes(), "Updated holidays for 1 of 1 schedules")
+
+        # Inside the overlap the same holidays are re-applied without writes
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(sync_holiday_changes(), "Updated holidays for 0 of 1 schedules")
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith("UPDATE")])
+
+        MasterCalendar.objects.update(date_modified=timezone.now() - 2 * SYNC_OVERLAP)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(sync_holiday_changes(), "No holiday changes")
+        self.assertFalse([q for q in queries.captured_queries if q["sql"].startswith("UPDATE")])
+
+    def test_late_commit_behind_the_mark_is_picked_up(self):
+        sync_holiday_changes()
+
+        # Stamped before the last run's mark but only visible (committed) after that run
+        MasterCalendar.objects.create(name="Eid al-Fitr", date=date(2025, 5, 12), holiday_type="regular")
+        MasterCalendar.objects.filter(date=date(2025, 5, 12)).update(
+            date_modified=HolidaySyncState.objects.get().last_modified - SYNC_OVERLAP / 2
+        )
+
+        self.assertEqual(sync_holiday_changes(), "Updated holidays for 1 of 2 schedules")
+        self.may.refresh_from_db()
+        self.assertEqual(self.may.regularholiday, [date(2025, 5, 12)])
+
+    def test_deleted_and_moved_holidays_are_tombstoned(self):
+        sync_holiday_changes()
+
+        MasterCalendar.objects.get(date=date(2025, 4, 1)).delete()
+        moved = MasterCalendar.objects.get(date=date(2025, 4, 9))
+        moved.date = date(2025, 5, 5)
+        moved.save()
+        self.assertEqual(DeletedHoliday.objects.count(), 2)
+
+        self.assertEqual(sync_holiday_changes(), "Updated holidays for 2 of 2 schedules")
+        self.april.refresh_from_db()
+        self.may.refresh_from_db()
+        self.assertEqual((self.april.regularholiday, self.april.specialholiday), ([], []))
+        self.assertEqual(self.may.regularholiday, [date(2025, 5, 5)])
+        self.assertFalse(DeletedHoliday.objects.exists())
@@ -1,8 +1,9 @@
 from django.db import models
 from attendance_summary.models import AttendanceSummary
+from shared.models import DirtyFieldsMixin
 from users.models import CustomUser
 
-class OvertimeHours(models.Model):
+class OvertimeHours(DirtyFieldsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     attendancesummary = models.ForeignKey(AttendanceSummary, on_delete=models.CASCADE, null=True, blank=True)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True)
@@ -0,0 +1,178 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+
+from employment_info.models import EmploymentInfo
+from schedule.models import Schedule
+from .models import Payroll
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 1000
+
+# Salary FK -> fields of the related row read by calculate_gross_pay / calculate_total_deductions
+SOURCES = {
+    "earnings_id": ("basic_rate", "allowance", "ntax"),
+    "overtime_id": ("total_overtime", "total_late", "total_undertime"),
+    "deductions_id": ("wtax", "nowork", "loan", "charges", "msfcloan"),
+    "sss_id": ("total_employee",),
+    "philhealth_id": ("total_contribution",),
+    "pagibig_id": ("employee_share",),
+}
+
+PAYROLL_FIELDS = ["user_id", "gross_pay", "total_deductions", "net_pay", "pay_date", "schedule_id", "employment_info_id"]
+
+
+def load_columns(salaries):
+    """
+    Read `salaries` and the related amounts with one joined query into columns:
+    {"id": [...], "user_id": [...], "pay_date": [...], "earnings_id.basic_rate": [...], ...}.
+    A missing related row reads as 0, like the per-row functions. A related row holding NULL
+    makes the per-row path raise; its index goes to columns["invalid"].
+    """
+    names = ["id", "user_id", "pay_date"]
+    for fk, fields in SOURCES.items():
+        names.append(fk)
+        names.extend(f"{fk}__{field}" for field in fields)
+
+    columns = defaultdict(list)
+    columns["invalid"] = set()
+    for index, row in enumerate(salaries.order_by("id").values_list(*names)):
+        values = dict(zip(names, row))
+        for name in ("id", "user_id", "pay_date"):
+            columns[name].append(values[name])
+
+        for fk, fields in SOURCES.items():
+            present = values[fk] is not None
+            for field in fields:
+                value = values[f"{fk}__{field}"]
+                if present and value is None:
+                    columns["invalid"].add(index)
+                columns[f"{fk}.{field}"].append(value if present else 0)
+
+    return columns
+
+
+def _add(*vectors):
+    """Element-wise left-to-right sum of equal-length vectors."""
+    total = list(vectors[0])
+    for vector in vectors[1:]:
+        total = [a + b if a is not None and b is not None else None for a, b in zip(total, vector)]
+    return total
+
+
+def compute_pay(columns):
+    """Vectorized calculate_gross_pay / calculate_total_deductions / net pay, same operand order."""
+    c = columns
+    gross = _add(c["overtime_id.total_overtime"], c["earnings_id.basic_rate"],
+                 c["earnings_id.allowance"], c["earnings_id.ntax"])
+    deductions = _add(
+        _add([0] * len(c["id"]),
+             c["sss_id.total_employee"], c["philhealth_id.total_contribution"], c["pagibig_id.employee_share"],
+             c["deductions_id.wtax"], c["deductions_id.nowork"], c["deductions_id.loan"],
+             c["deductions_id.charges"], c["deductions_id.msfcloan"]),
+        _add(c["overtime_id.total_late"], c["overtime_id.total_undertime"]),
+    )
+    net = [g - d if g is not None and d is not None else None for g, d in zip(gross, deductions)]
+    return gross, deductions, net
+
+
+def latest_schedules(user_ids, pay_dates):
+    """{(user_id, pay_date): schedule_id} for the latest schedule ending before each pay date, in one query."""
+    by_user = defaultdict(list)
+    schedules = Schedule.objects.filter(
+        user_id__in=set(user_ids), payroll_period_end__lt=max(pay_dates)
+    ).order_by("user_id", "-payroll_period_end", "-id").values_list("user_id", "payroll_period_end", "id")
+    for user_id, period_end, schedule_id in schedules:
+        by_user[user_id].append((period_end, schedule_id))
+
+    resolved = {}
+    for user_id, pay_date in zip(user_ids, pay_dates):
+        resolved[(user_id, pay_date)] = next(
+            (schedule_id for period_end, schedule_id in by_user[user_id] if period_end < pay_date), None
+        )
+    return resolved
+
+
+def employment_infos(user_ids):
+    """{user_id: employment_info_id}, matching the per-row EmploymentInfo lookup on employee_number."""
+    return dict(
+        EmploymentInfo.objects.filter(employee_number__in=set(user_ids))
+        .order_by("employee_number", "id").distinct("employee_number")
+        .values_list("employee_number", "id")
+    )
+
+
+def compute_payrolls(salaries):
+    """
+    Batch counterpart of payroll.tasks.generate_payroll_for_salary for every Salary in `salaries`.
+    Reads are a fixed handful of queries whatever the headcount; Payroll rows are upserted on
+    salary_id with bulk_create/bulk_update, and payslips are created for rows that lack one.
+    Payroll rows whose values would not change are not written.
+    Returns {"salaries", "created", "updated", "unchanged", "skipped"}.
+    """
+    from payslip.snapshots import invalidate_snapshots
+    from payslip.tasks import create_missing_payslips
+
+    columns = load_columns(salaries)
+    salary_ids = columns["id"]
+    if not salary_ids:
+        return {"salaries": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+    gross, deductions, net = compute_pay(columns)
+    schedules = latest_schedules(columns["user_id"], columns["pay_date"])
+    infos = employment_infos(columns["user_id"])
+
+    with transaction.atomic():
+        existing = {}
+        for payroll in Payroll.objects.filter(salary_id__in=salary_ids).order_by("id"):
+            existing.setdefault(payroll.salary_id_id, payroll)
+
+        to_create = []
+        to_update = []
+        unchanged = []
+        for index, salary_id in enumerate(salary_ids):
+            if index in columns["invalid"]:
+                logger.error(f"[compute_payrolls] Salary ID {salary_id} has a related row with a NULL amount. Skipped.")
+                continue
+
+            user_id = columns["user_id"][index]
+            pay_date = columns["pay_date"][index]
+            values = {
+                "user_id_id": user_id,
+                "gross_pay": gross[index],
+                "total_deductions": deductions[index],
+                "net_pay": net[index],
+                "pay_date": pay_date,
+                "schedule_id_id": schedules[(user_id, pay_date)],
+                "employment_info_id_id": infos.get(user_id),
+            }
+
+            payroll = existing.get(salary_id)
+            if payroll is None:
+                to_create.append(Payroll(salary_id_id=salary_id, **values))
+            else:
+                for field, value in values.items():
+                    setattr(payroll, field, value)
+                # Unchanged rows are neither written nor have their snapshots dropped
+                if payroll.is_dirty():
+                    to_update.append(payroll)
+                else:
+                    unchanged.append(payroll)
+
+        Payroll.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+        Payroll.objects.bulk_update(to_update, PAYROLL_FIELDS, batch_size=BULK_BATCH_SIZE)
+        # bulk_update skips post_save, which is what normally drops stale payslip snapshots
+        invalidate_snapshots(payroll_ids=[payroll.id for payroll in to_update])
+        create_missing_payslips(to_create + to_update + unchanged)
+
+    stats = {
+        "salaries": len(salary_ids),
+        "created": len(to_create),
+        "updated": len(to_update),
+        "unchanged": len(unchanged),
+        "skipped": len(columns["invalid"]),
+    }
+    logger.info(f"[compute_payrolls] {stats}")
+    return stats
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0003_payroll_employment_info_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['pay_date'], name='payroll_pay_pay_dat_008cf5_idx'),
+        ),
+    ]
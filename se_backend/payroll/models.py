@@ -3,10 +3,11 @@ from django.db import models
 from employment_info.models import EmploymentInfo
 from salary.models import Salary
 from schedule.models import Schedule
+from shared.models import DirtyFieldsMixin
 from users.models import CustomUser
 
 
-class Payroll(models.Model):
+class Payroll(DirtyFieldsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     user_id = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True)
     salary_id = models.ForeignKey(Salary, on_delete=models.CASCADE, null=True)
@@ -17,5 +18,10 @@ class Payroll(models.Model):
     schedule_id = models.ForeignKey(Schedule, on_delete=models.CASCADE, null=True)
     employment_info_id = models.ForeignKey(EmploymentInfo, on_delete=models.CASCADE, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["pay_date"]),
+        ]
+
     def __str__(self):
         return f"{self.id} - {self.user_id}"
@@ -81,3 +81,30 @@ def generate_payroll_for_salary(salary_id):
     )
 
     return f"Payroll {'created' if created else 'updated'} for Salary ID {salary.id}"
+
+
+@shared_task
+def generate_payrolls_for_pay_date(pay_date=None):
+    """
+    Compute the Payroll of every Salary paid on `pay_date` (YYYY-MM-DD, today by default) in one batch
+    (see payroll.batch). Run by beat every day: on a pay date it settles the whole run, picking up
+    edits made since the salaries were created; on other days it finds no salaries.
+    """
+    from .batch import compute_payrolls
+
+    pay_date = pay_date or now().date().isoformat()
+    stats = compute_payrolls(Salary.objects.filter(pay_date=pay_date))
+    return (f"Payroll computed for {stats['salaries']} salaries on {pay_date}: "
+            f"{stats['created']} created, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['skipped']} skipped")
+
+
+@shared_task
+def generate_payrolls_for_salaries(salary_ids):
+    """Batched generate_payroll_for_salary for a list of Salary ids (see payroll.batch)."""
+    from .batch import compute_payrolls
+
+    stats = compute_payrolls(Salary.objects.filter(id__in=salary_ids))
+    return (f"Payroll computed for {stats['salaries']} salaries: "
+            f"{stats['created']} created, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['skipped']} skipped")
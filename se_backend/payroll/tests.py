@@ -6,7 +6,16 @@ from earnings.models import Earnings
 from deductions.models import Deductions
 from totalovertime.models import TotalOvertime
 from benefits.models import SSS, Philhealth, Pagibig
+from employment_info.models import EmploymentInfo
+from payroll.batch import compute_payrolls
+from payroll.tasks import generate_payroll_for_salary, generate_payrolls_for_pay_date
+from payslip.models import Payslip
+from schedule.models import Schedule
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
 from datetime import date
+from decimal import Decimal
 
 class PayrollModelTestCase(TestCase):
 
@@ -84,3 +93,90 @@ class PayrollModelTestCase(TestCase):
     def test_delete_payroll(self):
         self.payroll.delete()
         self.assertEqual(Payroll.objects.count(), 0)
+
+
+class PayrollBatchEngineTestCase(TestCase):
+    pay_date = date(2025, 4, 30)
+
+    def _salary(self, number, with_overtime=True, with_deductions=True):
+        user = CustomUser.objects.create_user(email=f"batch{number}@example.com", password="password", role="employee")
+        EmploymentInfo.objects.create(
+            employee_number=user.id, first_name="Juan", last_name=str(number), position="Staff",
+            address="Manila", hire_date=date(2024, 1, 1), active=True
+        )
+        Schedule.objects.create(
+            user_id=user, payroll_period_start=date(2025, 4, 1), payroll_period_end=date(2025, 4, 15),
+            bi_weekly_start=date(2025, 4, 1), hours=0
+        )
+        earnings = Earnings.objects.create(user=user, basic_rate=Decimal("1000.10"), basic=Decimal("800.00"), allowance=Decimal("100.05"), ntax=Decimal("0.33"))
+        return Salary.objects.create(
+            user_id=user,
+            earnings_id=earnings,
+            deductions_id=Deductions.objects.create(
+                user=user, wtax=Decimal("50.25"), nowork=Decimal("0.00"), loan=Decimal("20.10"), charges=Decimal("10.00"), msfcloan=Decimal("3.03")
+            ) if with_deductions else None,
+            overtime_id=TotalOvertime.objects.create(
+                user=user, total_overtime=Decimal("120.45"), total_late=Decimal("5.50"), total_undertime=Decimal("1.25")
+            ) if with_overtime else None,
+            sss_id=SSS.objects.create(user=user, basic_salary=Decimal("800.00"), total_employee=Decimal("45.00")),
+            philhealth_id=Philhealth.objects.create(user=user, basic_salary=Decimal("800.00"), total_contribution=Decimal("20.00")),
+            pagibig_id=Pagibig.objects.create(user=user, basic_salary=Decimal("800.00"), employee_share=Decimal("16.00")),
+            pay_date=self.pay_date
+        )
+
+    def _snapshot(self):
+        return sorted(Payroll.objects.values_list(
+            "salary_id", "user_id", "gross_pay", "total_deductions", "net_pay", "pay_date",
+            "schedule_id", "employment_info_id"
+        ))
+
+    def test_batch_matches_per_row_path(self):
+        salaries = [self._salary(1), self._salary(2, with_overtime=False), self._salary(3, with_deductions=False)]
+        for salary in salaries:
+            generate_payroll_for_salary(salary.id)
+        expected = self._snapshot()
+
+        Payroll.objects.all().delete()
+        stats = compute_payrolls(Salary.objects.filter(pay_date=self.pay_date))
+
+        self.assertEqual(stats["created"], 3)
+        self.assertEqual(self._snapshot(), expected)
+        self.assertEqual(Payslip.objects.count(), 3)
+
+        # Re-running with nothing changed writes nothing
+        stats = compute_payrolls(Salary.objects.filter(pay_date=self.pay_date))
+        self.assertEqual((stats["updated"], stats["unchanged"]), (0, 3))
+        self.assertEqual(self._snapshot(), expected)
+
+        # A changed amount updates its row in place
+        TotalOvertime.objects.filter(user=salaries[0].user_id).update(total_overtime=Decimal("130.45"))
+        stats = compute_payrolls(Salary.objects.filter(pay_date=self.pay_date))
+        self.assertEqual((stats["updated"], stats["unchanged"]), (1, 2))
+        self.assertEqual(Payslip.objects.count(), 3)
+
+    def test_pay_date_task_settles_the_whole_run(self):
+        for number in range(1, 4):
+            self._salary(number)
+        Payroll.objects.all().delete()
+
+        result = generate_payrolls_for_pay_date(self.pay_date.isoformat())
+
+        self.assertIn("3 created", result)
+        self.assertEqual(Payroll.objects.filter(pay_date=self.pay_date).count(), 3)
+
+        # Beat runs it without arguments for today's pay date
+        with mock.patch("payroll.tasks.now") as today:
+            today.return_value.date.return_value = self.pay_date
+            self.assertIn("0 created, 0 updated, 3 unchanged", generate_payrolls_for_pay_date())
+
+    def test_query_count_does_not_grow_with_headcount(self):
+        self._salary(1)
+        with CaptureQueriesContext(connection) as small:
+            compute_payrolls(Salary.objects.filter(pay_date=self.pay_date))
+        Payroll.objects.all().delete()
+        for number in range(2, 8):
+            self._salary(number)
+        with CaptureQueriesContext(connection) as large:
+            compute_payrolls(Salary.objects.filter(pay_date=self.pay_date))
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payslip', '0003_payslip_employee_generated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayslipSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('etag', models.CharField(max_length=64)),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+                ('payslip', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='snapshot', to='payslip.payslip')),
+            ],
+        ),
+    ]
@@ -14,4 +14,18 @@ class Payslip(models.Model):
     is_protected = models.BooleanField(default=True)
 
     def __str__(self):
-        return f"{self.id} - {self.user_id}"
\ No newline at end of file
+        return f"{self.id} - {self.user_id}"
+
+
+class PayslipSnapshot(models.Model):
+    """
+    Rendered PayslipSerializer JSON of an approved payslip, served as-is with a strong ETag.
+    Dropped when the payslip is unapproved or its Payroll/Salary is edited, and re-rendered on the next read.
+    """
+    payslip = models.OneToOneField(Payslip, on_delete=models.CASCADE, related_name="snapshot")
+    content = models.TextField()
+    etag = models.CharField(max_length=64)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Snapshot of Payslip {self.payslip_id} - {self.etag[:12]}"
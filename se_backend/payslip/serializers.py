@@ -79,6 +79,18 @@ class PayrollSerializer(serializers.ModelSerializer):
 class PayslipSerializer(serializers.ModelSerializer):
     payroll_id = PayrollSerializer()
 
+    # Every nested relation is a forward FK, so the whole graph loads in one joined query
+    select_related_fields = (
+        "payroll_id__schedule_id",
+        "payroll_id__employment_info_id",
+        "payroll_id__salary_id__earnings_id",
+        "payroll_id__salary_id__deductions_id",
+        "payroll_id__salary_id__overtime_id",
+        "payroll_id__salary_id__sss_id",
+        "payroll_id__salary_id__philhealth_id",
+        "payroll_id__salary_id__pagibig_id",
+    )
+
     class Meta:
         model = Payslip
         fields = '__all__'
@@ -1,8 +1,32 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from payroll.models import Payroll
+from salary.models import Salary
+from .models import Payslip, PayslipSnapshot
+from .snapshots import invalidate_snapshots
 from .tasks import generate_payslip_for_payroll
 
 @receiver(post_save, sender=Payroll)
 def trigger_payslip_task(sender, instance, created, **kwargs):
     generate_payslip_for_payroll.delay(instance.id)
+
+
+@receiver(post_save, sender=Payslip)
+def refresh_payslip_snapshot(sender, instance, **kwargs):
+    """
+    Drop the snapshot of a saved payslip. An approved payslip is materialized again by its next
+    read, which has the request the snapshot is rendered with (see payslip.snapshots.render_payslip).
+    """
+    PayslipSnapshot.objects.filter(payslip=instance).delete()
+
+
+@receiver(post_save, sender=Payroll)
+def invalidate_snapshots_on_payroll_change(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_snapshots(payroll_ids=[instance.id])
+
+
+@receiver(post_save, sender=Salary)
+def invalidate_snapshots_on_salary_change(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_snapshots(salary_ids=[instance.id])
@@ -0,0 +1,65 @@
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+from rest_framework.renderers import JSONRenderer
+
+from .models import PayslipSnapshot
+
+
+def is_approved(payslip):
+    return bool(payslip.status and payslip.approved_at)
+
+
+def render_payslip(payslip, request):
+    """
+    PayslipSerializer output as the JSON text the API sends. Rendered with the request, like the
+    live responses, so media URLs such as profile_picture come out absolute in both.
+    """
+    from .serializers import PayslipSerializer
+    return JSONRenderer().render(PayslipSerializer(payslip, context={"request": request}).data).decode("utf-8")
+
+
+def content_etag(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def store_snapshot(payslip, request):
+    """Render and store the snapshot of an approved payslip."""
+    content = render_payslip(payslip, request)
+    snapshot, _ = PayslipSnapshot.objects.update_or_create(
+        payslip=payslip, defaults={"content": content, "etag": content_etag(content)}
+    )
+    return snapshot
+
+
+def get_snapshot(payslip, request):
+    """The stored snapshot of an approved payslip, rendering it first if it is missing; None otherwise."""
+    if not is_approved(payslip):
+        return None
+
+    snapshot = PayslipSnapshot.objects.filter(payslip=payslip).first()
+    return snapshot or store_snapshot(payslip, request)
+
+
+def invalidate_snapshots(payroll_ids=None, salary_ids=None):
+    """Drop the snapshots of payslips whose Payroll or Salary rows changed."""
+    snapshots = PayslipSnapshot.objects.none()
+    if payroll_ids:
+        snapshots |= PayslipSnapshot.objects.filter(payslip__payroll_id__in=payroll_ids)
+    if salary_ids:
+        snapshots |= PayslipSnapshot.objects.filter(payslip__payroll_id__salary_id__in=salary_ids)
+    return snapshots.delete()[0]
+
+
+def etag_response(request, content, etag):
+    """Serve pre-rendered JSON with a strong ETag, answering 304 when If-None-Match already matches."""
+    quoted = f'"{etag}"'
+    if_none_match = request.headers.get("If-None-Match", "")
+    # If-None-Match uses the weak comparison, so W/"..." matches too
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if quoted in candidates or "*" in candidates:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = quoted
+    return response
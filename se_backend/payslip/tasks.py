@@ -23,3 +23,23 @@ def generate_payslip_for_payroll(payroll_id):
     )
 
     return f"Payslip created for Payroll ID {payroll_id}."
+
+
+def create_missing_payslips(payrolls):
+    """Batch counterpart of generate_payslip_for_payroll for Payroll rows written with bulk operations."""
+    has_payslip = set(
+        Payslip.objects.filter(payroll_id__in=payrolls).values_list("payroll_id", flat=True)
+    )
+    payslips = [
+        Payslip(
+            user_id_id=payroll.user_id_id,
+            payroll_id=payroll,
+            status=False,
+            approved_at=None,
+            generated_at=None,
+            is_protected=True
+        )
+        for payroll in payrolls if payroll.id not in has_payslip
+    ]
+    Payslip.objects.bulk_create(payslips)
+    return len(payslips)
@@ -5,7 +5,17 @@ from deductions.models import Deductions
 from totalovertime.models import TotalOvertime
 from benefits.models import SSS, Philhealth, Pagibig
 from salary.models import Salary
+from payroll.models import Payroll
+from employment_info.models import EmploymentInfo
+from payslip.models import Payslip, PayslipSnapshot
+from shared.auth.serializers import LoginSerializer
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.utils import timezone
 from datetime import date
+import json
 
 class SalaryModelTestCase(TestCase):
 
@@ -68,3 +78,129 @@ class SalaryModelTestCase(TestCase):
     def test_delete_salary(self):
         self.salary.delete()
         self.assertEqual(Salary.objects.count(), 0)
+
+
+class PayslipFixtureMixin:
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email="payslips@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(self.user).access_token}")
+        self.related = {
+            "earnings_id": Earnings.objects.create(user=self.user, basic_rate=1000, basic=800, allowance=100),
+            "deductions_id": Deductions.objects.create(user=self.user, wtax=50),
+            "overtime_id": TotalOvertime.objects.create(user=self.user),
+            "sss_id": SSS.objects.create(user=self.user, basic_salary=800),
+            "philhealth_id": Philhealth.objects.create(user=self.user, basic_salary=800),
+            "pagibig_id": Pagibig.objects.create(user=self.user, basic_salary=800),
+        }
+
+    def _create_payslips(self, count):
+        # Bulk writes keep the payroll/payslip signals out of the fixture
+        salaries = Salary.objects.bulk_create([
+            Salary(user_id=self.user, pay_date=date(2025, 4, 15), **self.related) for _ in range(count)
+        ])
+        payrolls = Payroll.objects.bulk_create([
+            Payroll(user_id=self.user, salary_id=salary, pay_date=salary.pay_date) for salary in salaries
+        ])
+        Payslip.objects.bulk_create([Payslip(user_id=self.user, payroll_id=payroll) for payroll in payrolls])
+
+
+class PayslipQueryPlanTestCase(PayslipFixtureMixin, TestCase):
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response
+
+    def test_list_query_count_is_constant(self):
+        url = reverse("payslip:payslip-list")
+        self._create_payslips(1)
+        single, _ = self._count_queries(url)
+
+        self._create_payslips(499)
+        many, response = self._count_queries(url)
+
+        self.assertEqual(len(response.data), 500)
+        self.assertEqual(single, many)
+
+    def test_user_all_query_count_is_constant(self):
+        url = reverse("payslip:payslip-user-all", args=[self.user.id])
+        self._create_payslips(1)
+        single, _ = self._count_queries(url)
+
+        self._create_payslips(499)
+        many, response = self._count_queries(url)
+
+        self.assertEqual(len(json.loads(response.content)), 500)
+        self.assertEqual(single, many)
+
+
+class PayslipSnapshotTestCase(PayslipFixtureMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._create_payslips(1)
+        self.payslip = Payslip.objects.get()
+        self.url = reverse("payslip:payslip-detail", args=[self.payslip.id])
+
+    def _approve(self):
+        self.payslip.status = True
+        self.payslip.approved_at = timezone.now()
+        self.payslip.save()
+
+    def test_unapproved_payslip_has_no_snapshot(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(PayslipSnapshot.objects.exists())
+
+    def test_approved_payslip_is_served_from_snapshot_with_etag(self):
+        self._approve()
+        live = self.client.get(reverse("payslip:payslip-list")).data[0]
+
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertEqual(json.loads(response.content), json.loads(json.dumps(live)))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_snapshot_matches_live_response_with_profile_picture(self):
+        info = EmploymentInfo.objects.create(
+            employee_number=701, first_name="Juan", last_name="Dela Cruz", position="Staff", address="Manila",
+            hire_date=date(2024, 1, 1), active=True, profile_picture="profile_pictures/juan.png"
+        )
+        Payroll.objects.filter(id=self.payslip.payroll_id_id).update(employment_info_id=info)
+        self._approve()
+        live = json.loads(json.dumps(self.client.get(reverse("payslip:payslip-list")).data[0]))
+
+        snapshot = json.loads(self.client.get(self.url).content)
+        listed = json.loads(self.client.get(reverse("payslip:payslip-user-all", args=[self.user.id])).content)[0]
+
+        self.assertTrue(live["payroll_id"]["employment_info_id"]["profile_picture"].startswith("http://testserver/"))
+        self.assertEqual(snapshot, live)
+        self.assertEqual(listed, live)
+
+    def test_payroll_edit_invalidates_snapshot(self):
+        self._approve()
+        etag = self.client.get(self.url)["ETag"]
+
+        payroll = self.payslip.payroll_id
+        payroll.gross_pay = 1234
+        payroll.save()
+        self.assertFalse(PayslipSnapshot.objects.exists())
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(json.loads(response.content)["payroll_id"]["gross_pay"], "1234.00")
+
+    def test_salary_edit_invalidates_snapshot(self):
+        self._approve()
+        salary = self.payslip.payroll_id.salary_id
+        salary.pay_date = date(2025, 4, 30)
+        salary.save()
+        self.assertFalse(PayslipSnapshot.objects.exists())
@@ -6,11 +6,13 @@ from shared.generic_viewset import GenericViewset
 from shared.utils import role_required
 from .models import Payslip
 from .serializers import PayslipSerializer
+from .snapshots import content_etag, etag_response, get_snapshot, is_approved, render_payslip, store_snapshot
 
 class PayslipViewSet(GenericViewset):
     protected_views = ["create", "update", "partial_update", "retrieve", "destroy"]
     permissions = [IsAuthenticated]
     queryset = Payslip.objects.all()
+    owner_field = "user_id"  # Employees only see their own rows
     serializer_class = PayslipSerializer
 
     @role_required(["owner", "admin", "employee"])
@@ -20,8 +22,15 @@ class PayslipViewSet(GenericViewset):
 
     @role_required(["owner", "admin", "employee"])
     def retrieve(self, request, *args, **kwargs):
-        """Retrieve a specific Payslip record. Accessible by owners, admins, and employees."""
+        """
+        Retrieve a specific Payslip record. Accessible by owners, admins, and employees.
+        Approved payslips are served from their stored snapshot with an ETag.
+        """
         instance = self.get_object()
+        snapshot = get_snapshot(instance, request)
+        if snapshot is not None:
+            return etag_response(request, snapshot.content, snapshot.etag)
+
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -58,7 +67,20 @@ class PayslipViewSet(GenericViewset):
     @action(detail=False, methods=['get'], url_path='user-all/(?P<user_id>[^/.]+)')
     @role_required(["owner", "admin", "employee"])
     def user_all(self, request, user_id=None):
-        """Get all Payslips for a specific user."""
-        payslips = Payslip.objects.filter(user_id=user_id)
-        serializer = self.get_serializer(payslips, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        """
+        Get all Payslips for a specific user.
+        Approved payslips come from their snapshots; the response carries an ETag over the whole list.
+        """
+        payslips = self.get_queryset().filter(user_id=user_id).select_related("snapshot").order_by('id')
+
+        documents = []
+        for payslip in payslips:
+            if not is_approved(payslip):
+                documents.append(render_payslip(payslip, request))
+                continue
+
+            snapshot = getattr(payslip, "snapshot", None) or store_snapshot(payslip, request)
+            documents.append(snapshot.content)
+
+        content = "[" + ",".join(documents) + "]"
+        return etag_response(request, content, content_etag(content))
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('salary', '0002_salary_pagibig_id_salary_philhealth_id_salary_sss_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='salary',
+            index=models.Index(fields=['user_id', 'pay_date'], name='salary_sala_user_id_fd9056_idx'),
+        ),
+    ]
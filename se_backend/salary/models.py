@@ -17,5 +17,10 @@ class Salary(models.Model):
     pagibig_id = models.ForeignKey(Pagibig, on_delete=models.CASCADE, null=True)
     pay_date = models.DateField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user_id", "pay_date"]),
+        ]
+
     def __str__(self):
         return f"{self.id} - {self.user_id} - {self.user_id.email}"
\ No newline at end of file
@@ -1,4 +1,7 @@
 from celery import shared_task
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.utils.timezone import now
 from datetime import datetime, timedelta
 import logging
@@ -13,87 +16,115 @@ from schedule.models import Schedule
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Only the most recent overtime periods of a user are turned into salaries
+OVERTIME_PERIODS_PER_USER = 2
+
+
+def compute_pay_date(payroll_period_end):
+    """Pay date for a payroll period: the 15th for periods ending before it, otherwise the month's last day."""
+    if payroll_period_end.day < 15:
+        # If before the 15th, pay date is the 15th of the same month
+        return datetime(payroll_period_end.year, payroll_period_end.month, 15).date()
+
+    # If on or after the 15th, pay date is the last day of the month
+    next_month = datetime(payroll_period_end.year, payroll_period_end.month, 1) + timedelta(days=32)
+    return (next_month.replace(day=1) - timedelta(days=1)).date()
+
+
+def latest_ids(model, user_ids):
+    """{user_id: id of the user's newest row} in one DISTINCT ON query."""
+    return dict(
+        model.objects.filter(user_id__in=user_ids)
+        .order_by("user_id", "-id").distinct("user_id")
+        .values_list("user_id", "id")
+    )
+
 
 @shared_task
 def generate_salary_entries():
+    """
+    Create the missing Salary rows for every active user's latest overtime periods.
+    Every lookup is one set-wide query (DISTINCT ON / window functions), so the query count does not
+    grow with headcount. New salaries are bulk created and their payrolls computed in one batch.
+    """
+    from payroll.tasks import generate_payrolls_for_salaries
+
     today = now().date()
     logger.info(f"Starting salary entry generation process on {today}")
-    users = CustomUser.objects.filter(is_active=True)
-    logger.info(f"Found {users.count()} active users.")
-
-    for user in users:
-        logger.info(f"Processing salary for user: {user.id} - {user.email}")
-
-        latest_earnings = Earnings.objects.filter(user=user).order_by('-id').first()
-        latest_deductions = Deductions.objects.filter(user=user).order_by('-id').first()
-        latest_sss = SSS.objects.filter(user=user).order_by('-id').first()
-        latest_philhealth = Philhealth.objects.filter(user=user).order_by('-id').first()
-        latest_pagibig = Pagibig.objects.filter(user=user).order_by('-id').first()
-
-        if not latest_earnings:
-            logger.warning(f"No earnings found for user: {user.id}")
-        if not latest_deductions:
-            logger.warning(f"No deductions found for user: {user.id}")
-        if not latest_sss:
-            logger.warning(f"No sss found for user: {user.id}")
-        if not latest_philhealth:
-            logger.warning(f"No philhealth found for user: {user.id}")
-        if not latest_pagibig:
-            logger.warning(f"No pagibig found for user: {user.id}")
-
-        overtime_entries = TotalOvertime.objects.filter(user=user).order_by('-biweek_start')[:2]
-        logger.info(f"Found {overtime_entries.count()} overtime entries for user: {user.id}")
-
-        for overtime in overtime_entries:
-            biweek_start = overtime.biweek_start
-
-            # Find the schedule with the matching bi_weekly_start
-            try:
-                schedule = Schedule.objects.filter(
-                    user_id=user,
-                    bi_weekly_start=biweek_start
-                ).first()
-
-                if not schedule:
-                    logger.warning(f"No schedule found for user {user.id} with bi_weekly_start {biweek_start}")
-                    continue
-
-                payroll_period_end = schedule.payroll_period_end
-                if not payroll_period_end:
-                    logger.warning(f"Schedule for user {user.id} has no payroll_period_end")
-                    continue
-
-                # Determine pay date based on payroll_period_end
-                if payroll_period_end.day < 15:
-                    # If before the 15th, pay date is the 15th of the same month
-                    pay_date = datetime(payroll_period_end.year, payroll_period_end.month, 15).date()
-                else:
-                    # If on or after the 15th, pay date is the last day of the month
-                    next_month = datetime(payroll_period_end.year, payroll_period_end.month, 1) + timedelta(days=32)
-                    pay_date = next_month.replace(day=1) - timedelta(days=1)
-
-                logger.info(
-                    f"Determined pay date {pay_date} for user: {user.id} (payroll period end: {payroll_period_end})")
-
-            except Exception as e:
-                logger.error(f"Error determining pay date for user {user.id}: {str(e)}")
-                continue
-
-            if Salary.objects.filter(user_id=user.id, pay_date=pay_date).exists():
-                logger.info(f"Salary entry already exists for user: {user.id} on {pay_date}. Skipping.")
-                continue
-
-            Salary.objects.create(
-                user_id=user,
-                earnings_id=latest_earnings,
-                deductions_id=latest_deductions,
-                overtime_id=overtime,
-                sss_id=latest_sss,
-                philhealth_id=latest_philhealth,
-                pagibig_id=latest_pagibig,
-                pay_date=pay_date
-            )
-            logger.info(f"Salary entry created for user: {user.id} on {pay_date}")
-
-    logger.info("Salary entry generation process completed.")
-    return "Salary entries checked and generated."
\ No newline at end of file
+    user_ids = list(CustomUser.objects.filter(is_active=True).values_list("id", flat=True))
+    logger.info(f"Found {len(user_ids)} active users.")
+
+    latest = {
+        "earnings_id_id": latest_ids(Earnings, user_ids),
+        "deductions_id_id": latest_ids(Deductions, user_ids),
+        "sss_id_id": latest_ids(SSS, user_ids),
+        "philhealth_id_id": latest_ids(Philhealth, user_ids),
+        "pagibig_id_id": latest_ids(Pagibig, user_ids),
+    }
+    for field, ids in latest.items():
+        missing = len(user_ids) - len(ids)
+        if missing:
+            logger.warning(f"No {field[:-6]} found for {missing} users.")
+
+    overtime_entries = list(
+        TotalOvertime.objects.filter(user_id__in=user_ids)
+        .annotate(rank=Window(RowNumber(), partition_by=F("user_id"), order_by=F("biweek_start").desc()))
+        .filter(rank__lte=OVERTIME_PERIODS_PER_USER)
+        .order_by("user_id", "rank")
+        .values_list("user_id", "id", "biweek_start")
+    )
+    logger.info(f"Found {len(overtime_entries)} overtime entries.")
+
+    # The first schedule (by id) of each (user, bi_weekly_start), like Schedule...first()
+    period_ends = {
+        (user_id, start): end
+        for user_id, start, end in Schedule.objects.filter(
+            user_id__in={user_id for user_id, _, _ in overtime_entries},
+            bi_weekly_start__in={start for _, _, start in overtime_entries if start is not None},
+        ).order_by("user_id", "bi_weekly_start", "id").distinct("user_id", "bi_weekly_start")
+        .values_list("user_id", "bi_weekly_start", "payroll_period_end")
+    }
+
+    candidates = []
+    for user_id, overtime_id, biweek_start in overtime_entries:
+        if (user_id, biweek_start) not in period_ends:
+            logger.warning(f"No schedule found for user {user_id} with bi_weekly_start {biweek_start}")
+            continue
+
+        payroll_period_end = period_ends[(user_id, biweek_start)]
+        if not payroll_period_end:
+            logger.warning(f"Schedule for user {user_id} has no payroll_period_end")
+            continue
+
+        candidates.append((user_id, overtime_id, compute_pay_date(payroll_period_end)))
+
+    existing = set(
+        Salary.objects.filter(
+            user_id__in={user_id for user_id, _, _ in candidates},
+            pay_date__in={pay_date for _, _, pay_date in candidates},
+        ).values_list("user_id", "pay_date")
+    )
+
+    salaries = []
+    for user_id, overtime_id, pay_date in candidates:
+        if (user_id, pay_date) in existing:
+            logger.info(f"Salary entry already exists for user: {user_id} on {pay_date}. Skipping.")
+            continue
+
+        existing.add((user_id, pay_date))
+        salaries.append(Salary(
+            user_id_id=user_id,
+            overtime_id_id=overtime_id,
+            pay_date=pay_date,
+            **{field: ids.get(user_id) for field, ids in latest.items()}
+        ))
+
+    with transaction.atomic():
+        Salary.objects.bulk_create(salaries)
+        salary_ids = [salary.id for salary in salaries]
+        if salary_ids:
+            # bulk_create skips payroll.signals.trigger_payroll_task; compute the new payrolls in one batch
+            transaction.on_commit(lambda: generate_payrolls_for_salaries.delay(salary_ids))
+
+    logger.info(f"Salary entry generation process completed: {len(salaries)} created.")
+    return f"Salary entries checked and generated: {len(salaries)} created."
@@ -5,7 +5,12 @@ from deductions.models import Deductions
 from totalovertime.models import TotalOvertime
 from benefits.models import SSS, Philhealth, Pagibig
 from salary.models import Salary
+from salary.tasks import generate_salary_entries
+from schedule.models import Schedule
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from datetime import date
+from decimal import Decimal
 
 class SalaryModelTestCase(TestCase):
 
@@ -68,3 +73,41 @@ class SalaryModelTestCase(TestCase):
     def test_delete_salary(self):
         self.salary.delete()
         self.assertEqual(Salary.objects.count(), 0)
+
+
+class GenerateSalaryEntriesTestCase(TestCase):
+
+    def _employee(self, number):
+        user = CustomUser.objects.create_user(email=f"salary{number}@example.com", password="password", role="employee")
+        Earnings.objects.create(user=user, basic_rate=Decimal("1000.00"), basic=Decimal("800.00"), allowance=Decimal("100.00"))
+        Deductions.objects.create(user=user, wtax=Decimal("50.00"))
+        for start, end in ((date(2025, 3, 16), date(2025, 3, 31)), (date(2025, 4, 1), date(2025, 4, 14)),
+                           (date(2025, 2, 1), date(2025, 2, 14))):
+            Schedule.objects.create(user_id=user, bi_weekly_start=start, payroll_period_start=start,
+                                    payroll_period_end=end, hours=0)
+            TotalOvertime.objects.create(user=user, biweek_start=start)
+        return user
+
+    def test_creates_salaries_for_the_latest_periods(self):
+        user = self._employee(1)
+        generate_salary_entries()
+
+        salaries = Salary.objects.filter(user_id=user).order_by("pay_date")
+        self.assertEqual([s.pay_date for s in salaries], [date(2025, 3, 31), date(2025, 4, 15)])
+        latest_earnings = Earnings.objects.filter(user=user).latest("id")
+        self.assertTrue(all(s.earnings_id == latest_earnings for s in salaries))
+        self.assertTrue(all(s.sss_id == SSS.objects.filter(user=user).latest("id") for s in salaries))
+
+        generate_salary_entries()
+        self.assertEqual(Salary.objects.filter(user_id=user).count(), 2)
+
+    def test_query_count_does_not_grow_with_headcount(self):
+        self._employee(1)
+        with CaptureQueriesContext(connection) as small:
+            generate_salary_entries()
+        for number in range(2, 6):
+            self._employee(number)
+        with CaptureQueriesContext(connection) as large:
+            generate_salary_entries()
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
@@ -12,6 +12,7 @@ class SalaryViewSet(GenericViewset):
     protected_views = ["create", "update", "partial_update", "retrieve", "destroy"]
     permissions = [IsAuthenticated]
     queryset = Salary.objects.all()
+    owner_field = "user_id"  # Employees only see their own rows
     serializer_class = SalarySerializer
 
     @role_required(["owner", "admin", "employee"])
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0004_remove_schedule_payroll_period_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['user_id', 'payroll_period_start', 'payroll_period_end'], name='schedule_sc_user_id_967e0f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['user_id', 'bi_weekly_start'], name='schedule_sc_user_id_073535_idx'),
+        ),
+    ]
@@ -32,5 +32,12 @@ class Schedule(models.Model):
     bi_weekly_start = models.DateField()
     restday = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # "Schedule covering this date" lookups of the attendance signals and aggregation
+            models.Index(fields=["user_id", "payroll_period_start", "payroll_period_end"]),
+            models.Index(fields=["user_id", "bi_weekly_start"]),
+        ]
+
     def __str__(self):
         return f"Schedule {self.id} for User {self.user_id}"
\ No newline at end of file
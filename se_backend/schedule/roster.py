@@ -0,0 +1,90 @@
+import logging
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import serializers
+
+from shift.models import Shift
+from .models import Schedule
+
+logger = logging.getLogger(__name__)
+
+ScheduleShift = Schedule.shift_ids.through
+
+BULK_BATCH_SIZE = 1000
+
+
+def apply_roster(entries):
+    """
+    Apply validated RosterEntrySerializer data in one transaction: create the new shifts, link and
+    unlink shifts through set-based writes on the Schedule.shift_ids table, and request a single
+    recompute of the affected (user, payroll period) pairs.
+
+    Bulk writes skip the per-schedule m2m_changed and post_save receivers, so the shift index is
+    invalidated and the recompute requested here instead.
+    """
+    from attendance.recompute import request_recompute
+    from attendance.shift_index import invalidate_shift_index
+
+    schedule_ids = {entry["schedule"] for entry in entries}
+    linked_ids = {shift_id for entry in entries
+                  for shift_id in entry.get("add_shift_ids", []) + entry.get("remove_shift_ids", [])}
+
+    with transaction.atomic():
+        schedules = Schedule.objects.in_bulk(schedule_ids)
+        known_shifts = set(Shift.objects.filter(id__in=linked_ids).values_list("id", flat=True))
+
+        errors = {}
+        for index, entry in enumerate(entries):
+            missing = [shift_id for shift_id in entry.get("add_shift_ids", []) + entry.get("remove_shift_ids", [])
+                       if shift_id not in known_shifts]
+            if entry["schedule"] not in schedules:
+                errors[index] = {"schedule": f"Schedule {entry['schedule']} does not exist."}
+            elif missing:
+                errors[index] = {"shift_ids": f"Shifts {missing} do not exist."}
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        new_shifts = []
+        new_owners = []
+        for entry in entries:
+            for data in entry.get("shifts", []):
+                new_shifts.append(Shift(**data))
+                new_owners.append(entry["schedule"])
+        Shift.objects.bulk_create(new_shifts, batch_size=BULK_BATCH_SIZE)
+
+        links = [ScheduleShift(schedule_id=schedule_id, shift_id=shift.id)
+                 for shift, schedule_id in zip(new_shifts, new_owners)]
+        links += [ScheduleShift(schedule_id=entry["schedule"], shift_id=shift_id)
+                  for entry in entries for shift_id in entry.get("add_shift_ids", [])]
+        # ignore_conflicts drops links that already exist without saying which, so count the rows it added
+        linked = ScheduleShift.objects.filter(schedule_id__in=schedule_ids)
+        links_before = linked.count()
+        ScheduleShift.objects.bulk_create(links, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+        links_added = linked.count() - links_before
+
+        removals = [Q(schedule_id=entry["schedule"], shift_id__in=entry["remove_shift_ids"])
+                    for entry in entries if entry.get("remove_shift_ids")]
+        removed = ScheduleShift.objects.filter(reduce(or_, removals)).delete()[0] if removals else 0
+
+        invalidate_shift_index()
+        periods = {(schedules[schedule_id].user_id_id, schedules[schedule_id].payroll_period_start)
+                   for schedule_id in schedule_ids}
+        request_recompute(periods)
+
+    created_shift_ids = {}
+    for shift, schedule_id in zip(new_shifts, new_owners):
+        created_shift_ids.setdefault(schedule_id, []).append(shift.id)
+
+    stats = {
+        "schedules": len(schedule_ids),
+        "shifts_created": len(new_shifts),
+        "links_added": links_added,
+        "links_removed": removed,
+        "periods_recomputed": len(periods),
+        "created_shift_ids": created_shift_ids,
+    }
+    logger.info(f"[apply_roster] {({key: value for key, value in stats.items() if key != 'created_shift_ids'})}")
+    return stats
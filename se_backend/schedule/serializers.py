@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import Schedule
 from shift.models import Shift
+from shift.serializers import ShiftSerializer as ShiftWriteSerializer
 
 
 class ShiftSerializer(serializers.ModelSerializer):
@@ -22,3 +23,15 @@ class ScheduleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Schedule
         fields = '__all__'
+
+
+class RosterEntrySerializer(serializers.Serializer):
+    """
+    One schedule's part of a roster: new shifts to create and link, and existing shift ids to link or unlink.
+    Ids are plain integers, checked in bulk by schedule.roster.apply_roster.
+    """
+
+    schedule = serializers.IntegerField()
+    shifts = ShiftWriteSerializer(many=True, required=False)
+    add_shift_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    remove_shift_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
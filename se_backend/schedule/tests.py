@@ -4,7 +4,13 @@ from schedule.models import Schedule
 from attendance_summary.signals import handle_schedule_update  # Assuming this is where the signal is defined
 from users.models import CustomUser
 from shift.models import Shift
-from datetime import date
+from datetime import date, timedelta
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from shared.auth.serializers import LoginSerializer
 
 
 class ScheduleModelTestCase(TestCase):
@@ -103,3 +109,65 @@ class ScheduleModelTestCase(TestCase):
         self.assertEqual(updated_schedule.nightdiff, [date(2025, 4, 10)])
         self.assertEqual(updated_schedule.oncall, [date(2025, 4, 11)])
         self.assertEqual(updated_schedule.vacationleave, [date(2025, 4, 12)])
+
+
+class ScheduleRosterTestCase(TestCase):
+    def setUp(self):
+        owner = CustomUser.objects.create_user(email="roster@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(owner).access_token}")
+        self.url = reverse("schedule:schedule-roster")
+        self.start = date(2025, 4, 1)
+        self.schedules = [
+            Schedule.objects.create(
+                user_id=CustomUser.objects.create_user(email=f"rostered{n}@example.com", password="password",
+                                                       role="employee"),
+                payroll_period_start=self.start, payroll_period_end=date(2025, 4, 15),
+                bi_weekly_start=self.start, hours=0,
+            )
+            for n in range(3)
+        ]
+        self.existing = Shift.objects.create(date=self.start, shift_start="09:00", shift_end="18:00", expected_hours=8)
+        self.schedules[0].shift_ids.add(self.existing)
+
+    def _two_weeks(self):
+        return [{"date": str(self.start + timedelta(days=offset)), "shift_start": "09:00", "shift_end": "18:00"}
+                for offset in range(1, 15)]
+
+    @mock.patch("attendance.recompute.request_recompute")
+    def test_roster_links_shifts_with_one_recompute(self, request_recompute):
+        payload = [
+            {"schedule": self.schedules[0].id, "shifts": self._two_weeks()},
+            {"schedule": self.schedules[1].id, "shifts": self._two_weeks(), "add_shift_ids": [self.existing.id]},
+            {"schedule": self.schedules[2].id, "add_shift_ids": [self.existing.id]},
+            # Already linked in setUp
+            {"schedule": self.schedules[0].id, "add_shift_ids": [self.existing.id]},
+        ]
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["shifts_created"], 28)
+        self.assertEqual(response.data["links_added"], 30)
+        self.assertEqual([schedule.shift_ids.count() for schedule in self.schedules], [15, 15, 1])
+        self.assertEqual(Shift.objects.get(id=response.data["created_shift_ids"][self.schedules[0].id][0]).expected_hours, 8)
+        request_recompute.assert_called_once_with({(schedule.user_id_id, self.start) for schedule in self.schedules})
+
+    def test_roster_removes_shifts(self):
+        response = self.client.post(
+            self.url, [{"schedule": self.schedules[0].id, "remove_shift_ids": [self.existing.id]}], format="json"
+        )
+
+        self.assertEqual(response.data["links_removed"], 1)
+        self.assertFalse(self.schedules[0].shift_ids.exists())
+
+    def test_unknown_ids_reject_the_whole_roster(self):
+        payload = [
+            {"schedule": self.schedules[0].id, "shifts": self._two_weeks()},
+            {"schedule": self.schedules[1].id, "add_shift_ids": [self.existing.id + 1000]},
+        ]
+
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Shift.objects.count(), 1)
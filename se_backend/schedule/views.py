@@ -1,15 +1,18 @@
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
 from rest_framework import status
 from rest_framework.response import Response
 from shared.generic_viewset import GenericViewset
 from shared.utils import role_required
 from .models import Schedule
-from .serializers import ScheduleSerializer
+from .roster import apply_roster
+from .serializers import RosterEntrySerializer, ScheduleSerializer
 
 class ScheduleViewSet(GenericViewset):
-    protected_views = ["create", "update", "partial_update", "retrieve", "destroy"]
+    protected_views = ["create", "update", "partial_update", "retrieve", "destroy", "roster"]
     permissions = [IsAuthenticated]
     queryset = Schedule.objects.all()
+    owner_field = "user_id"  # Employees only see their own rows
     serializer_class = ScheduleSerializer
 
     @role_required(["owner", "admin", "employee"])
@@ -69,3 +72,16 @@ class ScheduleViewSet(GenericViewset):
         instance = self.get_object()
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=["post"], url_path="roster")
+    @role_required(["owner", "admin"])
+    def roster(self, request, *args, **kwargs):
+        """
+        Assign shifts to many schedules at once. The body is a list of
+        {"schedule": id, "shifts": [new shifts], "add_shift_ids": [...], "remove_shift_ids": [...]};
+        everything is applied in one transaction with a single recompute of the affected payroll periods.
+        """
+        serializer = RosterEntrySerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        stats = apply_roster(serializer.validated_data)
+        return Response(stats, status=status.HTTP_201_CREATED)
@@ -24,27 +24,48 @@ app.conf.beat_schedule = {
         # "schedule": crontab(minute=0, hour="*"),
         "schedule": crontab(minute=30, hour=12),  # run every 12:30 pm
     },
+    "generate-payrolls-for-pay-date": {
+        # Whole pay-date batch for today's salaries, after generate_salary_entries; unchanged payrolls are not written
+        "task": "payroll.tasks.generate_payrolls_for_pay_date",
+        "schedule": crontab(minute=45, hour=12),
+    },
     "calculate_total_payroll": {
         "task": "totalpayroll.tasks.calculate_total_payroll",
          "schedule": crontab(minute="*/5"), # every 5 mins
     },
-    "sync-holidays-daily": {
-        'task': 'master_calendar.tasks.sync_holidays_for_new_calendar_entries',
-        #'schedule': crontab(hour=0, minute=0),
-        # "schedule": crontab(minute="*"),
+    "sync-holiday-changes": {
+        # Change-tracked: a no-op unless holidays were modified or deleted since the last run
+        'task': 'master_calendar.tasks.sync_holiday_changes',
         "schedule": crontab(minute="*/5"), # every 5 mins
     },
     "full-holiday-sync-weekly": {
+        # Reconciliation sweep; only schedules whose arrays differ are written
         'task': 'master_calendar.tasks.update_schedule_holidays',
-        #'schedule': crontab(day_of_week=0, hour=1, minute=0),
-        # "schedule": crontab(minute="*"),
-        "schedule": crontab(minute="*/5"),  # every 5 mins
+        'schedule': crontab(day_of_week=0, hour=1, minute=0),
     },
     'create-biweekly-schedules': {
         'task': 'schedule.tasks.create_biweekly_schedules',
         #'schedule': crontab(day_of_week=1, hour=0, minute=0),
         "schedule": crontab(minute="*"),
     },
+    "flush-attendance-recomputes": {
+        # Safety net for queued recomputes whose countdown task was lost, e.g. on a worker restart
+        "task": "attendance.tasks.flush_attendance_recomputes",
+        "schedule": crontab(minute="*"),
+    },
+    "flush-audit-events": {
+        # Drains the audit events buffered in Redis (activity_log.audit) that no full batch flushed yet
+        "task": "activity_log.tasks.flush_audit_events",
+        "schedule": crontab(minute="*"),
+    },
+    "archive-audit-events-monthly": {
+        "task": "activity_log.tasks.archive_old_audit_events",
+        "schedule": crontab(day_of_month=1, hour=2, minute=0),
+    },
+    "prune-audit-events-nightly": {
+        "task": "activity_log.tasks.prune_audit_events",
+        "schedule": crontab(hour=3, minute=0),
+    },
 
 }
 
@@ -230,6 +230,51 @@ CELERY_RESULT_BACKEND = "redis://redis:6379/0"
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 
+# Attendance summary recompute queue (attendance.recompute). Writes within this many seconds
+# of each other collapse into one recompute per (user, payroll period); 0 recomputes inline.
+RECOMPUTE_DEBOUNCE_SECONDS = config("RECOMPUTE_DEBOUNCE_SECONDS", default=0, cast=int)
+RECOMPUTE_QUEUE_URL = config("RECOMPUTE_QUEUE_URL", default=CELERY_BROKER_URL)
+
+# Raw JWTs whose verified claims are memoized by shared.utils.decode_token_claims; 0 disables the cache
+JWT_CLAIMS_CACHE_SIZE = config("JWT_CLAIMS_CACHE_SIZE", default=256, cast=int)
+
+# Seconds a process keeps its copy of the contribution rate tables (benefits.rates) before
+# reloading them; saves in the same process invalidate it at once. 0 keeps it until invalidated.
+CONTRIBUTION_RATES_CACHE_SECONDS = config("CONTRIBUTION_RATES_CACHE_SECONDS", default=300, cast=int)
+
+# Audit trail (activity_log.audit). Derived models are written by the signal cascade and Celery,
+# never directly by a user; their writes, and every write made outside a request, are recorded
+# for AUDIT_SYSTEM_SAMPLE_RATE of them only (0 stops auditing the derived models altogether).
+AUDIT_SYSTEM_MODELS = [
+    "attendance_summary.AttendanceSummary",
+    "overtimehours.OvertimeHours",
+    "benefits.SSS",
+    "benefits.Philhealth",
+    "benefits.Pagibig",
+    "payroll.Payroll",
+    "payslip.PayslipSnapshot",
+]
+AUDIT_SYSTEM_SAMPLE_RATE = config("AUDIT_SYSTEM_SAMPLE_RATE", default=0.0, cast=float)
+# With AUDIT_BUFFER_ENABLED, events are queued in Redis and written in batches by Celery
+AUDIT_BUFFER_ENABLED = config("AUDIT_BUFFER_ENABLED", default=False, cast=bool)
+AUDIT_QUEUE_URL = config("AUDIT_QUEUE_URL", default=CELERY_BROKER_URL)
+AUDIT_FLUSH_BATCH_SIZE = config("AUDIT_FLUSH_BATCH_SIZE", default=500, cast=int)
+# Whole months of CRUDEvent kept in the live table; older ones move to the monthly archive
+AUDIT_HOT_MONTHS = config("AUDIT_HOT_MONTHS", default=3, cast=int)
+# Nightly retention (activity_log.tasks.prune_audit_events): events older than this many days are
+# deleted, at most AUDIT_PRUNE_MAX_CHUNKS chunks per night; 0 keeps every event
+AUDIT_RETENTION_DAYS = config("AUDIT_RETENTION_DAYS", default=365, cast=int)
+AUDIT_PRUNE_MAX_CHUNKS = config("AUDIT_PRUNE_MAX_CHUNKS", default=200, cast=int)
+
+DJANGO_EASY_AUDIT_LOGGING_BACKEND = "activity_log.audit.BufferedAuditBackend"
+DJANGO_EASY_AUDIT_CRUD_DIFFERENCE_CALLBACKS = ["activity_log.audit.should_record_write"]
+DJANGO_EASY_AUDIT_CRUD_EVENT_NO_CHANGED_FIELDS_SKIP = True
+DJANGO_EASY_AUDIT_UNREGISTERED_CLASSES_EXTRA = [] if AUDIT_SYSTEM_SAMPLE_RATE else list(AUDIT_SYSTEM_MODELS)
+
+# ZKTeco biometric device
+ZKTECO_IP = config("ZKTECO_IP", default="192.168.1.201")
+ZKTECO_PORT = config("ZKTECO_PORT", default=4370, cast=int)
+
 RESEND_API_KEY = config("RESEND_API_KEY")
 RESEND_HOST = config("RESEND_HOST")
 
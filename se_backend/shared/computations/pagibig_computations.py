@@ -1,14 +1,29 @@
+from datetime import date
 from decimal import Decimal
+from types import MappingProxyType
 
-def compute_pagibig_contribution():
+# Version of the amount below: the date it took effect
+PAGIBIG_EFFECTIVE = date(2025, 1, 1)
 
-    employee_share = Decimal(200) /2
-    employer_share = Decimal(200) /2
+# Fixed monthly contribution, split evenly between employee and employer
+PAGIBIG_TOTAL = Decimal(200)
 
-    total_contribution =  employee_share + employer_share
 
-    return {
-        "Employee Share": Decimal(employee_share),
-        "Employer Share": Decimal(employer_share),
-        "Total Contribution": Decimal(total_contribution),
-    }
\ No newline at end of file
+def build_pagibig_contribution(total):
+    return MappingProxyType({
+        "Employee Share": total / 2,
+        "Employer Share": total / 2,
+        "Total Contribution": total / 2 + total / 2,
+    })
+
+
+PAGIBIG_CONTRIBUTION = build_pagibig_contribution(PAGIBIG_TOTAL)
+
+
+def compute_pagibig_contribution(contribution=PAGIBIG_CONTRIBUTION):
+    return dict(contribution)
+
+
+def compute_pagibig_contributions(count, contribution=PAGIBIG_CONTRIBUTION):
+    """compute_pagibig_contribution for `count` employees at once; the amount does not depend on salary."""
+    return [dict(contribution) for _ in range(count)]
@@ -1,11 +1,25 @@
+from datetime import date
 from decimal import Decimal
 
-def compute_philhealth_contribution(basic_salary):
+# Version of the rate below: the date it took effect
+PHILHEALTH_RATE_EFFECTIVE = date(2025, 1, 1)
+
+# 5% premium, split evenly between employee and employer (kept as the binary float value
+# the contribution has always been computed with)
+PHILHEALTH_RATE = Decimal(.05)
+
+
+def compute_philhealth_contribution(basic_salary, rate=PHILHEALTH_RATE):
 
     basic_salary = Decimal(basic_salary)
-    total_contribution = basic_salary * Decimal(.05) / 2
+    total_contribution = basic_salary * rate / 2
 
     return {
-        "Basic Salary": Decimal(basic_salary),
-        "Total Contribution": Decimal(total_contribution),
+        "Basic Salary": basic_salary,
+        "Total Contribution": total_contribution,
     }
+
+
+def compute_philhealth_contributions(basic_salaries, rate=PHILHEALTH_RATE):
+    """compute_philhealth_contribution for many salaries at once, in order."""
+    return [compute_philhealth_contribution(basic_salary, rate) for basic_salary in basic_salaries]
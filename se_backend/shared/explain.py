@@ -0,0 +1,28 @@
+import json
+
+INDEX_SCAN_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def plan_nodes(plan):
+    """Walk an EXPLAIN (FORMAT JSON) plan tree depth-first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def scan_nodes(queryset):
+    """(node type, index name or None) of every scan Postgres plans for `queryset`."""
+    [explained] = json.loads(queryset.explain(format="json"))
+    return [
+        (node["Node Type"], node.get("Index Name"))
+        for node in plan_nodes(explained["Plan"])
+        if node["Node Type"].endswith("Scan")
+    ]
+
+
+def uses_index_scan(queryset):
+    """True when every table of the plan is read through an index."""
+    scans = scan_nodes(queryset)
+    return bool(scans) and all(
+        node_type in INDEX_SCAN_NODES or node_type == "Bitmap Heap Scan" for node_type, _ in scans
+    )
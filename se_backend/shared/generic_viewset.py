@@ -1,10 +1,20 @@
 from django.core.paginator import Paginator
+from django.http import StreamingHttpResponse
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+import json
+
+from shared.pagination import KeysetPagination
+from shared.scoping import OwnerScopedQuerysetMixin
+
+# Rows fetched and serialized per round trip when a list is streamed
+STREAM_CHUNK_SIZE = 500
 
 
 class GenericViewset(
+    OwnerScopedQuerysetMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -14,6 +24,9 @@ class GenericViewset(
     include_list_view = True  # Add this line
     protected_views = []
     permissions = [AllowAny]  # Default permission
+    # Query plan; when left empty, the serializer's select_related_fields / prefetch_related_fields apply
+    select_related_fields = ()
+    prefetch_related_fields = ()
 
     def get_protected_views(self):
         """
@@ -32,6 +45,19 @@ class GenericViewset(
             return list(all_actions)
         return self.protected_views
 
+    def get_queryset(self):
+        """Base queryset with the declared query plan applied, so nested serializers don't load relations row by row."""
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+
+        select_related = self.select_related_fields or getattr(serializer_class, "select_related_fields", ())
+        prefetch_related = self.prefetch_related_fields or getattr(serializer_class, "prefetch_related_fields", ())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
     def get_permissions(self):
         protected_views = self.get_protected_views()
         if self.action in protected_views:
@@ -45,17 +71,40 @@ class GenericViewset(
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.order_by('id')  # Optional sorting
 
-        # limit = int(request.query_params.get("limit", 100))
-        # page_number = int(request.query_params.get("page", 1))
-        # paginator = Paginator(queryset, limit)
-        # page = paginator.get_page(page_number)
+        # Opt-in modes; without them the whole list is returned as before
+        if request.query_params.get("stream") in ("1", "true"):
+            return self.stream_list(queryset)
+
+        if "cursor" in request.query_params or "limit" in request.query_params:
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            serializer = self.get_serializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
-        # return Response({
-        #     "count": paginator.count,
-        #     "num_pages": paginator.num_pages,
-        #     "current_page": page_number,
-        #     "results": serializer.data,
-        # })
\ No newline at end of file
+    def stream_list(self, queryset):
+        """
+        Stream the list as one JSON array, serializing STREAM_CHUNK_SIZE rows at a time from a
+        server-side cursor, so memory stays flat however many rows there are.
+        """
+        def chunks():
+            yield "["
+            separator = ""
+            batch = []
+            for instance in queryset.iterator(chunk_size=STREAM_CHUNK_SIZE):
+                batch.append(instance)
+                if len(batch) == STREAM_CHUNK_SIZE:
+                    yield separator + self._encode_rows(batch)
+                    separator = ","
+                    batch = []
+            if batch:
+                yield separator + self._encode_rows(batch)
+            yield "]"
+
+        return StreamingHttpResponse(chunks(), content_type="application/json")
+
+    def _encode_rows(self, instances):
+        rows = self.get_serializer(instances, many=True).data
+        return ",".join(json.dumps(row, cls=JSONEncoder) for row in rows)
@@ -0,0 +1,51 @@
+import time
+
+import jwt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from shared.auth.serializers import LoginSerializer
+from shared.utils import clear_token_claims_cache, decode_token_claims, get_role_from_token
+from users.models import CustomUser
+
+
+def legacy_role(request):
+    """Role lookup as role_required did it before: parse the header and verify the token again."""
+    token = request.headers.get("Authorization").split(" ")[1]
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]).get("role")
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-request JWT authentication plus role resolution. All writes are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--checks", type=int, default=1, help="role_required checks per request.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(email="bench-auth@example.com", password="password", role="owner")
+            header = f"Bearer {LoginSerializer.get_token(user).access_token}"
+            factory = APIRequestFactory()
+            authenticator = JWTAuthentication()
+
+            def run(label, resolve):
+                clear_token_claims_cache()
+                started = time.perf_counter()
+                for _ in range(options["requests"]):
+                    request = Request(factory.get("/", HTTP_AUTHORIZATION=header), authenticators=[authenticator])
+                    request.user  # Authenticate like DRF's initial() does
+                    for _ in range(options["checks"]):
+                        resolve(request)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"{label}: {elapsed / options['requests'] * 1e6:,.1f} µs/request")
+
+            run("before (header + jwt.decode)", legacy_role)
+            run("after (request.auth)", get_role_from_token)
+            run("after (signature LRU)", lambda request: decode_token_claims(header.split(" ")[1]).get("role"))
+
+            transaction.set_rollback(True)
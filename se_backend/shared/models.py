@@ -16,3 +16,70 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class DirtyFieldsMixin:
+    """
+    Remembers the column values a row was loaded with (or last saved with), so that save() writes
+    only the columns that changed and skips an unchanged row entirely: no UPDATE, no post_save,
+    and so no downstream recompute or audit event. Inserts and force_insert saves are untouched.
+    Mix in before models.Model.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_values = instance._current_values()
+        return instance
+
+    def _current_values(self, fields=None):
+        # Deferred columns are not in __dict__ and are left out rather than loaded
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__ and (fields is None or field.name in fields or field.attname in fields)
+        }
+
+    def get_dirty_fields(self):
+        """Names of the concrete fields whose value differs from the stored one; every field for a new row."""
+        stored = getattr(self, "_stored_values", None)
+        current = self._current_values()
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.attname in current and (
+                stored is None or field.attname not in stored or stored[field.attname] != current[field.attname]
+            )
+        ]
+
+    def is_dirty(self):
+        return bool(self.get_dirty_fields())
+
+    def save(self, *args, **kwargs):
+        tracked = (
+            not self._state.adding
+            and getattr(self, "_stored_values", None) is not None
+            and not kwargs.get("force_insert")
+            and not args
+        )
+        if tracked:
+            dirty = self.get_dirty_fields()
+            requested = kwargs.get("update_fields")
+            if requested is not None:
+                requested = set(requested)
+                dirty = [name for name in dirty if name in requested or self._meta.get_field(name).attname in requested]
+            if not dirty:
+                return
+            kwargs["update_fields"] = dirty
+
+        super().save(*args, **kwargs)
+        self._remember(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self._remember(fields)
+
+    def _remember(self, fields=None):
+        if fields is None or getattr(self, "_stored_values", None) is None:
+            self._stored_values = self._current_values()
+        else:
+            self._stored_values.update(self._current_values(fields))
@@ -1,6 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 class StandardPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination on id: each page is an index range scan, whatever its depth."""
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 1000
@@ -0,0 +1,33 @@
+from shared.utils import get_role_from_token
+
+# Roles that only ever see their own rows on owner-scoped endpoints
+SELF_SCOPED_ROLES = {"employee"}
+
+
+def scope_to_caller(queryset, request, owner_field):
+    """
+    Restrict `queryset` to the caller's own rows (`owner_field` = caller) when the JWT role is
+    self-scoped, so employee requests read O(own rows) instead of the whole table.
+    Requests without a bearer token are left to the view's permission checks.
+    """
+    if not owner_field or request is None:
+        return queryset
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return queryset
+
+    if get_role_from_token(request) in SELF_SCOPED_ROLES:
+        return queryset.filter(**{owner_field: request.user.id})
+    return queryset
+
+
+class OwnerScopedQuerysetMixin:
+    """
+    Viewset mixin: set `owner_field` to the model's user FK to filter employee requests
+    to their own rows in get_queryset (and therefore in list, retrieve, update and destroy).
+    """
+    owner_field = None
+
+    def get_queryset(self):
+        return scope_to_caller(super().get_queryset(), getattr(self, "request", None), self.owner_field)
@@ -0,0 +1,51 @@
+import json
+from datetime import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from biometricdata.models import BiometricData
+from shared.auth.serializers import LoginSerializer
+from users.models import CustomUser
+
+
+class GenericViewsetListModesTestCase(TestCase):
+    """The keyset (shared.pagination) and streaming list modes of GenericViewset, through the BiometricData viewset."""
+
+    def setUp(self):
+        owner = CustomUser.objects.create_user(email="lister@example.com", password="password", role="owner")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {LoginSerializer.get_token(owner).access_token}")
+        self.url = reverse("biometricdata:biometricdata-list")
+        BiometricData.objects.bulk_create([
+            BiometricData(emp_id=700, name="Juan", time=timezone.make_aware(datetime(2025, 4, 7, 9, minute)),
+                          work_code="N/A", work_state="0", terminal_name="Main Gate")
+            for minute in range(25)
+        ])
+        self.ids = list(BiometricData.objects.order_by("id").values_list("id", flat=True))
+
+    def test_keyset_pages_walk_the_table(self):
+        seen = []
+        response = self.client.get(self.url, {"limit": 10})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row["id"] for row in response.data["results"])
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(seen, self.ids)
+
+    def test_stream_returns_every_row(self):
+        with mock.patch("shared.generic_viewset.STREAM_CHUNK_SIZE", 10):
+            response = self.client.get(self.url, {"stream": "true"})
+            rows = json.loads(b"".join(response.streaming_content))
+
+        self.assertEqual([row["id"] for row in rows], self.ids)
+
+    def test_default_list_is_unchanged(self):
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 25)
@@ -1,3 +1,7 @@
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
 from django.conf import settings
 from rest_framework.response import Response
@@ -5,23 +9,73 @@ from rest_framework import status
 from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
 from functools import wraps
 
+# Verified claims of recently seen raw tokens, keyed by token signature (see decode_token_claims)
+_claims_cache = OrderedDict()
+_claims_cache_lock = threading.Lock()
 
-def get_role_from_token(request):
-    """Extract and decode the JWT token to retrieve the user's role."""
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise AuthenticationFailed("No valid token provided.")
 
-    token = auth_header.split(" ")[1]  # Extract token after "Bearer"
+def decode_token_claims(token):
+    """
+    Verify a raw JWT and return its claims.
+    Results are kept in a small LRU keyed by the token signature, so a token that is checked
+    repeatedly is only HMAC-verified once; expiry is still enforced on every hit.
+    """
+    signature = token.rsplit(".", 1)[-1]
+
+    with _claims_cache_lock:
+        cached = _claims_cache.get(signature)
+        if cached is not None and cached[0] == token:
+            _claims_cache.move_to_end(signature)
+            claims = cached[1]
+        else:
+            claims = None
+
+    if claims is not None:
+        if claims.get("exp") is not None and claims["exp"] <= time.time():
+            with _claims_cache_lock:
+                _claims_cache.pop(signature, None)
+            raise AuthenticationFailed("Token has expired.")
+        return claims
 
     try:
-        decoded_token = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return decoded_token.get("role")
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         raise AuthenticationFailed("Token has expired.")
     except jwt.DecodeError:
         raise AuthenticationFailed("Invalid token.")
 
+    size = getattr(settings, "JWT_CLAIMS_CACHE_SIZE", 0)
+    if size > 0:
+        with _claims_cache_lock:
+            _claims_cache[signature] = (token, claims)
+            _claims_cache.move_to_end(signature)
+            while len(_claims_cache) > size:
+                _claims_cache.popitem(last=False)
+    return claims
+
+
+def clear_token_claims_cache():
+    with _claims_cache_lock:
+        _claims_cache.clear()
+
+
+def get_role_from_token(request):
+    """
+    Return the caller's role claim.
+    Reuses the token JWTAuthentication already validated for this request (request.auth) and only
+    parses the Authorization header when the view was not authenticated with a JWT.
+    """
+    token = getattr(request, "auth", None)
+    if token is not None and hasattr(token, "payload"):
+        return token.payload.get("role")
+
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise AuthenticationFailed("No valid token provided.")
+
+    raw_token = auth_header.split(" ")[1]  # Extract token after "Bearer"
+    return decode_token_claims(raw_token).get("role")
+
 
 def role_required(allowed_roles):
     """
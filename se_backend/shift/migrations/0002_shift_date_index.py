@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shift', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='shift',
+            index=models.Index(fields=['date'], name='shift_shift_date_8e65ce_idx'),
+        ),
+    ]
@@ -8,5 +8,10 @@ class Shift(models.Model):
     shift_end = models.TimeField()
     expected_hours = models.IntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
     def __str__(self):
         return f"{self.id} - {self.shift_start} - {self.shift_end}"
\ No newline at end of file
@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from schedule.models import Schedule
+from .models import Shift
+
+
+@receiver(post_save, sender=Shift)
+def recompute_on_shift_change(sender, instance, created, **kwargs):
+    """An edited shift changes the expected hours and lateness of every schedule period that uses it."""
+    from attendance.recompute import request_recompute
+    from attendance.shift_index import invalidate_shift_index
+
+    invalidate_shift_index()
+    if created:
+        return  # Not part of any schedule yet
+
+    request_recompute(
+        Schedule.objects.filter(shift_ids=instance).values_list("user_id", "payroll_period_start")
+    )
+
+
+@receiver(pre_delete, sender=Shift)
+def remember_shift_periods(sender, instance, **kwargs):
+    """The schedule links are deleted with the shift without an m2m_changed, so capture its periods first."""
+    instance._schedule_periods = set(
+        Schedule.objects.filter(shift_ids=instance).values_list("user_id", "payroll_period_start")
+    )
+
+
+@receiver(post_delete, sender=Shift)
+def recompute_on_shift_delete(sender, instance, **kwargs):
+    """A deleted shift no longer counts towards the periods of the schedules that used it."""
+    from attendance.recompute import request_recompute
+    from attendance.shift_index import invalidate_shift_index
+
+    invalidate_shift_index()
+    request_recompute(getattr(instance, "_schedule_periods", ()))
+
+
+@receiver(m2m_changed, sender=Schedule.shift_ids.through)
+def recompute_on_schedule_shifts_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Adding or removing shifts on a schedule changes the totals of its payroll period."""
+    from attendance.recompute import request_recompute
+    from attendance.shift_index import invalidate_shift_index
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    invalidate_shift_index()
+    if reverse:
+        # instance is a Shift; pk_set holds Schedule ids (None on clear, when they are already gone)
+        schedules = Schedule.objects.filter(id__in=pk_set or [])
+    else:
+        schedules = Schedule.objects.filter(id=instance.id)
+
+    request_recompute(schedules.values_list("user_id", "payroll_period_start"))
+
+
+@receiver(post_save, sender=Schedule)
+@receiver(post_delete, sender=Schedule)
+def invalidate_shift_index_on_schedule_change(sender, **kwargs):
+    """A moved or removed payroll period changes which schedule covers a date."""
+    from attendance.shift_index import invalidate_shift_index
+
+    invalidate_shift_index()
@@ -1,9 +1,10 @@
 from django.db import models
 from overtimehours.models import OvertimeHours
+from shared.models import DirtyFieldsMixin
 from users.models import CustomUser
 
 
-class TotalOvertime(models.Model):
+class TotalOvertime(DirtyFieldsMixin, models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True)
     total_regularot = models.DecimalField(max_digits=10, decimal_places=2, default=0)
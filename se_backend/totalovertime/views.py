@@ -10,6 +10,7 @@ class TotalOvertimeViewSet(GenericViewset):
     protected_views = ["create", "update", "partial_update", "retrieve", "destroy"]
     permissions = [IsAuthenticated]
     queryset = TotalOvertime.objects.all()
+    owner_field = "user"  # Employees only see their own rows
     serializer_class = TotalOvertimeSerializer
 
     # Applying the role_required decorator to methods
@@ -1,9 +1,17 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from users.models import CustomUser, UserPasswordReset
 from django.contrib.auth import get_user_model
 from datetime import timedelta
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from unittest import mock
+import jwt
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from shared.auth.serializers import LoginSerializer
+from shared.utils import clear_token_claims_cache, decode_token_claims
 
 class CustomUserModelTestCase(TestCase):
 
@@ -70,4 +78,35 @@ class UserPasswordResetModelTestCase(TestCase):
         # Check that the token is now expired (more than 24 hours old)
         self.assertTrue(
             timezone.now() > self.password_reset.created_at + timezone.timedelta(hours=24)
-        )
\ No newline at end of file
+        )
+
+
+class RoleResolutionTestCase(TestCase):
+    def setUp(self):
+        clear_token_claims_cache()
+        self.user = CustomUser.objects.create_user(email="roles@example.com", password="password", role="owner")
+        self.token = str(LoginSerializer.get_token(self.user).access_token)
+
+    def test_role_required_reuses_authenticated_token(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        with mock.patch("shared.utils.decode_token_claims") as decode:
+            response = client.get(reverse("attendance:attendance-list"))
+
+        self.assertEqual(response.status_code, 200)
+        decode.assert_not_called()
+
+    @override_settings(JWT_CLAIMS_CACHE_SIZE=2)
+    def test_claims_are_cached_by_signature(self):
+        with mock.patch("shared.utils.jwt.decode", wraps=jwt.decode) as decode:
+            self.assertEqual(decode_token_claims(self.token)["role"], "owner")
+            self.assertEqual(decode_token_claims(self.token)["role"], "owner")
+        self.assertEqual(decode.call_count, 1)
+
+    @override_settings(JWT_CLAIMS_CACHE_SIZE=2)
+    def test_cached_claims_still_expire(self):
+        claims = decode_token_claims(self.token)
+        with mock.patch("shared.utils.time.time", return_value=claims["exp"] + 1):
+            with self.assertRaises(AuthenticationFailed):
+                decode_token_claims(self.token)